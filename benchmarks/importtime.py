@@ -0,0 +1,153 @@
+# USAGE EXAMPLE: python3 -B benchmarks/importtime.py --repeat 5
+# Measures the startup cost of the simulator with Python's '-X importtime' option and checks that heavy
+# dependencies are only imported by the scenarios that need them (exiting with an error otherwise)
+
+# Python libraries
+import os
+import sys
+import argparse
+import subprocess
+
+
+# Root directory of the repository (scenarios run from it, so that the 'data' directory is found)
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Heavy dependencies whose import is tracked by the benchmark
+HEAVY_MODULES = ['pandas', 'fnss', 'networkx', 'simpy']
+
+# Scenarios measured by the benchmark: (name, Python code, heavy modules that must not be imported)
+SCENARIOS = [
+    ('import', 'import simulator.simulator', HEAVY_MODULES),
+
+    ('list_strategies', 'import runpy, sys; sys.argv = ["simulator", "strategies"]; '
+        'runpy.run_module("simulator", run_name="__main__")', HEAVY_MODULES),
+
+    ('fast_forward', 'from simulator.simulator import Simulator; '
+        'Simulator.create_environment(simulation_type="fast_forward"); '
+        'Simulator.load_dataset(input_file="dataset25occupation"); '
+        'Simulator.start(maintenance_strategy="salus"); '
+        'Simulator.metrics_by_step()', HEAVY_MODULES),
+
+    ('cli_fast_forward', 'import runpy, sys; sys.argv = ["simulator", "-s", "fast_forward", '
+        '"-d", "dataset25occupation", "-m", "salus"]; runpy.run_module("simulator", run_name="__main__")',
+        HEAVY_MODULES),
+
+    ('normal', 'from simulator.simulator import Simulator; '
+        'Simulator.create_environment(simulation_type="normal"); '
+        'Simulator.load_dataset(input_file="dataset25occupation"); '
+        'Simulator.start(maintenance_strategy="salus"); '
+        'Simulator.metrics_by_step()', ['pandas']),
+]
+
+
+def parse_importtime(output):
+    """ Parses the report written by '-X importtime' into standard error.
+
+    Parameters
+    ==========
+    output : string
+        Standard error of a Python process executed with '-X importtime'
+
+    Returns
+    =======
+    total_time : float
+        Time (in milliseconds) spent importing top-level modules
+
+    modules : Dictionary
+        Cumulative import time (in milliseconds) of each module
+    """
+
+    total_time = 0
+    modules = {}
+
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = int(cumulative) / 1000
+
+        # Nested imports are indented, so only top-level imports are added to the total
+        if not name.startswith('  '):
+            total_time += int(cumulative) / 1000
+
+    return(total_time, modules)
+
+
+def measure(code):
+    """ Runs Python code in a fresh interpreter with '-X importtime'.
+
+    Returns
+    =======
+    total_time : float
+        Time (in milliseconds) spent importing top-level modules
+
+    modules : Dictionary
+        Cumulative import time (in milliseconds) of each module
+    """
+
+    process = subprocess.run([sys.executable, '-B', '-X', 'importtime', '-c', code], cwd=ROOT_DIRECTORY,
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+
+    if process.returncode != 0:
+        sys.exit(f'Scenario failed:\n{process.stderr[-2000:]}')
+
+    return(parse_importtime(process.stderr))
+
+
+def run_benchmark(repeat=3, max_time=None):
+    """ Measures the import time of each scenario (keeping the fastest of a number of runs).
+
+    Parameters
+    ==========
+    repeat : int, optional
+        Number of runs of each scenario
+
+    max_time : float, optional
+        Maximum import time (in milliseconds) accepted for scenarios that must not import heavy dependencies
+
+    Returns
+    =======
+    results : List
+        List of dictionaries with the import time of each scenario and the heavy modules it imported
+
+    regressions : List
+        Messages describing the regressions found
+    """
+
+    results = []
+    regressions = []
+
+    for name, code, forbidden_modules in SCENARIOS:
+        measurements = [measure(code) for _ in range(repeat)]
+        total_time, modules = min(measurements, key=lambda measurement: measurement[0])
+
+        heavy_modules = [module for module in HEAVY_MODULES if module in modules]
+        results.append({'scenario': name, 'import_time': total_time, 'heavy_modules': heavy_modules})
+
+        for module in heavy_modules:
+            if module in forbidden_modules:
+                regressions.append(f'{name}: imported {module} ({modules[module]:.1f} ms)')
+
+        if max_time is not None and forbidden_modules == HEAVY_MODULES and total_time > max_time:
+            regressions.append(f'{name}: import time {total_time:.1f} ms exceeds {max_time:.1f} ms')
+
+    return(results, regressions)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', '-r', type=int, default=3,
+        help='Number of runs of each scenario (the fastest is kept)')
+    parser.add_argument('--max-time', type=float, default=None,
+        help='Maximum import time (in milliseconds) of scenarios that must not import heavy dependencies')
+    args = parser.parse_args()
+
+    results, regressions = run_benchmark(repeat=args.repeat, max_time=args.max_time)
+
+    for result in results:
+        print(f'{result["scenario"]:<18} {result["import_time"]:8.1f} ms   heavy modules: '
+            f'{", ".join(result["heavy_modules"]) or "-"}')
+
+    if len(regressions) > 0:
+        sys.exit('Startup regressions:\n' + '\n'.join(regressions))
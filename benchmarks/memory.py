@@ -0,0 +1,221 @@
+# USAGE EXAMPLE: python3 -B benchmarks/memory.py --servers 1000 --occupation 0.5
+# Measures the memory used by each server, VM and migration record with 'tracemalloc' on a synthetic fleet (see
+# 'simulator/dataset_generator.py'), for both the 'object' and the 'array' backends
+
+# Python libraries
+import gc
+import os
+import sys
+import random
+import argparse
+import tempfile
+import tracemalloc
+
+
+# Root directory of the repository (which contains the simulator package)
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIRECTORY)
+
+
+# General-purpose simulator modules
+from simulator.simulator import Simulator
+from simulator.dataset_generator import generate_dataset, save_dataset
+from simulator.misc.simulation_context import SimulationContext
+from simulator.misc.cluster_state import ClusterState, ArrayServer, ArrayVirtualMachine
+from simulator.misc.binary_dataset import BINARY_DATASET_SUFFIX
+from simulator.misc.migration_log import MigrationLog
+from simulator.misc.constants import SEED_VALUE
+import simulator.misc.constants as constants
+from simulator.components.infrastructure.server import Server
+from simulator.components.application.virtual_machine import VirtualMachine
+from simulator.components.communication.topology_cache import TopologyCache, TOPOLOGY_CACHE_SUFFIX
+
+
+def traced_memory():
+    """ Gathers the memory currently allocated by Python (in bytes).
+    """
+
+    return(tracemalloc.get_traced_memory()[0])
+
+
+def measure_entities(dataset, backend='object'):
+    """ Measures the memory used by servers and VMs, creating them as 'Simulator.load_dataset' does.
+
+    Parameters
+    ==========
+    dataset : BinaryDataset
+        Dataset with the servers and VMs
+
+    backend : string, optional
+        Storage used by servers and VMs ('object' or 'array')
+
+    Returns
+    =======
+    server_bytes : float
+        Memory used by each server (including its list of VMs)
+
+    vm_bytes : float
+        Memory used by each VM
+    """
+
+    servers = dataset.servers
+    virtual_machines = dataset.virtual_machines
+
+    # Converting dataset columns into Python values beforehand, so that only the created objects are measured
+    server_values = list(zip(servers['id'].tolist(), servers['cpu_capacity'].tolist(),
+        servers['memory_capacity'].tolist(), servers['disk_capacity'].tolist(), servers['updated'].tolist(),
+        servers['patch_duration'].tolist(), servers['sanity_check_duration'].tolist()))
+
+    vm_values = list(zip(virtual_machines['id'].tolist(), virtual_machines['cpu_demand'].tolist(),
+        virtual_machines['memory_demand'].tolist(), virtual_machines['disk_demand'].tolist(),
+        virtual_machines['server'].tolist()))
+
+    with SimulationContext():
+        start = traced_memory()
+
+        if backend == 'array':
+            cluster_state = ClusterState(servers=len(server_values), virtual_machines=len(vm_values))
+            create_server = lambda **kwargs: ArrayServer(cluster_state=cluster_state, **kwargs)
+            create_vm = lambda **kwargs: ArrayVirtualMachine(cluster_state=cluster_state, **kwargs)
+        else:
+            create_server = Server
+            create_vm = VirtualMachine
+
+        for id, cpu, memory, disk, updated, patch_duration, sanity_check_duration in server_values:
+            server = create_server(id=id, cpu=cpu, memory=memory, disk=disk, updated=updated)
+            server.patch_duration = patch_duration
+            server.sanity_check_duration = sanity_check_duration
+
+        servers_created = traced_memory()
+
+        for id, cpu, memory, disk, server_id in vm_values:
+            vm = create_vm(id=id, cpu=cpu, memory=memory, disk=disk)
+
+            server = Server.find_by_id(server_id)
+            server.cpu_demand += vm.cpu_demand
+            server.memory_demand += vm.memory_demand
+            server.disk_demand += vm.disk_demand
+
+            vm.server = server
+            server.virtual_machines.append(vm)
+
+        vms_created = traced_memory()
+
+    return((servers_created - start) / len(server_values), (vms_created - servers_created) / len(vm_values))
+
+
+def measure_migrations(dataset_name, maintenance_strategy, backend='object', retention='all'):
+    """ Measures the memory retained by the migration history of a fast-forward simulation (i.e., the memory
+    released when the migration log is dropped). The working directory must contain the dataset within its
+    'data' directory.
+
+    Parameters
+    ==========
+    retention : string, optional
+        Retention mode of the migration log ('all', 'last' or 'aggregate', see 'MIGRATION_HISTORY' in 'constants')
+
+    Returns
+    =======
+    migration_bytes : float
+        Memory retained by each migration
+
+    migrations : int
+        Number of migrations performed during the simulation
+    """
+
+    random.seed(SEED_VALUE)
+
+    # The migration log of each simulation environment follows the retention mode set in 'constants'
+    default_retention = constants.MIGRATION_HISTORY
+    constants.MIGRATION_HISTORY = retention
+
+    with SimulationContext():
+        try:
+            Simulator.create_environment(simulation_type='fast_forward')
+        finally:
+            constants.MIGRATION_HISTORY = default_retention
+
+        Simulator.load_dataset(input_file=f'{dataset_name}{BINARY_DATASET_SUFFIX}', backend=backend)
+
+        Simulator.start(maintenance_strategy=maintenance_strategy)
+
+        environment = SimulationContext.current().environment
+        migrations = len(environment.migration_log)
+
+        # VMs gather their migration history from the migration log, so dropping the log releases the history
+        gc.collect()
+        with_history = traced_memory()
+
+        environment.migration_log = MigrationLog(retention=retention)
+        gc.collect()
+
+        migration_bytes = (with_history - traced_memory()) / max(migrations, 1)
+
+    return(migration_bytes, migrations)
+
+
+def run_benchmark(servers=1000, occupation=0.5, maintenance_strategy='first_fit_like', backends=None,
+    retention='all'):
+    """ Measures the memory used by servers, VMs and migrations with each backend.
+
+    Returns
+    =======
+    results : List
+        List of dictionaries with the memory used by each kind of entity (in bytes) with each backend
+    """
+
+    dataset = generate_dataset(servers=servers, occupation=occupation, seed=SEED_VALUE)
+    dataset_name = f'fleet{servers}servers{round(occupation * 100)}occupation'
+
+    results = []
+    working_directory = os.getcwd()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.makedirs(os.path.join(directory, 'data'))
+        dataset_path = os.path.join(directory, 'data', dataset_name)
+        save_dataset(dataset=dataset, output_file=f'{dataset_path}{BINARY_DATASET_SUFFIX}')
+        TopologyCache.from_dataset(dataset).save(f'{dataset_path}{TOPOLOGY_CACHE_SUFFIX}')
+
+        # Datasets are read from the 'data' directory of the working directory
+        os.chdir(directory)
+
+        try:
+            tracemalloc.start()
+
+            for backend in backends or ['object', 'array']:
+                server_bytes, vm_bytes = measure_entities(dataset=dataset, backend=backend)
+                migration_bytes, migrations = measure_migrations(dataset_name=dataset_name,
+                    maintenance_strategy=maintenance_strategy, backend=backend, retention=retention)
+
+                results.append({'backend': backend, 'servers': servers,
+                    'virtual_machines': len(dataset.virtual_machines), 'migrations': migrations,
+                    'server_bytes': server_bytes, 'vm_bytes': vm_bytes, 'migration_bytes': migration_bytes})
+
+            tracemalloc.stop()
+
+        finally:
+            os.chdir(working_directory)
+
+    return(results)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--servers', type=int, default=1000, help='Number of servers of the synthetic fleet')
+    parser.add_argument('--occupation', type=float, default=0.5,
+        help='Share (between 0 and 1) of the fleet capacity used by VMs')
+    parser.add_argument('--maintenance-strategy', '-m', default='first_fit_like',
+        help='Maintenance strategy whose migrations are measured')
+    parser.add_argument('--backend', '-b', nargs='+', default=['object', 'array'], choices=['object', 'array'],
+        help='Storage used by servers and VMs')
+    parser.add_argument('--migration-history', default='all', choices=MigrationLog.RETENTION_MODES,
+        help='Migration records kept by the migration log (see MIGRATION_HISTORY in "simulator/misc/constants.py")')
+    args = parser.parse_args()
+
+    results = run_benchmark(servers=args.servers, occupation=args.occupation,
+        maintenance_strategy=args.maintenance_strategy, backends=args.backend, retention=args.migration_history)
+
+    for result in results:
+        print(f'{result["backend"]:<8} {result["servers"]} servers, {result["virtual_machines"]} VMs, '
+            f'{result["migrations"]} migrations: {result["server_bytes"]:8.1f} bytes/server   '
+            f'{result["vm_bytes"]:8.1f} bytes/VM   {result["migration_bytes"]:8.1f} bytes/migration')
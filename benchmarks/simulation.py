@@ -0,0 +1,433 @@
+# USAGE EXAMPLE:
+#     python3 -B benchmarks/simulation.py --servers 128 512 1024 --occupations 0.25 0.75 -m salus best_fit_like
+# Generates synthetic fleets with several sizes and occupations, times the main phases of simulations with each
+# maintenance strategy (dataset loading, each maintenance step, metrics collection and results) and records their
+# peak memory usage. Results are appended to a JSON history and compared with the previous run of each scenario
+# (exiting with an error when a scenario got slower or used more memory than the informed thresholds allow)
+
+# Python libraries
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import platform
+import contextlib
+import subprocess
+import tracemalloc
+from datetime import datetime, timezone
+
+
+# Root directory of the repository (which contains the simulator package)
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIRECTORY)
+
+
+# General-purpose simulator modules
+from simulator.simulator import Simulator
+from simulator.dataset_generator import generate_dataset, save_dataset
+from simulator.misc.simulation_context import SimulationContext
+from simulator.misc.binary_dataset import BINARY_DATASET_SUFFIX
+from simulator.misc.constants import SEED_VALUE
+from simulator.components.communication.topology_cache import TopologyCache, TOPOLOGY_CACHE_SUFFIX
+from simulator.components.resource_management.maintenance.registry import available_strategies, check_strategies
+
+
+# Default fleet sizes (number of servers) and occupations (share of the fleet capacity used by VMs)
+DEFAULT_SERVERS = [128, 512]
+DEFAULT_OCCUPATIONS = [0.25, 0.5, 0.75]
+
+# Default number of timed runs of each scenario (the fastest is kept, which filters out most of the noise)
+DEFAULT_REPEAT = 5
+
+# Default relative increase above which a measurement is considered a regression, and smallest absolute
+# increases (in seconds and megabytes) considered regressions (so that noise on short phases is not reported)
+DEFAULT_THRESHOLD = 0.2
+DEFAULT_MIN_TIME_INCREASE = 0.05
+DEFAULT_MIN_MEMORY_INCREASE = 1
+
+# Default path of the benchmark history
+HISTORY_FILE = os.path.join(ROOT_DIRECTORY, 'benchmarks', 'history.json')
+
+# Measurements compared across runs (timings in seconds and peak memory in megabytes)
+TIMING_METRICS = ['load_dataset', 'simulation', 'average_step', 'longest_step', 'collect_metrics', 'show_results']
+MEMORY_METRICS = ['load_dataset_peak_memory', 'simulation_peak_memory']
+
+
+class StepTimer:
+    """ This class wraps the 'collect_metrics' method of a simulation environment, which is called at the end of
+    each maintenance step, to time the strategy's work within each step and the metrics collection separately.
+    """
+
+    def __init__(self, collect_metrics):
+        """ Creates a StepTimer object.
+
+        Parameters
+        ==========
+        collect_metrics : Method
+            Original 'collect_metrics' method of the simulation environment
+        """
+
+        self.collect_metrics = collect_metrics
+
+        # Duration of each maintenance step (without metrics collection) and of each metrics collection
+        self.step_durations = []
+        self.collect_durations = []
+
+        # Time at which the current maintenance step started
+        self.step_start = time.perf_counter()
+
+
+    def __call__(self):
+        step_end = time.perf_counter()
+        self.step_durations.append(step_end - self.step_start)
+
+        self.collect_metrics()
+
+        self.step_start = time.perf_counter()
+        self.collect_durations.append(self.step_start - step_end)
+
+
+def generate_fleets(directory, servers, occupations, seed=SEED_VALUE):
+    """ Generates the synthetic fleets used by the benchmark as binary datasets (with their topology caches)
+    within the 'data' directory of a working directory.
+
+    Parameters
+    ==========
+    directory : string
+        Working directory of the benchmark
+
+    servers : List
+        Fleet sizes (number of servers)
+
+    occupations : List
+        Share of the fleet capacity used by VMs
+
+    seed : int, optional
+        Seed value used to generate the fleets
+
+    Returns
+    =======
+    fleets : List
+        List of dictionaries with the dataset name, number of servers, VMs and occupation of each fleet
+    """
+
+    os.makedirs(os.path.join(directory, 'data'), exist_ok=True)
+
+    fleets = []
+    for fleet_servers in servers:
+        for occupation in occupations:
+            name = f'fleet{fleet_servers}servers{round(occupation * 100)}occupation'
+            dataset = generate_dataset(servers=fleet_servers, occupation=occupation, seed=seed)
+
+            save_dataset(dataset=dataset, output_file=os.path.join(directory, 'data', f'{name}{BINARY_DATASET_SUFFIX}'))
+            TopologyCache.from_dataset(dataset).save(os.path.join(directory, 'data', f'{name}{TOPOLOGY_CACHE_SUFFIX}'))
+
+            fleets.append({'dataset': name, 'servers': fleet_servers, 'virtual_machines': len(dataset.virtual_machines),
+                'occupation': occupation})
+
+    return(fleets)
+
+
+def run_simulation(dataset, maintenance_strategy, simulation_type='normal', backend='object', engine='simpy',
+    trace_memory=False):
+    """ Runs a simulation within its own simulation context, timing each of its phases. The working directory
+    must contain the dataset within its 'data' directory.
+
+    Parameters
+    ==========
+    dataset : string
+        Name of the binary dataset (without the '.npd' suffix)
+
+    maintenance_strategy : string
+        Name of the maintenance strategy
+
+    simulation_type : string, optional
+        Type of simulation ('normal' or 'fast_forward')
+
+    backend : string, optional
+        Storage used by servers and VMs ('object' or 'array')
+
+    engine : string, optional
+        Discrete-event engine ('simpy' or 'event_loop')
+
+    trace_memory : boolean, optional
+        Tells whether the peak memory allocated by Python while loading the dataset and during the whole
+        simulation must be measured with 'tracemalloc' (which slows the simulation down, so timings of traced
+        runs are not meaningful)
+
+    Returns
+    =======
+    measurements : Dictionary
+        Duration (in seconds) of each phase and, for traced runs, peak memory (in megabytes)
+    """
+
+    measurements = {}
+
+    # Defining a seed value to enable reproducibility
+    random.seed(SEED_VALUE)
+
+    if trace_memory:
+        tracemalloc.start()
+
+    with SimulationContext():
+        start = time.perf_counter()
+        Simulator.create_environment(simulation_type=simulation_type, engine=engine)
+        Simulator.load_dataset(input_file=f'{dataset}{BINARY_DATASET_SUFFIX}', backend=backend)
+        measurements['load_dataset'] = time.perf_counter() - start
+
+        if trace_memory:
+            measurements['load_dataset_peak_memory'] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+
+        environment = SimulationContext.current().environment
+        step_timer = StepTimer(environment.collect_metrics)
+        environment.collect_metrics = step_timer
+
+        start = time.perf_counter()
+        step_timer.step_start = start
+        Simulator.start(maintenance_strategy=maintenance_strategy)
+        measurements['simulation'] = time.perf_counter() - start
+
+        # Results are printed and summarized, but not stored (output files are covered by the results sinks)
+        start = time.perf_counter()
+        with open(os.devnull, 'w') as output, contextlib.redirect_stdout(output):
+            Simulator.show_results(output_file=None)
+        measurements['show_results'] = time.perf_counter() - start
+
+        measurements['maintenance_steps'] = len(step_timer.step_durations)
+        measurements['average_step'] = sum(step_timer.step_durations) / max(len(step_timer.step_durations), 1)
+        measurements['longest_step'] = max(step_timer.step_durations, default=0)
+        measurements['collect_metrics'] = sum(step_timer.collect_durations)
+
+    if trace_memory:
+        measurements['simulation_peak_memory'] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+
+    return(measurements)
+
+
+def run_benchmark(servers=None, occupations=None, maintenance_strategies=None, simulation_type='normal',
+    backend='object', engine='simpy', repeat=DEFAULT_REPEAT, measure_memory=True):
+    """ Runs each maintenance strategy on each synthetic fleet (keeping the fastest of a number of runs).
+
+    Parameters
+    ==========
+    servers : List, optional
+        Fleet sizes (number of servers)
+
+    occupations : List, optional
+        Share of the fleet capacity used by VMs
+
+    maintenance_strategies : List, optional
+        Names of the maintenance strategies (defaults to all available strategies)
+
+    simulation_type : string, optional
+        Type of simulation ('normal' or 'fast_forward')
+
+    backend : string, optional
+        Storage used by servers and VMs ('object' or 'array')
+
+    engine : string, optional
+        Discrete-event engine ('simpy' or 'event_loop')
+
+    repeat : int, optional
+        Number of timed runs of each scenario
+
+    measure_memory : boolean, optional
+        Tells whether an extra run of each scenario measures its peak memory
+
+    Returns
+    =======
+    results : List
+        List of dictionaries with the fleet, maintenance strategy and measurements of each scenario
+    """
+
+    maintenance_strategies = maintenance_strategies or available_strategies()
+    check_strategies(maintenance_strategies)
+
+    results = []
+    working_directory = os.getcwd()
+
+    with tempfile.TemporaryDirectory() as directory:
+        fleets = generate_fleets(directory=directory, servers=servers or DEFAULT_SERVERS,
+            occupations=occupations or DEFAULT_OCCUPATIONS)
+
+        # Datasets are read from the 'data' directory of the working directory
+        os.chdir(directory)
+
+        try:
+            # Running each strategy once on the smallest fleet beforehand, so that timings don't include
+            # one-time costs (e.g., importing the strategy, FNSS or pandas)
+            smallest_fleet = min(fleets, key=lambda fleet: fleet['virtual_machines'])
+            for maintenance_strategy in maintenance_strategies:
+                run_simulation(dataset=smallest_fleet['dataset'], maintenance_strategy=maintenance_strategy,
+                    simulation_type=simulation_type, backend=backend, engine=engine)
+
+            for fleet in fleets:
+                for maintenance_strategy in maintenance_strategies:
+                    parameters = {'dataset': fleet['dataset'], 'maintenance_strategy': maintenance_strategy,
+                        'simulation_type': simulation_type, 'backend': backend, 'engine': engine}
+
+                    runs = [run_simulation(**parameters) for _ in range(repeat)]
+                    measurements = {name: min(run[name] for run in runs) for name in runs[0]}
+
+                    if measure_memory:
+                        traced_run = run_simulation(trace_memory=True, **parameters)
+                        measurements.update({name: traced_run[name] for name in MEMORY_METRICS})
+
+                    result = dict(fleet)
+                    result.update({'maintenance_strategy': maintenance_strategy, 'simulation_type': simulation_type,
+                        'backend': backend, 'engine': engine})
+                    result.update(measurements)
+                    results.append(result)
+
+        finally:
+            os.chdir(working_directory)
+
+    return(results)
+
+
+def scenario_key(result):
+    """ Identifies the scenario of a benchmark result (so that results can be compared across runs).
+    """
+
+    return((result['dataset'], result['maintenance_strategy'], result['simulation_type'], result['backend'],
+        result['engine']))
+
+
+def load_history(path):
+    """ Loads the benchmark history (a list of runs, from the oldest to the newest).
+    """
+
+    if not os.path.exists(path):
+        return([])
+
+    with open(path, 'r') as history_file:
+        return(json.load(history_file))
+
+
+def save_history(path, history):
+    """ Stores the benchmark history.
+    """
+
+    with open(path, 'w') as history_file:
+        json.dump(history, history_file, indent=4)
+
+
+def current_commit():
+    """ Gathers the commit checked out in the repository (if it's a git repository).
+    """
+
+    try:
+        process = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIRECTORY, capture_output=True,
+            text=True)
+    except OSError:
+        return(None)
+
+    return(process.stdout.strip() or None)
+
+
+def compare_results(history, results, threshold=DEFAULT_THRESHOLD, min_time_increase=DEFAULT_MIN_TIME_INCREASE,
+    min_memory_increase=DEFAULT_MIN_MEMORY_INCREASE):
+    """ Compares benchmark results with the latest previous result of each scenario.
+
+    Parameters
+    ==========
+    history : List
+        Previous benchmark runs
+
+    results : List
+        Results of the current run
+
+    threshold : float, optional
+        Relative increase (e.g., 0.2 for 20%) above which a measurement is considered a regression
+
+    min_time_increase : float, optional
+        Smallest increase of a timing (in seconds) considered a regression
+
+    min_memory_increase : float, optional
+        Smallest increase of a peak memory measurement (in megabytes) considered a regression
+
+    Returns
+    =======
+    regressions : List
+        Messages describing the regressions found
+    """
+
+    # Latest previous result (and the commit it was measured on) of each scenario
+    previous_results = {}
+    for run in history:
+        for result in run['results']:
+            previous_results[scenario_key(result)] = (run.get('commit'), result)
+
+    regressions = []
+    for result in results:
+        if scenario_key(result) not in previous_results:
+            continue
+
+        commit, previous_result = previous_results[scenario_key(result)]
+
+        for metric in TIMING_METRICS + MEMORY_METRICS:
+            if metric not in result or not previous_result.get(metric):
+                continue
+
+            # Measurements must exceed both the relative threshold and the absolute noise floor
+            min_increase = min_time_increase if metric in TIMING_METRICS else min_memory_increase
+            if result[metric] > max(previous_result[metric] * (1 + threshold), previous_result[metric] + min_increase):
+                regressions.append(f'{result["dataset"]}/{result["maintenance_strategy"]}: {metric} went from '
+                    f'{previous_result[metric]:.4f} to {result[metric]:.4f} (commit {commit})')
+
+    return(regressions)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--servers', nargs='+', type=int, default=DEFAULT_SERVERS,
+        help='Fleet sizes (number of servers)')
+    parser.add_argument('--occupations', nargs='+', type=float, default=DEFAULT_OCCUPATIONS,
+        help='Share (between 0 and 1) of the fleet capacity used by VMs')
+    parser.add_argument('--maintenance-strategies', '-m', nargs='+',
+        help='Maintenance strategies (defaults to all available strategies)')
+    parser.add_argument('--simulation-type', '-s', default='normal', choices=['normal', 'fast_forward'],
+        help='Type of simulation')
+    parser.add_argument('--backend', '-b', default='object', choices=['object', 'array'],
+        help='Storage used by servers and VMs')
+    parser.add_argument('--engine', '-e', default='simpy', choices=['simpy', 'event_loop'],
+        help='Discrete-event engine')
+    parser.add_argument('--repeat', '-r', type=int, default=DEFAULT_REPEAT,
+        help='Number of timed runs of each scenario (the fastest is kept)')
+    parser.add_argument('--skip-memory', action='store_true',
+        help='Skips the extra run of each scenario that measures its peak memory')
+    parser.add_argument('--history', default=HISTORY_FILE, help='JSON file with the results of previous runs')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+        help='Relative increase (e.g., 0.2 for 20%%) above which a measurement is considered a regression')
+    parser.add_argument('--min-time-increase', type=float, default=DEFAULT_MIN_TIME_INCREASE,
+        help='Smallest increase of a timing (in seconds) considered a regression')
+    parser.add_argument('--min-memory-increase', type=float, default=DEFAULT_MIN_MEMORY_INCREASE,
+        help='Smallest increase of a peak memory measurement (in megabytes) considered a regression')
+    args = parser.parse_args()
+
+    results = run_benchmark(servers=args.servers, occupations=args.occupations,
+        maintenance_strategies=args.maintenance_strategies, simulation_type=args.simulation_type,
+        backend=args.backend, engine=args.engine, repeat=args.repeat, measure_memory=not args.skip_memory)
+
+    for result in results:
+        memory = (f'   peak memory {result["simulation_peak_memory"]:8.1f} MB'
+            if 'simulation_peak_memory' in result else '')
+        print(f'{result["dataset"]:<36} {result["maintenance_strategy"]:<20} load {result["load_dataset"]:8.3f} s'
+            f'   simulation {result["simulation"]:8.3f} s   steps {result["maintenance_steps"]:4}'
+            f'   collect {result["collect_metrics"]:7.3f} s   results {result["show_results"]:7.3f} s{memory}')
+
+    # Comparing results with previous runs and appending them to the history
+    history = load_history(args.history)
+    regressions = compare_results(history=history, results=results, threshold=args.threshold,
+        min_time_increase=args.min_time_increase, min_memory_increase=args.min_memory_increase)
+
+    history.append({'commit': current_commit(), 'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(), 'machine': platform.machine(), 'results': results})
+    save_history(args.history, history)
+
+    if len(regressions) > 0:
+        sys.exit('Performance regressions:\n' + '\n'.join(regressions))
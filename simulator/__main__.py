@@ -1,33 +1,265 @@
 # USAGE EXAMPLE: python3 -B -m simulator -s="normal" -d="dataset75occupation" -m="salus" -o="salus"
+# CONVERSION USAGE EXAMPLE: python3 -B -m simulator convert -d dataset75occupation
+# VALIDATION USAGE EXAMPLE: python3 -B -m simulator validate -d dataset25occupation -m salus
+# CHECKPOINT USAGE EXAMPLE:
+#     python3 -B -m simulator -s="normal" -d="dataset75occupation" -m="salus" -o="salus" --checkpoint-step 5
+# RESUME USAGE EXAMPLE:
+#     python3 -B -m simulator -s="normal" -d="dataset75occupation" -m="salus" -o="salus" --resume salus.checkpoint.npz
+# GENERATION USAGE EXAMPLE:
+#     python3 -B -m simulator generate -o data/dataset1M.npd --servers 400000 --virtual-machines 1000000 --seed 1
+# PROFILING USAGE EXAMPLE:
+#     python3 -B -m simulator -s="normal" -d="dataset75occupation" -m="salus" --profile-output salus.trace.json
+# STRATEGIES USAGE EXAMPLE: python3 -B -m simulator strategies
+# SWEEP USAGE EXAMPLE:
+#     python3 -B -m simulator sweep -d dataset25occupation dataset75occupation -m salus best_fit_like -c SAVE_TIME=30,60
 # Python libraries
+import os
+import sys
 import random
 import argparse
 
 # General-purpose Simulator Modules
 from simulator.simulator import Simulator
 from simulator.misc.constants import SEED_VALUE
+from simulator.misc.checkpoint import CHECKPOINT_SUFFIX
+from simulator.components.resource_management.maintenance.registry import available_strategies, check_strategies
 
 
-def main(simulation_type, dataset, maintenance_strategy, output_file):
+def main(simulation_type, dataset, maintenance_strategy, output_file, backend='object', engine='simpy',
+    checkpoint_step=None, checkpoint_file=None, resume=None, profile=False, profile_output=None):
+    # Making sure the maintenance strategy exists before loading the dataset
+    check_strategies([maintenance_strategy])
+
     # Defining a seed value to enable reproducibility
     random.seed(SEED_VALUE)
 
-    Simulator.create_environment(simulation_type=simulation_type)
-    Simulator.load_dataset(input_file=dataset)
+    Simulator.create_environment(simulation_type=simulation_type, engine=engine)
+    Simulator.load_dataset(input_file=dataset, backend=backend)
+
+    # Continuing a simulation from a checkpoint
+    if resume:
+        Simulator.resume(input_file=resume)
+
+    # Storing the simulation state after a given maintenance step (checkpoints are named after the output file or,
+    # when results are not stored, after the dataset and maintenance strategy)
+    if checkpoint_step is not None:
+        checkpoint_name = output_file or f'{os.path.splitext(os.path.basename(dataset))[0]}_{maintenance_strategy}'
+        Simulator.schedule_checkpoint(maintenance_step=checkpoint_step,
+            output_file=checkpoint_file or f'{checkpoint_name}{CHECKPOINT_SUFFIX}')
+
+    # Streaming the metrics of each maintenance step to the output file (whose extension defines its format)
+    if output_file:
+        Simulator.open_results_sink(output_file=output_file)
+
+    # Instrumenting the simulation phases (methods are only wrapped when profiling is requested)
+    if profile or profile_output:
+        from simulator.misc.instrumentation import Instrumentation
+
+        instrumentation = Instrumentation(output_file=profile_output)
+        instrumentation.enable()
+
     Simulator.start(maintenance_strategy=maintenance_strategy)
+
+    if profile or profile_output:
+        instrumentation.disable()
+
     Simulator.show_results(output_file=output_file)
 
+    if profile or profile_output:
+        print(f'\n\n=================\n=== PROFILING ===\n=================\n{instrumentation.summary()}')
+
+
+def sweep(simulation_type, datasets, maintenance_strategies, constants, seeds, processes, output_file, backend='object',
+    engine='simpy'):
+    from simulator.sweep import parse_constant_overrides, run_sweep, show_sweep_results
+
+    results = run_sweep(simulation_type=simulation_type, datasets=datasets,
+        maintenance_strategies=maintenance_strategies, constant_values=parse_constant_overrides(constants),
+        seeds=seeds, processes=processes, backend=backend, engine=engine)
+
+    show_sweep_results(results=results, output_file=output_file)
+
+
+def convert(datasets):
+    from simulator.misc.binary_dataset import BinaryDataset, convert_dataset
+    from simulator.components.communication.topology_cache import TopologyCache, TOPOLOGY_CACHE_SUFFIX
+
+    for dataset in datasets:
+        output_file = convert_dataset(input_file=f'data/{dataset}.json')
+        print(f'Converted "data/{dataset}.json" into "{output_file}"')
+
+        # Storing hop counts and bottleneck bandwidths between servers next to the dataset
+        TopologyCache.from_dataset(BinaryDataset.load(output_file)).save(f'data/{dataset}{TOPOLOGY_CACHE_SUFFIX}')
+        print(f'Stored the topology cache of "{dataset}" into "data/{dataset}{TOPOLOGY_CACHE_SUFFIX}"')
+
+
+def generate(output_file, seed, **parameters):
+    from simulator.dataset_generator import generate_dataset, save_dataset, describe_dataset
+
+    dataset = generate_dataset(seed=seed, **parameters)
+    save_dataset(dataset=dataset, output_file=output_file)
+
+    print(f'Stored the generated dataset into "{output_file}" ({describe_dataset(dataset)})')
+
+
+def parse_values(values):
+    """ Parses attribute values informed as comma-separated numbers (e.g., '4,4,32' for a server capacity).
+    """
+
+    if values is None:
+        return(None)
+
+    return([[int(value) for value in item.split(',')] for item in values])
+
+
+def strategies():
+    for name in available_strategies():
+        print(name)
+
+
+def validate(datasets, maintenance_strategies, engine='simpy'):
+    from simulator.validation import validate_fast_forward, validate_state_fork
+
+    mismatches = validate_fast_forward(datasets=datasets, maintenance_strategies=maintenance_strategies, engine=engine)
+    fork_mismatches = validate_state_fork(datasets=datasets)
+
+    if len(mismatches) > 0:
+        sys.exit(f'Fast-forward simulations diverged from the "{engine}" engine in {len(mismatches)} scenario(s)')
+
+    if len(fork_mismatches) > 0:
+        sys.exit(f'State forks diverged from the live cluster state in {len(fork_mismatches)} check(s)')
+
 
 if __name__ == '__main__':
-    # Parsing named arguments from the command line
-    parser = argparse.ArgumentParser()
-
-    parser.add_argument('--simulation-type', '-s', help='Type of simulation (e.g., as fast as possible OR wallclock speed)')
-    parser.add_argument('--dataset', '-d', help='Input file containing the dataset for the simulation')
-    parser.add_argument('--maintenance-strategy', '-m', help='Name of a valid data center maintenance strategy')
-    parser.add_argument('--output-file', '-o', help='Name of output file to store simulation metrics')
-    args = parser.parse_args()
-
-    # Calling the main method
-    main(simulation_type=args.simulation_type, dataset=args.dataset,
-        maintenance_strategy=args.maintenance_strategy, output_file=args.output_file)
+    if len(sys.argv) > 1 and sys.argv[1] == 'validate':
+        # Parsing named arguments of fast-forward validations from the command line
+        parser = argparse.ArgumentParser(prog='simulator validate')
+
+        parser.add_argument('--datasets', '-d', nargs='+',
+            help='Datasets used in the validation (defaults to all datasets in the "data" directory)')
+        parser.add_argument('--maintenance-strategies', '-m', nargs='+',
+            help='Maintenance strategies used in the validation (defaults to all available strategies)')
+        parser.add_argument('--engine', '-e', default='simpy', choices=['simpy', 'event_loop'],
+            help='Discrete-event engine used as reference')
+        args = parser.parse_args(sys.argv[2:])
+
+        validate(datasets=args.datasets, maintenance_strategies=args.maintenance_strategies, engine=args.engine)
+
+    elif len(sys.argv) > 1 and sys.argv[1] == 'strategies':
+        # Listing the available maintenance strategies (bundled ones and the ones provided by installed packages)
+        strategies()
+
+    elif len(sys.argv) > 1 and sys.argv[1] == 'generate':
+        # Parsing named arguments of dataset generations from the command line
+        parser = argparse.ArgumentParser(prog='simulator generate')
+
+        parser.add_argument('--output-file', '-o', required=True,
+            help='Output file of the dataset (binary datasets end with ".npd", other names are stored as JSON)')
+        parser.add_argument('--servers', type=int, default=128, help='Number of servers')
+        parser.add_argument('--virtual-machines', type=int,
+            help='Number of VMs (derived from --occupation when not informed)')
+        parser.add_argument('--occupation', type=float, default=0.5,
+            help='Share (between 0 and 1) of the data center capacity used by VMs')
+        parser.add_argument('--server-capacities', nargs='+',
+            help='Valid server capacities as CPU,MEMORY,DISK values (e.g., 4,4,32 8,8,64)')
+        parser.add_argument('--server-capacity-weights', nargs='+', type=float,
+            help='Share of servers that receive each capacity')
+        parser.add_argument('--patch-durations', nargs='+',
+            help='Valid server durations as PATCH,SANITY_CHECK values (e.g., 300,600 900,1800)')
+        parser.add_argument('--patch-duration-weights', nargs='+', type=float,
+            help='Share of servers that receive each pair of durations')
+        parser.add_argument('--updated-servers', type=float, default=0,
+            help='Share (between 0 and 1) of servers that are already updated')
+        parser.add_argument('--vm-demands', nargs='+',
+            help='Valid VM demands as CPU,MEMORY,DISK values (e.g., 1,1,8 2,2,16)')
+        parser.add_argument('--vm-demand-weights', nargs='+', type=float, help='Share of VMs that receive each demand')
+        parser.add_argument('--link-bandwidths', nargs='+', type=int, help='Valid bandwidths of network links')
+        parser.add_argument('--link-bandwidth-weights', nargs='+', type=float,
+            help='Share of links that receive each bandwidth')
+        parser.add_argument('-k', type=int,
+            help='Number of ports of each fat-tree switch (defaults to the smallest fat-tree that fits all servers)')
+        parser.add_argument('--seed', type=int, default=SEED_VALUE, help='Seed value that allows reproducibility')
+        args = parser.parse_args(sys.argv[2:])
+
+        generate(output_file=args.output_file, seed=args.seed, servers=args.servers,
+            virtual_machines=args.virtual_machines, occupation=args.occupation,
+            server_capacities=parse_values(args.server_capacities),
+            server_capacity_weights=args.server_capacity_weights,
+            patch_durations=parse_values(args.patch_durations), patch_duration_weights=args.patch_duration_weights,
+            updated_servers=args.updated_servers, vm_demands=parse_values(args.vm_demands),
+            vm_demand_weights=args.vm_demand_weights, link_bandwidths=args.link_bandwidths,
+            link_bandwidth_weights=args.link_bandwidth_weights, k=args.k)
+
+    elif len(sys.argv) > 1 and sys.argv[1] == 'convert':
+        # Parsing named arguments of dataset conversions from the command line
+        parser = argparse.ArgumentParser(prog='simulator convert')
+
+        parser.add_argument('--datasets', '-d', nargs='+', required=True,
+            help='JSON datasets that will be converted into the binary format')
+        args = parser.parse_args(sys.argv[2:])
+
+        convert(datasets=args.datasets)
+
+    elif len(sys.argv) > 1 and sys.argv[1] == 'sweep':
+        # Parsing named arguments of parameter sweeps from the command line
+        parser = argparse.ArgumentParser(prog='simulator sweep')
+
+        parser.add_argument('--simulation-type', '-s', default='normal',
+            help='Type of simulation (e.g., as fast as possible OR wallclock speed)')
+        parser.add_argument('--datasets', '-d', nargs='+', required=True,
+            help='Input files containing the datasets for the simulations')
+        parser.add_argument('--maintenance-strategies', '-m', nargs='+', required=True,
+            help='Names of valid data center maintenance strategies')
+        parser.add_argument('--constant', '-c', action='append', default=[],
+            help='Values assumed by a constant during the sweep (e.g., SAVE_TIME=30,60). '
+            'Can be informed multiple times')
+        parser.add_argument('--seeds', nargs='+', type=int, default=[SEED_VALUE],
+            help='Seed values used by the simulations')
+        parser.add_argument('--processes', '-p', type=int, default=None,
+            help='Number of worker processes (defaults to the number of CPUs)')
+        parser.add_argument('--output-file', '-o',
+            help='Name of output file to store the overall metrics of all simulations (.csv, .jsonl, .parquet or '
+            '.xlsx, which is the default)')
+        parser.add_argument('--backend', '-b', default='object', choices=['object', 'array'],
+            help='Storage used by servers and VMs (plain objects OR columnar NumPy arrays)')
+        parser.add_argument('--engine', '-e', default='simpy', choices=['simpy', 'event_loop'],
+            help='Discrete-event engine that runs the simulations (SimPy OR the lightweight event loop)')
+        args = parser.parse_args(sys.argv[2:])
+
+        sweep(simulation_type=args.simulation_type, datasets=args.datasets,
+            maintenance_strategies=args.maintenance_strategies, constants=args.constant, seeds=args.seeds,
+            processes=args.processes, output_file=args.output_file, backend=args.backend, engine=args.engine)
+
+    else:
+        # Parsing named arguments from the command line
+        parser = argparse.ArgumentParser()
+
+        parser.add_argument('--simulation-type', '-s',
+            help='Type of simulation (e.g., as fast as possible OR wallclock speed)')
+        parser.add_argument('--dataset', '-d', help='Input file containing the dataset for the simulation')
+        parser.add_argument('--maintenance-strategy', '-m',
+            help='Name of a valid data center maintenance strategy (see the "strategies" command)')
+        parser.add_argument('--output-file', '-o',
+            help='Name of output file to store simulation metrics (.csv, .jsonl, .parquet or .xlsx, which is the '
+            'default)')
+        parser.add_argument('--backend', '-b', default='object', choices=['object', 'array'],
+            help='Storage used by servers and VMs (plain objects OR columnar NumPy arrays)')
+        parser.add_argument('--engine', '-e', default='simpy', choices=['simpy', 'event_loop'],
+            help='Discrete-event engine that runs the simulation (SimPy OR the lightweight event loop)')
+        parser.add_argument('--checkpoint-step', type=int,
+            help='Maintenance step after which the simulation state is stored')
+        parser.add_argument('--checkpoint-file', help=f'Checkpoint file (defaults to the output file name, or to the '
+            f'dataset and strategy names, followed by "{CHECKPOINT_SUFFIX}")')
+        parser.add_argument('--resume', help='Checkpoint file from which the simulation continues')
+        parser.add_argument('--profile', action='store_true',
+            help='Shows the wall time and calls of each simulation phase and maintenance step')
+        parser.add_argument('--profile-output',
+            help='Stores a Chrome trace (".json" files) or a cProfile dump (other names) of the simulation '
+            '(implies --profile)')
+        args = parser.parse_args()
+
+        # Calling the main method
+        main(simulation_type=args.simulation_type, dataset=args.dataset,
+            maintenance_strategy=args.maintenance_strategy, output_file=args.output_file, backend=args.backend,
+            engine=args.engine, checkpoint_step=args.checkpoint_step, checkpoint_file=args.checkpoint_file,
+            resume=args.resume, profile=args.profile, profile_output=args.profile_output)
@@ -1,13 +1,20 @@
 # General-purpose simulator modules
 from simulator.components.misc.object_collection import ObjectCollection
+from simulator.misc.migration_log import MigrationSummary
 import simulator.misc.constants as constants
 
+# Simulator components
+from simulator.components.infrastructure.server import Server
+
 
 class VirtualMachine(ObjectCollection):
-    """ This class allows the creation of virtual machine (VM) objects.
+    """ This class allows the creation of virtual machine (VM) objects. VMs don't have a '__dict__' (their
+    attributes are stored in slots), their migration history is gathered from the simulation's migration log,
+    and references shared by all VMs, such as the network topology and the simulation environment, are
+    gathered from the simulation context that stores them instead of being kept by each VM.
     """
 
-    instances = []
+    __slots__ = ['id', 'cpu_demand', 'memory_demand', 'disk_demand', 'server']
 
     def __init__(self, id, cpu, memory, disk):
         """ This method creates a VM object.
@@ -38,18 +45,9 @@ class VirtualMachine(ObjectCollection):
         # Server that hosts the VM
         self.server = None
 
-        # Helper list that allows us to keep track of all VM migrations
-        self.migrations = []
-
-        # Network topology
-        self.topology = None
-
-        # Simulation environment
-        self.simulation_environment = None
-
 
         # Adding the new object to the list of instances of its class
-        VirtualMachine.instances.append(self)
+        VirtualMachine.register(self)
 
 
     def __str__(self):
@@ -60,6 +58,62 @@ class VirtualMachine(ObjectCollection):
         return(f'VM_{self.id}')
 
 
+    @property
+    def topology(self):
+        """ Returns the network topology of the simulation context that stores the VM.
+        """
+
+        return(self._object_collection.context.topology)
+
+
+    @property
+    def simulation_environment(self):
+        """ Returns the simulation environment of the simulation context that stores the VM.
+        """
+
+        return(self._object_collection.context.environment)
+
+
+    @property
+    def migrations(self):
+        """ Gathers the migrations of the VM from the simulation's migration log. Each migration is described
+        by a dictionary with the maintenance step, duration, origin server and destination server. The returned
+        list is a copy, so changing it doesn't change the migration log. Only the migrations retained by the log
+        are gathered (see 'MIGRATION_HISTORY' in 'constants' and 'migration_summary').
+
+        Returns
+        =======
+        migrations : List
+            Migrations of the VM (following the order in which they were performed)
+        """
+
+        simulation_environment = self.simulation_environment
+        if simulation_environment is None:
+            return([])
+
+        return([{'maintenance_step': migration.maintenance_step, 'duration': migration.duration,
+            'origin': Server.find_by_id(migration.origin), 'destination': Server.find_by_id(migration.destination)}
+            for migration in simulation_environment.migration_log.by_vm(self.id)])
+
+
+    @property
+    def migration_summary(self):
+        """ Gathers the number of migrations and overall migration duration of the VM from the simulation's
+        migration log, which keeps them regardless of how many migration records it retains.
+
+        Returns
+        =======
+        summary : MigrationSummary
+            Aggregated migrations of the VM
+        """
+
+        simulation_environment = self.simulation_environment
+        if simulation_environment is None:
+            return(MigrationSummary(count=0, total_duration=0, longest_duration=None))
+
+        return(simulation_environment.migration_log.vm_summary(self.id))
+
+
     def demand(self):
         """ Computes the overall VM demand. We use the geometric mean as we compute
         demand attributes differently. More specifically, we represent 'cpu_demand' as
@@ -78,17 +132,39 @@ class VirtualMachine(ObjectCollection):
         return(demand)
 
 
-    def migration_time(self):
+    def migration_time(self, origin_server=None, destination_server=None):
         """ Migration equation presented by Severo et al. that computes the
         migration duration. We multiply memory and disk demands by 1024 to convert
         these values from gigabytes to megabytes.
 
+        When the destination server is known (and topology-aware migrations are enabled), the network
+        delay is computed from the bottleneck bandwidth of the path between the origin and destination
+        servers within the network topology. Otherwise, we use the network bandwidth defined in 'constants'.
+
+        Parameters
+        ==========
+        origin_server : Server, optional
+            Server that hosts the VM before the migration (defaults to the current host of the VM)
+
+        destination_server : Server, optional
+            Server to which the VM will be migrated
+
         Returns
         =======
         migration_time : int
             Amount of time needed to migrate a VM through the network to another host
         """
-        network_delay = (self.memory_demand * 1024 + self.disk_demand * 1024) / constants.NETWORK_BW
+
+        bandwidth = None
+        if constants.TOPOLOGY_AWARE_MIGRATION and destination_server is not None and self.topology is not None:
+            origin_server = origin_server if origin_server is not None else self.server
+            bandwidth = self.topology.bottleneck_bandwidth(origin_server, destination_server)
+
+        # Falling back to the network bandwidth defined in 'constants' for servers that are not part of the topology
+        if bandwidth is None:
+            bandwidth = constants.NETWORK_BW
+
+        network_delay = (self.memory_demand * 1024 + self.disk_demand * 1024) / bandwidth
         migration_time = int(constants.SAVE_TIME + network_delay + constants.RESTORE_TIME)
 
         return(migration_time)
@@ -103,6 +179,33 @@ class VirtualMachine(ObjectCollection):
             Server object to which the VM will be migrated
         """
 
+        # Moving the VM to the destination server
+        origin_server = self.relocate(destination_server)
+
+        # Gathering the migration time for the VM
+        migration_time = self.migration_time(origin_server=origin_server, destination_server=destination_server)
+
+        # Storing migration metadata to allow post-simulation analysis
+        self.record_migration(origin_server=origin_server, destination_server=destination_server,
+            start=self.simulation_environment.env.now, duration=migration_time)
+
+        return(migration_time)
+
+
+    def relocate(self, destination_server):
+        """ Moves the VM from its current host to a destination host, updating the demand of both servers.
+
+        Parameters
+        ==========
+        destination_server : Server
+            Server object to which the VM will be moved
+
+        Returns
+        =======
+        origin_server : Server
+            Server that hosted the VM before it was moved
+        """
+
         # Removes the VM from the origin server and updates its demand
         origin_server = self.server
         origin_server.virtual_machines.remove(self)
@@ -120,12 +223,27 @@ class VirtualMachine(ObjectCollection):
 
         self.server = destination_server
 
-        # Gathering the migration time for the VM
-        migration_time = self.migration_time()
+        return(origin_server)
 
-        # Storing migration metadata to allow post-simulation analysis
-        self.migrations.append({'maintenance_step': self.simulation_environment.maintenance_step,
-            'duration': migration_time, 'origin': origin_server,
-            'destination': destination_server})
 
-        return(migration_time)
+    def record_migration(self, origin_server, destination_server, start, duration):
+        """ Stores the metadata of a VM migration.
+
+        Parameters
+        ==========
+        origin_server : Server
+            Server that hosted the VM before the migration
+
+        destination_server : Server
+            Server that hosts the VM after the migration
+
+        start : int
+            Simulation time in which the migration started
+
+        duration : int
+            Migration duration
+        """
+
+        # Adding the migration to the simulation's migration log (which is indexed by maintenance step)
+        self.simulation_environment.migration_log.append(maintenance_step=self.simulation_environment.maintenance_step,
+            vm=self.id, origin=origin_server.id, destination=destination_server.id, start=start, duration=duration)
@@ -1,3 +1,7 @@
+# Python Libraries
+from collections import deque
+import networkx as nx
+
 # General-purpose simulator modules
 from fnss.topologies import DatacenterTopology
 from simulator.components.misc.object_collection import ObjectCollection
@@ -7,8 +11,6 @@ class FatTree(DatacenterTopology, ObjectCollection):
     """ This class allows the creation of networks using the fat-tree topology.
     """
 
-    instances = []
-
     def __init__(self):
         """ This method creates a FatTree object.
         """
@@ -17,10 +19,19 @@ class FatTree(DatacenterTopology, ObjectCollection):
         super().__init__(self)
 
         # Unique identifier
-        self.id = len(FatTree.instances) + 1
+        self.id = FatTree.count() + 1
+
+        # Precomputed hop counts and bottleneck bandwidths between servers (see 'TopologyCache')
+        self.topology_cache = None
+
+        # Bottleneck bandwidths between each source node (keys) and the other nodes of the topology
+        self.bottleneck_bandwidths = {}
+
+        # Predecessor of each node within the widest shortest paths from each source node (keys)
+        self.predecessors = {}
 
         # Adding the new object to the list of instances of its class
-        FatTree.instances.append(self)
+        FatTree.register(self)
 
 
     def __str__(self):
@@ -29,3 +40,136 @@ class FatTree(DatacenterTopology, ObjectCollection):
 
     def __repr__(self):
         return(f'TOPO_{self.id}')
+
+
+    def bottleneck_bandwidth(self, origin, destination):
+        """ Gathers the bandwidth of the slowest link within the path between two nodes. Among the shortest
+        paths between the nodes (i.e., paths with the lowest number of hops), we consider the path whose
+        bottleneck bandwidth is the highest. Bottlenecks from a given origin to all other nodes are computed
+        once (with a breadth-first search) and cached, so subsequent queries from the same origin are lookups.
+        Queries between servers are answered by the topology cache (when available) in constant time.
+
+        Parameters
+        ==========
+        origin : Any
+            Origin node
+
+        destination : Any
+            Destination node
+
+        Returns
+        =======
+        bottleneck_bandwidth : int
+            Bandwidth of the slowest link within the path (or None if there is no path between the nodes)
+        """
+
+        if self.topology_cache is not None and origin in self.topology_cache and destination in self.topology_cache:
+            return(self.topology_cache.bottleneck_bandwidth(origin, destination))
+
+        if origin not in self.bottleneck_bandwidths:
+            self.bottleneck_bandwidths[origin], self.predecessors[origin] = self.bottleneck_bandwidths_from(origin)
+
+        return(self.bottleneck_bandwidths[origin].get(destination))
+
+
+    def hop_count(self, origin, destination):
+        """ Gathers the number of hops within the shortest path between two nodes.
+
+        Parameters
+        ==========
+        origin : Any
+            Origin node
+
+        destination : Any
+            Destination node
+
+        Returns
+        =======
+        hop_count : int
+            Number of hops between the nodes (or None if there is no path between the nodes)
+        """
+
+        if self.topology_cache is not None and origin in self.topology_cache and destination in self.topology_cache:
+            return(self.topology_cache.hop_count(origin, destination))
+
+        try:
+            return(nx.shortest_path_length(self, origin, destination))
+        except (nx.NetworkXNoPath, nx.NodeNotFound):
+            return(None)
+
+
+    def widest_shortest_path(self, origin, destination):
+        """ Gathers the path between two nodes whose bottleneck bandwidth is the highest among the shortest
+        paths between the nodes. Paths are rebuilt from the breadth-first search cached for the origin node.
+
+        Parameters
+        ==========
+        origin : Any
+            Origin node
+
+        destination : Any
+            Destination node
+
+        Returns
+        =======
+        path : List
+            Nodes within the path, including the origin and destination nodes (or None if there is no path)
+        """
+
+        if origin not in self.bottleneck_bandwidths:
+            self.bottleneck_bandwidths[origin], self.predecessors[origin] = self.bottleneck_bandwidths_from(origin)
+
+        predecessors = self.predecessors[origin]
+        if destination not in predecessors:
+            return(None)
+
+        path = [destination]
+        while path[-1] != origin:
+            path.append(predecessors[path[-1]])
+
+        return(path[::-1])
+
+
+    def bottleneck_bandwidths_from(self, origin):
+        """ Computes the bottleneck bandwidth of the widest shortest path between a node and all other nodes.
+
+        Parameters
+        ==========
+        origin : Any
+            Origin node
+
+        Returns
+        =======
+        bottleneck_bandwidths : Dictionary
+            Bottleneck bandwidth of the paths from the origin to each reachable node
+
+        predecessors : Dictionary
+            Node that precedes each reachable node within its path from the origin
+        """
+
+        if origin not in self:
+            return({}, {})
+
+        hops = {origin: 0}
+        bottleneck_bandwidths = {origin: float('inf')}
+        predecessors = {origin: None}
+
+        # Nodes are visited in breadth-first order, so the bottleneck of a node is final once it's visited
+        queue = deque([origin])
+        while queue:
+            node = queue.popleft()
+
+            for neighbor, link in self._adj[node].items():
+                bandwidth = min(bottleneck_bandwidths[node], link['bandwidth'])
+
+                if neighbor not in hops:
+                    hops[neighbor] = hops[node] + 1
+                    bottleneck_bandwidths[neighbor] = bandwidth
+                    predecessors[neighbor] = node
+                    queue.append(neighbor)
+
+                elif hops[neighbor] == hops[node] + 1 and bandwidth > bottleneck_bandwidths[neighbor]:
+                    bottleneck_bandwidths[neighbor] = bandwidth
+                    predecessors[neighbor] = node
+
+        return(bottleneck_bandwidths, predecessors)
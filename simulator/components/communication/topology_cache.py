@@ -0,0 +1,403 @@
+# Python Libraries
+import os
+import numpy as np
+
+
+# Suffix of topology cache files (stored next to datasets within the 'data' directory)
+TOPOLOGY_CACHE_SUFFIX = '.topology.npz'
+
+
+class TopologyCache:
+    """ This class stores the hop count and the bottleneck bandwidth between every pair of servers of the
+    data center, so that locality queries don't involve any graph search during the simulation.
+
+    Single-homed servers are reached through the node they are attached to (e.g., their edge switch), whereas
+    the other servers are attachment nodes themselves. Instead of storing dense matrices with all pairs of
+    servers, the cache stores the attachment node, the number of hops to it (0 or 1) and the uplink bandwidth
+    of each server, plus the hop count and bottleneck bandwidth between attachment nodes. Hop counts and
+    bottlenecks between servers are derived from these tables when they are queried, so fat-trees only need
+    one row and column per edge switch.
+
+    Among the shortest paths between two servers, we consider the path whose bottleneck bandwidth is the
+    highest. The paths from each attachment node are computed with a breadth-first search (vectorized over
+    each level of the search) the first time a server attached to it is queried, so caches built from a
+    dataset only compute the rows they need. Stored caches have all rows computed beforehand.
+    """
+
+    # Hop count used for pairs of nodes with no path between them
+    UNREACHABLE = -1
+
+    def __init__(self, server_ids, attachments, offsets, uplinks, attachment_hops=None, attachment_bandwidth=None,
+        dataset=None):
+        """ Creates a TopologyCache object.
+
+        Parameters
+        ==========
+        server_ids : numpy.ndarray
+            ID of each server (following the order of servers within the dataset)
+
+        attachments : numpy.ndarray
+            Attachment node (row of the attachment matrices) of each server, or UNREACHABLE for servers that are
+            not part of the topology
+
+        offsets : numpy.ndarray
+            Number of hops between each server and its attachment node (1 for single-homed servers, 0 otherwise)
+
+        uplinks : numpy.ndarray
+            Bandwidth of the link between each server and its attachment node (infinite for attachment nodes)
+
+        attachment_hops : numpy.ndarray, optional
+            Matrix with the number of hops between each pair of attachment nodes (rows are computed on demand
+            from the dataset when the matrix is not informed)
+
+        attachment_bandwidth : numpy.ndarray, optional
+            Matrix with the bottleneck bandwidth between each pair of distinct attachment nodes
+
+        dataset : BinaryDataset, optional
+            Dataset with the network topology (required when the attachment matrices are not informed)
+        """
+
+        self.server_ids = server_ids
+        self.attachments = attachments
+        self.offsets = offsets
+        self.uplinks = uplinks
+
+        # Hop counts and bottleneck bandwidths from each attachment node (keys) to all attachment nodes
+        self.rows = {}
+        if attachment_hops is not None:
+            self.rows = {attachment: (hops, bandwidth)
+                for attachment, (hops, bandwidth) in enumerate(zip(attachment_hops, attachment_bandwidth))}
+
+        self.dataset = dataset
+
+        # Index that maps server IDs to their position within the server tables
+        self.positions = {server_id: position for position, server_id in enumerate(server_ids.tolist())}
+
+        # Topology nodes that represent each attachment node and nodes left out of searches (single-homed servers
+        # are leaves, so they are never part of the paths between attachment nodes)
+        if dataset is not None:
+            self.attachment_nodes = np.zeros(int(attachments.max(initial=-1)) + 1, dtype=np.int64)
+            self.skipped = dataset.node_servers & (np.diff(dataset.indptr) == 1)
+
+            node_positions = {node_id: position for position, (is_server, node_id) in
+                enumerate(zip(dataset.node_servers.tolist(), dataset.node_ids.tolist())) if is_server}
+
+            for position, (server_id, attachment) in enumerate(zip(server_ids.tolist(), attachments.tolist())):
+                if attachment != TopologyCache.UNREACHABLE:
+                    node = node_positions[server_id]
+                    self.attachment_nodes[attachment] = node if offsets[position] == 0 else dataset.indices[
+                        dataset.indptr[node]]
+
+            self.skipped[self.attachment_nodes] = False
+
+            # Bottleneck bandwidths are stored with the smallest type that fits the bandwidth of links
+            self.bandwidth_dtype = dataset.bandwidth.dtype
+            if np.issubdtype(self.bandwidth_dtype, np.integer) and len(dataset.bandwidth) > 0:
+                self.bandwidth_dtype = np.promote_types(np.min_scalar_type(int(dataset.bandwidth.max())),
+                    np.min_scalar_type(int(dataset.bandwidth.min())))
+
+
+    def __contains__(self, server):
+        return(getattr(server, 'id', None) in self.positions)
+
+
+    @classmethod
+    def from_dataset(cls, dataset):
+        """ Builds the topology cache from the CSR adjacency list of a binary dataset. Only the attachment node
+        of each server is gathered beforehand (paths between attachment nodes are computed on demand).
+
+        Parameters
+        ==========
+        dataset : BinaryDataset
+            Dataset with the network topology
+
+        Returns
+        =======
+        topology_cache : TopologyCache
+            Hop counts and bottleneck bandwidths between servers
+        """
+
+        indptr = dataset.indptr
+        degrees = np.diff(indptr)
+
+        # Gathering the position of each server within the node table
+        node_positions = {node_id: position for position, (is_server, node_id) in
+            enumerate(zip(dataset.node_servers.tolist(), dataset.node_ids.tolist())) if is_server}
+
+        server_ids = np.array(dataset.servers['id'], dtype=np.int64)
+        server_count = len(server_ids)
+
+        # Attachment node, number of hops to it and uplink bandwidth of each server
+        attachment_nodes = {}
+        attachments = np.full(server_count, TopologyCache.UNREACHABLE, dtype=np.int32)
+        offsets = np.zeros(server_count, dtype=np.int8)
+        uplinks = np.full(server_count, np.inf)
+
+        for position, server_id in enumerate(server_ids.tolist()):
+            if server_id not in node_positions:
+                continue
+
+            node = node_positions[server_id]
+            if degrees[node] == 1:
+                offsets[position] = 1
+                uplinks[position] = dataset.bandwidth[indptr[node]]
+                node = int(dataset.indices[indptr[node]])
+
+            attachments[position] = attachment_nodes.setdefault(node, len(attachment_nodes))
+
+        return(cls(server_ids=server_ids, attachments=attachments, offsets=offsets, uplinks=uplinks, dataset=dataset))
+
+
+    @classmethod
+    def load(cls, path):
+        """ Loads a topology cache stored by 'save'.
+
+        Parameters
+        ==========
+        path : string
+            Path of the topology cache file
+
+        Returns
+        =======
+        topology_cache : TopologyCache
+            Hop counts and bottleneck bandwidths between servers
+        """
+
+        with np.load(path) as data:
+            return(cls(server_ids=data['server_ids'], attachments=data['attachments'], offsets=data['offsets'],
+                uplinks=data['uplinks'], attachment_hops=data['attachment_hops'],
+                attachment_bandwidth=data['attachment_bandwidth']))
+
+
+    @classmethod
+    def load_stored(cls, server_ids, dataset_path, cache_path):
+        """ Loads the topology cache stored next to a dataset, as long as the cache is up to date (i.e., it's not
+        older than the dataset and it has the servers of the dataset).
+
+        Parameters
+        ==========
+        server_ids : List
+            ID of each server of the dataset (following the order of servers within the dataset)
+
+        dataset_path : string
+            Path of the dataset file (or directory, for binary datasets)
+
+        cache_path : string
+            Path of the topology cache file
+
+        Returns
+        =======
+        topology_cache : TopologyCache
+            Hop counts and bottleneck bandwidths between servers (or None if there is no up-to-date cache)
+        """
+
+        if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(dataset_path):
+            topology_cache = cls.load(cache_path)
+
+            if np.array_equal(topology_cache.server_ids, server_ids):
+                return(topology_cache)
+
+        return(None)
+
+
+    def save(self, path):
+        """ Stores the topology cache into a '.npz' file (computing the rows that were not computed yet).
+
+        Parameters
+        ==========
+        path : string
+            Path of the topology cache file
+        """
+
+        rows = [self.attachment_row(attachment) for attachment in range(int(self.attachments.max(initial=-1)) + 1)]
+
+        attachment_hops = np.array([hops for hops, _ in rows], dtype=np.int8).reshape(len(rows), len(rows))
+        attachment_bandwidth = np.array([bandwidth for _, bandwidth in rows]).reshape(len(rows), len(rows))
+
+        with open(path, 'wb') as cache_file:
+            np.savez(cache_file, server_ids=self.server_ids, attachments=self.attachments, offsets=self.offsets,
+                uplinks=self.uplinks, attachment_hops=attachment_hops, attachment_bandwidth=attachment_bandwidth)
+
+
+    def attachment_row(self, attachment):
+        """ Gathers the hop counts and bottleneck bandwidths from an attachment node to all attachment nodes,
+        computing them with a breadth-first search on the dataset's topology the first time they are needed.
+
+        Parameters
+        ==========
+        attachment : int
+            Attachment node (row of the attachment matrices)
+
+        Returns
+        =======
+        hops : numpy.ndarray
+            Number of hops to each attachment node
+
+        bandwidth : numpy.ndarray
+            Bottleneck bandwidth to each attachment node (0 for the attachment node itself)
+        """
+
+        row = self.rows.get(attachment)
+
+        if row is None:
+            dataset = self.dataset
+            hops, bottlenecks = breadth_first_search(dataset.indptr, dataset.indices, dataset.bandwidth,
+                self.attachment_nodes[attachment], self.skipped)
+
+            hops = hops[self.attachment_nodes]
+            if hops.max(initial=0) > np.iinfo(np.int8).max:
+                raise Exception(f'Paths between attachment nodes with more than {np.iinfo(np.int8).max} hops are '
+                    'not supported! Exiting.')
+
+            # Servers attached to the same node only depend on their uplinks, so the diagonal is left empty
+            bandwidth = bottlenecks[self.attachment_nodes]
+            bandwidth[attachment] = 0
+            bandwidth[hops == TopologyCache.UNREACHABLE] = 0
+
+            row = self.rows[attachment] = (hops.astype(np.int8), bandwidth.astype(self.bandwidth_dtype))
+
+        return(row)
+
+
+    def hop_count(self, origin, destination):
+        """ Gathers the number of hops between two servers.
+
+        Parameters
+        ==========
+        origin : Server
+            Origin server
+
+        destination : Server
+            Destination server
+
+        Returns
+        =======
+        hop_count : int
+            Number of hops between the servers (or None if there is no path between them)
+        """
+
+        origin = self.positions[origin.id]
+        destination = self.positions[destination.id]
+
+        origin_attachment = self.attachments[origin]
+        destination_attachment = self.attachments[destination]
+
+        if origin_attachment == TopologyCache.UNREACHABLE or destination_attachment == TopologyCache.UNREACHABLE:
+            return(None)
+
+        if origin == destination:
+            return(0)
+
+        hops = int(self.attachment_row(origin_attachment)[0][destination_attachment])
+        if hops == TopologyCache.UNREACHABLE:
+            return(None)
+
+        return(int(self.offsets[origin]) + hops + int(self.offsets[destination]))
+
+
+    def bottleneck_bandwidth(self, origin, destination):
+        """ Gathers the bandwidth of the slowest link within the widest shortest path between two servers.
+
+        Parameters
+        ==========
+        origin : Server
+            Origin server
+
+        destination : Server
+            Destination server
+
+        Returns
+        =======
+        bottleneck_bandwidth : float
+            Bottleneck bandwidth between the servers (or None if there is no path between them)
+        """
+
+        origin = self.positions[origin.id]
+        destination = self.positions[destination.id]
+
+        origin_attachment = self.attachments[origin]
+        destination_attachment = self.attachments[destination]
+
+        if origin_attachment == TopologyCache.UNREACHABLE or destination_attachment == TopologyCache.UNREACHABLE:
+            return(None)
+
+        if origin == destination:
+            return(float('inf'))
+
+        hops, bottlenecks = self.attachment_row(origin_attachment)
+        if hops[destination_attachment] == TopologyCache.UNREACHABLE:
+            return(None)
+
+        # Servers attached to the same node are only connected through their uplinks
+        bandwidth = min(self.uplinks[origin], self.uplinks[destination])
+        if origin_attachment != destination_attachment:
+            bandwidth = min(bandwidth, bottlenecks[destination_attachment])
+
+        return(float(bandwidth))
+
+
+def breadth_first_search(indptr, indices, link_bandwidths, origin, skipped):
+    """ Computes the number of hops and the bottleneck bandwidth of the widest shortest path between a node
+    and all other nodes of a topology represented as a CSR adjacency list. Nodes are visited one level at a
+    time, and each level is expanded with vectorized operations over all links that leave it.
+
+    Parameters
+    ==========
+    indptr : numpy.ndarray
+        Position of the first neighbor of each node within 'indices'
+
+    indices : numpy.ndarray
+        Neighbors of each node
+
+    link_bandwidths : numpy.ndarray
+        Bandwidth of the link to each neighbor (following 'indices')
+
+    origin : int
+        Position of the origin node
+
+    skipped : numpy.ndarray
+        Tells whether each node is left out of the search
+
+    Returns
+    =======
+    hops : numpy.ndarray
+        Number of hops from the origin to each node (UNREACHABLE for nodes that can't be reached)
+
+    bottlenecks : numpy.ndarray
+        Bottleneck bandwidth from the origin to each node (0 for nodes that can't be reached)
+    """
+
+    hops = np.full(len(indptr) - 1, TopologyCache.UNREACHABLE, dtype=np.int64)
+    bottlenecks = np.zeros(len(indptr) - 1)
+
+    hops[origin] = 0
+    bottlenecks[origin] = np.inf
+
+    frontier = np.array([origin], dtype=np.int64)
+    level = 0
+    while len(frontier) > 0:
+        # Gathering all links that leave the current level
+        starts = indptr[frontier]
+        counts = indptr[frontier + 1] - starts
+        positions = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+
+        neighbors = indices[positions]
+        bandwidths = np.minimum(np.repeat(bottlenecks[frontier], counts), link_bandwidths[positions])
+
+        # Nodes reached for the first time belong to the next level, and their bottleneck is the widest among
+        # the links that reach them
+        reached = (hops[neighbors] == TopologyCache.UNREACHABLE) & ~skipped[neighbors]
+        neighbors = neighbors[reached]
+        bandwidths = bandwidths[reached]
+
+        order = np.lexsort((bandwidths, neighbors))
+        neighbors = neighbors[order]
+        last = np.ones(len(neighbors), dtype=bool)
+        last[:-1] = neighbors[1:] != neighbors[:-1]
+
+        level += 1
+        frontier = neighbors[last]
+        hops[frontier] = level
+        bottlenecks[frontier] = bandwidths[order][last]
+
+    return(hops, bottlenecks)
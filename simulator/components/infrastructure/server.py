@@ -1,13 +1,49 @@
 # General-purpose simulator modules
 from simulator.components.misc.object_collection import ObjectCollection
+from simulator.components.resource_management.placement_check import check_placement
 import simulator.misc.constants as constants
 
 
+class UpdateStatus:
+    """ This class gives access to the update status of servers (stored in the '_updated' slot) when used through
+    server objects (e.g., 'server.updated'), and to the list of updated servers when used through the class
+    (i.e., 'Server.updated()'), as both share the same name.
+    """
+
+    def __init__(self, updated_servers):
+        """ Creates an UpdateStatus object.
+
+        Parameters
+        ==========
+        updated_servers : classmethod
+            Class method that gathers the list of updated servers
+        """
+
+        self.updated_servers = updated_servers
+
+
+    def __get__(self, server, owner=None):
+        if server is None:
+            return(self.updated_servers.__get__(owner, owner))
+
+        return(server._updated)
+
+
+    def __set__(self, server, value):
+        object.__setattr__(server, '_updated', value)
+
+
 class Server(ObjectCollection):
-    """ This class allows the creation of server objects.
+    """ This class allows the creation of server objects. Servers don't have a '__dict__' (their attributes are
+    stored in slots), and references shared by all servers, such as the network topology and the simulation
+    environment, are gathered from the simulation context that stores them instead of being kept by each server.
     """
 
-    instances = []
+    __slots__ = ['id', 'cpu_capacity', 'memory_capacity', 'disk_capacity', 'cpu_demand', 'memory_demand',
+        'disk_demand', 'virtual_machines', '_updated', 'update_step', 'patch_duration', 'sanity_check_duration']
+
+    # Attributes indexed by ObjectCollection so that 'find_by' doesn't need to walk through all servers
+    indexed_attributes = ['updated']
 
     def __init__(self, id, cpu, memory, disk, updated):
         """ This method creates a VM object.
@@ -54,14 +90,8 @@ class Server(ObjectCollection):
         self.patch_duration = 0
         self.sanity_check_duration = 0
 
-        # Network topology
-        self.topology = None
-
-        # Simulation environment
-        self.simulation_environment = None
-
         # Adding the new object to the list of instances of its class
-        Server.instances.append(self)
+        Server.register(self)
 
 
     def __str__(self):
@@ -72,6 +102,22 @@ class Server(ObjectCollection):
         return(f'Server_{self.id}')
 
 
+    @property
+    def topology(self):
+        """ Returns the network topology of the simulation context that stores the server.
+        """
+
+        return(self._object_collection.context.topology)
+
+
+    @property
+    def simulation_environment(self):
+        """ Returns the simulation environment of the simulation context that stores the server.
+        """
+
+        return(self._object_collection.context.environment)
+
+
     def update(self):
         """ Updates the server.
 
@@ -117,9 +163,6 @@ class Server(ObjectCollection):
             Overall server's demand
         """
 
-        # Computing server's demand
-        self.compute_demand()
-
         # Computing server's overall demand
         overall_demand = (self.cpu_demand * self.memory_demand * self.disk_demand) ** (1/3)
 
@@ -127,7 +170,9 @@ class Server(ObjectCollection):
 
 
     def compute_demand(self):
-        """ Computes the server's demand based on the list of VMs it hosts.
+        """ Computes the server's demand based on the list of VMs it hosts. Server demand is kept up to date
+        by the code that changes VM placements (e.g., 'VirtualMachine.migrate'), so this method is only
+        needed to rebuild the demand attributes from scratch.
         """
 
         self.cpu_demand = 0
@@ -154,16 +199,14 @@ class Server(ObjectCollection):
             Answer that tells us if the server has resources to host the virtual machine
         """
 
-        # Updating server's demand
-        self.compute_demand()
-
         return(self.cpu_demand + vm.cpu_demand <= self.cpu_capacity and
             self.memory_demand + vm.memory_demand <= self.memory_capacity and
             self.disk_demand + vm.disk_demand <= self.disk_capacity)
 
 
     def drain_duration(self):
-        """ Calculates the time needed to empty the server.
+        """ Calculates the time needed to empty the server. As the destination of each VM is
+        not known beforehand, migration times are estimated using the default network bandwidth.
 
         Returns
         =======
@@ -206,9 +249,6 @@ class Server(ObjectCollection):
             Occupation rate of a server
         """
 
-        # Updating server's demand
-        self.compute_demand()
-
         # Gathering current resource usage (in percent)
         cpu_usage_percentage = self.cpu_demand * 100 / self.cpu_capacity
         memory_usage_percentage = self.memory_demand * 100 / self.memory_capacity
@@ -262,7 +302,7 @@ class Server(ObjectCollection):
             List of nonupdated servers
         """
 
-        return([sv for sv in Server.all() if sv.updated == False])
+        return(Server.find_by('updated', False))
 
 
     @classmethod
@@ -275,7 +315,11 @@ class Server(ObjectCollection):
             List of updated servers
         """
 
-        return([sv for sv in Server.all() if sv.updated == True])
+        return(Server.find_by('updated', True))
+
+
+    # The update status of each server shares its name with the class method above
+    updated = UpdateStatus(updated)
     
 
     @classmethod
@@ -302,6 +346,10 @@ class Server(ObjectCollection):
     def can_host_vms(cls, servers, virtual_machines):
         """ Checks whether a set of servers have resources or not to host a collection of VMs.
         We look for this as a Bin-Packing problem, so use a Best-Fit to avoid resource wastage.
+
+        Each VM is checked against the current demand of the servers (tentative allocations are not
+        accumulated). The check is performed by 'check_placement', which works on a copy of the servers'
+        residual capacity matrix (so servers are left untouched).
         
         Parameters
         ==========
@@ -318,26 +366,23 @@ class Server(ObjectCollection):
             to host all VMs within the list.
         """
 
-        vms_allocated = 0
+        return(check_placement(servers, virtual_machines))
 
-        virtual_machines = sorted(virtual_machines, key=lambda vm: -vm.demand())
 
-        # Verifying if all VMs could be hosted by the list of servers
-        for vm in virtual_machines:
-            # Sorting servers according to their demand (descending)
-            servers = sorted(servers, key=lambda sv: -sv.occupation_rate())
+    @classmethod
+    def check_demand_consistency(cls):
+        """ Checks whether the demand attributes maintained incrementally by each server match
+        the demand computed from scratch based on the list of VMs it hosts. This check walks through
+        all VMs, so it's only performed by the simulation when the 'DEBUG' constant is enabled.
+        """
 
-            for server in servers:
-                if vm.server != server and server.has_capacity_to_host(vm):
-                    server.cpu_demand += vm.cpu_demand
-                    server.memory_demand += vm.memory_demand
-                    server.disk_demand += vm.disk_demand
+        for server in Server.all():
+            cpu_demand = sum(vm.cpu_demand for vm in server.virtual_machines)
+            memory_demand = sum(vm.memory_demand for vm in server.virtual_machines)
+            disk_demand = sum(vm.disk_demand for vm in server.virtual_machines)
 
-                    vms_allocated += 1
-                    break
-        
-        # Recomputing servers demand
-        for server in servers:
-            server.compute_demand()
+            expected_demand = (cpu_demand, memory_demand, disk_demand)
+            found_demand = (server.cpu_demand, server.memory_demand, server.disk_demand)
 
-        return(len(virtual_machines) == vms_allocated)
+            if found_demand != expected_demand:
+                raise Exception(f'Inconsistent demand on {server}! Expected {expected_demand}, found {found_demand}.')
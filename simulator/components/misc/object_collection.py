@@ -1,14 +1,147 @@
+# General-purpose simulator modules
+from simulator.misc.simulation_context import SimulationContext
+
+
 class ObjectCollection:
     """ This class provides a set of auxiliar methods that facilitates
     objects manipulation so that we can just create objects and accessing
     them using these methods instead of storing them into lists and
     passing these lists to each method we want to call.
+
+    Objects are stored by the active simulation context (see 'SimulationContext'),
+    so simulations running in different contexts don't see each other's objects.
+    Subclasses share the collection of the class that directly inherits from
+    ObjectCollection (e.g., 'ArrayServer' objects are part of the 'Server' collection).
+
+    Besides the list of instances, each collection keeps a hash index by 'id' and
+    secondary hash indexes for the attributes listed in 'indexed_attributes'.
+    Indexes are updated whenever an object is registered or one of its indexed
+    attributes changes, so 'find_by_id' and 'find_by' (for indexed attributes)
+    don't need to walk through the list of instances.
     """
 
+    # Collection that stores the object and its position within the list of instances (subclasses that don't
+    # define '__slots__' keep their attributes in a '__dict__', as usual)
+    __slots__ = ['_object_collection', '_position']
+
+    # Attributes (besides 'id') that have a secondary index. Subclasses can override this list
+    indexed_attributes = []
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        # Class that owns the collection and names of the indexed attributes
+        cls._collection_owner = next(klass for klass in cls.__mro__ if ObjectCollection in klass.__bases__)
+        cls._index_names = frozenset(['id'] + cls._collection_owner.indexed_attributes)
+
+
     def __init__(self):
         pass
 
 
+    def __setattr__(self, name, value):
+        """ Assigns an attribute to the object. If the object is already part of a collection
+        and the attribute is indexed, the collection indexes are updated accordingly.
+        """
+
+        collection = getattr(self, '_object_collection', None)
+
+        if collection is not None and name in collection.indexes:
+            ObjectCollection._unindex(collection, self, name)
+            object.__setattr__(self, name, value)
+            ObjectCollection._index(collection, self, name)
+        else:
+            object.__setattr__(self, name, value)
+
+
+    @classmethod
+    def register(cls, obj):
+        """ Adds a new object to the collection of its class within the active simulation context.
+
+        Parameters
+        ==========
+        obj : ObjectCollection
+            Object that will be added to the collection
+        """
+
+        collection = cls._collection()
+
+        # Position of the object within the list of instances (used to keep 'find_by' results ordered)
+        object.__setattr__(obj, '_position', len(collection.instances))
+        collection.instances.append(obj)
+
+        for attribute_name in collection.indexes:
+            ObjectCollection._index(collection, obj, attribute_name)
+
+        # Objects keep a reference to their collection, so indexes stay consistent even if
+        # their attributes are changed while another simulation context is active
+        object.__setattr__(obj, '_object_collection', collection)
+
+
+    @property
+    def simulation_context(self):
+        """ Returns the simulation context that stores the object.
+        """
+
+        return(self._object_collection.context)
+
+
+    @classmethod
+    def _collection(cls):
+        """ Returns the collection of objects of the class within the active simulation context.
+        """
+
+        return(SimulationContext.current().collection(cls._collection_owner))
+
+
+    @staticmethod
+    def _index(collection, obj, attribute_name):
+        """ Adds an object to the index of a given attribute. Each index maps attribute
+        values to dictionaries (used as ordered sets) of objects and their positions.
+        """
+
+        value = getattr(obj, attribute_name)
+        bucket = collection.indexes[attribute_name].setdefault(value, {})
+
+        # Flagging buckets that receive objects out of the instances ordering
+        if len(bucket) > 0 and next(reversed(bucket.values())) > obj._position:
+            collection.unordered_buckets.add((attribute_name, value))
+
+        bucket[obj] = obj._position
+
+
+    @staticmethod
+    def _unindex(collection, obj, attribute_name):
+        """ Removes an object from the index of a given attribute.
+        """
+
+        index = collection.indexes[attribute_name]
+        value = getattr(obj, attribute_name)
+
+        bucket = index[value]
+        del bucket[obj]
+        if len(bucket) == 0:
+            del index[value]
+
+
+    @classmethod
+    def _bucket(cls, attribute_name, value):
+        """ Returns the index bucket of objects whose attribute matches a given value.
+        """
+
+        collection = cls._collection()
+        index = collection.indexes[attribute_name]
+        bucket = index.get(value, {})
+
+        # Sorting buckets that received objects out of order according to the instances ordering
+        if (attribute_name, value) in collection.unordered_buckets:
+            collection.unordered_buckets.discard((attribute_name, value))
+            bucket = dict(sorted(bucket.items(), key=lambda item: item[1]))
+            index[value] = bucket
+
+        return(bucket)
+
+
     @classmethod
     def find_by(cls, attribute_name, desired_attribute_value):
         """ Finds class objects based on any object
@@ -23,7 +156,10 @@ class ObjectCollection:
             The value by which we will look for the objects
         """
 
-        return([classInstance for classInstance in cls.instances
+        if attribute_name in cls._index_names:
+            return(list(cls._bucket(attribute_name, desired_attribute_value)))
+
+        return([classInstance for classInstance in cls.all()
         	if getattr(classInstance, attribute_name) == desired_attribute_value])
 
 
@@ -37,8 +173,7 @@ class ObjectCollection:
             Unique identifier that will be used to find a given object
         """
 
-        return(next((classInstance for classInstance in cls.instances
-            if classInstance.id == id), None))
+        return(next(iter(cls._bucket('id', id)), None))
 
 
     @classmethod
@@ -46,7 +181,7 @@ class ObjectCollection:
         """ Returns the list of created objects of a given class.
         """
 
-        return(cls.instances)
+        return(cls._collection().instances)
 
 
     @classmethod
@@ -54,7 +189,7 @@ class ObjectCollection:
         """ Returns the amount of created objects of a given class.
         """
 
-        return(len(cls.instances))
+        return(len(cls._collection().instances))
 
 
     @classmethod
@@ -62,7 +197,7 @@ class ObjectCollection:
         """ Returns the first class object.
         """
 
-        return(cls.instances[0])
+        return(cls._collection().instances[0])
 
 
     @classmethod
@@ -70,4 +205,4 @@ class ObjectCollection:
         """ Returns the last class object.
         """
 
-        return(cls.instances[-1])
+        return(cls._collection().instances[-1])
@@ -0,0 +1,132 @@
+from bisect import bisect_left, insort
+
+
+class HostSelectionIndex:
+    """ This class keeps candidate host servers sorted according to a key function (e.g., update status and
+    occupation rate), so that maintenance strategies don't need to sort all candidate servers before placing each VM.
+
+    Strategies used to sort the list of candidate servers again after each migration. As Python's sort is stable,
+    servers with the same key keep the order they had in the previous sorting. After a migration, only the key of
+    the destination server changes, so the index repositions that server in the exact position it would take if the
+    whole list was sorted again, which keeps placements identical.
+
+    Servers are grouped into buckets of servers that share the same key, and the distinct keys are kept in a sorted
+    list. Moving a server between buckets takes O(1) operations plus an O(log K) search among the K distinct keys.
+    When a key appears or disappears, the sorted list of keys is shifted (an O(K) memory move, but no comparisons).
+    """
+
+    def __init__(self, servers, key):
+        """ Creates a HostSelectionIndex object.
+
+        Parameters
+        ==========
+        servers : List
+            List of candidate host servers
+
+        key : Function
+            Function that receives a server and returns the value used to sort candidate servers
+        """
+
+        self.key = key
+
+        # Current key of each candidate server
+        self.server_keys = {server: key(server) for server in servers}
+
+        # Servers that share each key. Each bucket has servers placed before the ones that were in the bucket (stored
+        # in reverse order) and servers that follow them. Dictionaries are used as ordered sets with O(1) removals
+        self.buckets = {}
+        for server in sorted(servers, key=self.server_keys.__getitem__):
+            self.bucket(self.server_keys[server])[1][server] = None
+
+        # Distinct keys (sorted)
+        self.keys = sorted(self.buckets)
+
+
+    def __iter__(self):
+        for key in self.keys:
+            front, back = self.buckets[key]
+            yield from reversed(front)
+            yield from back
+
+
+    def __len__(self):
+        return(len(self.server_keys))
+
+
+    def bucket(self, key):
+        """ Gathers the bucket of servers that share a key, creating it if needed.
+
+        Parameters
+        ==========
+        key : object
+            Key shared by the servers
+
+        Returns
+        =======
+        bucket : Tuple
+            Servers placed before and after the servers that were in the bucket
+        """
+
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = ({}, {})
+
+        return(bucket)
+
+
+    def update(self, server):
+        """ Repositions a server after a change on its key (e.g., after the server received a VM).
+
+        Parameters
+        ==========
+        server : Server
+            Candidate server whose key may have changed
+        """
+
+        old_key = self.server_keys[server]
+        new_key = self.key(server)
+
+        if new_key == old_key:
+            return
+
+        # Removing the server from the bucket of its previous key (and the key, if no other server shares it)
+        front, back = self.buckets[old_key]
+        if server in front:
+            del front[server]
+        else:
+            del back[server]
+
+        if len(front) == 0 and len(back) == 0:
+            del self.buckets[old_key]
+            del self.keys[bisect_left(self.keys, old_key)]
+
+        # When the key decreases, the server was behind servers with the new key in the previous sorting
+        # (so it goes after them). Conversely, when the key increases, it goes before servers with the new key
+        if new_key not in self.buckets:
+            insort(self.keys, new_key)
+
+        front, back = self.bucket(new_key)
+        if new_key < old_key:
+            back[server] = None
+        else:
+            front[server] = None
+
+        self.server_keys[server] = new_key
+
+
+    def first_fit(self, vm):
+        """ Finds the first server (according to the index ordering) with resources to host a VM. Servers are
+        checked in order, so the search is linear on the number of servers ahead of the chosen one.
+
+        Parameters
+        ==========
+        vm : VirtualMachine
+            Virtual machine we want to host
+
+        Returns
+        =======
+        server : Server
+            First candidate server with resources to host the VM (or None if no server can host it)
+        """
+
+        return(next((server for server in self if server.has_capacity_to_host(vm)), None))
@@ -5,8 +5,11 @@ import simulator.misc.constants as constants
 # Simulator Components
 from simulator.components.infrastructure.server import Server
 from simulator.components.application.virtual_machine import VirtualMachine
+from simulator.components.resource_management.host_selection import HostSelectionIndex
+from simulator.components.resource_management.maintenance.registry import maintenance_strategy
 
 
+@maintenance_strategy()
 def best_fit_like():
     """
     Best-Fit-like maintenance strategy (presented by Severo et al.)
@@ -53,20 +56,20 @@ def best_fit_like():
             vms = [vm for vm in server.virtual_machines]
             vms = sorted(vms, key=lambda vm: -vm.demand())
 
+            # Sorting servers (bins) to align with Best-Fit's idea,
+            # which is prioritizing servers with less space remaining
+            candidate_servers = HostSelectionIndex(candidate_servers,
+                key=lambda cand: -cand.occupation_rate())
+
             for _ in range(len(server.virtual_machines)):
                 vm = vms.pop(0)
 
-                # Sorting servers (bins) to align with Best-Fit's idea,
-                # which is prioritizing servers with less space remaining
-                candidate_servers = sorted(candidate_servers,
-                    key=lambda cand: -cand.occupation_rate())
-
                 # Migrating VMs using the Best-Fit heuristic
-                for cand_server in candidate_servers:
-                    if cand_server.has_capacity_to_host(vm):
-                        # Migrating the VM and storing the migration duration to allow future analysis
-                        yield SimulationEnvironment.first().env.timeout(vm.migrate(cand_server))
-                        break
+                cand_server = candidate_servers.first_fit(vm)
+                if cand_server is not None:
+                    # Migrating the VM and storing the migration duration to allow future analysis
+                    yield SimulationEnvironment.first().migration_engine.migrate(vm, cand_server)
+                    candidate_servers.update(cand_server)
 
             if len(server.virtual_machines) == 0:
                 servers_being_emptied.append(server)
@@ -5,8 +5,10 @@ import simulator.misc.constants as constants
 # Simulator Components
 from simulator.components.infrastructure.server import Server
 from simulator.components.application.virtual_machine import VirtualMachine
+from simulator.components.resource_management.maintenance.registry import maintenance_strategy
 
 
+@maintenance_strategy()
 def first_fit_like():
     """
     First-Fit-like maintenance strategy (presented by Severo et al.)
@@ -61,7 +63,7 @@ def first_fit_like():
                 for cand_server in candidate_servers:
                     if cand_server.has_capacity_to_host(vm):
                         # Migrating the VM and storing the migration duration to allow future analysis
-                        yield SimulationEnvironment.first().env.timeout(vm.migrate(cand_server))
+                        yield SimulationEnvironment.first().migration_engine.migrate(vm, cand_server)
                         break
 
             if len(server.virtual_machines) == 0:
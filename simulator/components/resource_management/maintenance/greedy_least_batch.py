@@ -5,8 +5,11 @@ import simulator.misc.constants as constants
 # Simulator Components
 from simulator.components.infrastructure.server import Server
 from simulator.components.application.virtual_machine import VirtualMachine
+from simulator.components.resource_management.host_selection import HostSelectionIndex
+from simulator.components.resource_management.maintenance.registry import maintenance_strategy
 
 
+@maintenance_strategy()
 def greedy_least_batch():
     """ Maintenance strategy proposed in [1]. It is designed to
     minimize the number of maintenance steps necessary to update
@@ -48,18 +51,18 @@ def greedy_least_batch():
             vms = [vm for vm in server.virtual_machines]
 
             if Server.can_host_vms(candidate_servers, vms):
+                # Sorting servers by update status (updated ones first) and demand (more occupied ones first)
+                candidate_servers = HostSelectionIndex(candidate_servers, key=lambda cand_server:
+                    (-cand_server.updated, -cand_server.occupation_rate()))
+
                 for _ in range(len(server.virtual_machines)):
                     vm = vms.pop(0)
 
-                    # Sorting servers by update status (updated ones first) and demand (more occupied ones first)
-                    candidate_servers = sorted(candidate_servers, key=lambda cand_server:
-                        (-cand_server.updated, -cand_server.occupation_rate()))
-
                     # Using a First-Fit strategy to select a candidate host for each VM
-                    for cand_server in candidate_servers:
-                        if cand_server.has_capacity_to_host(vm):
-                            yield SimulationEnvironment.first().env.timeout(vm.migrate(cand_server))
-                            break
+                    cand_server = candidate_servers.first_fit(vm)
+                    if cand_server is not None:
+                        yield SimulationEnvironment.first().migration_engine.migrate(vm, cand_server)
+                        candidate_servers.update(cand_server)
 
             if len(server.virtual_machines) == 0:
                 servers_being_emptied.append(server)
@@ -0,0 +1,122 @@
+# Python Libraries
+import importlib
+from importlib.metadata import entry_points
+
+
+# Entry point group through which installed packages provide maintenance strategies
+ENTRY_POINT_GROUP = 'simulator.maintenance_strategies'
+
+# Modules of the maintenance strategies shipped with the simulator (imported only when the strategy is used)
+BUILTIN_STRATEGIES = {
+    'first_fit_like': 'simulator.components.resource_management.maintenance.first_fit_like',
+    'best_fit_like': 'simulator.components.resource_management.maintenance.best_fit_like',
+    'worst_fit_like': 'simulator.components.resource_management.maintenance.worst_fit_like',
+    'greedy_least_batch': 'simulator.components.resource_management.maintenance.greedy_least_batch',
+    'salus': 'simulator.components.resource_management.maintenance.salus',
+}
+
+# Maintenance strategies already loaded (indexed by name)
+registered_strategies = {}
+
+
+def maintenance_strategy(name=None):
+    """ Decorator that registers a maintenance strategy. Strategies are generator functions executed at each
+    maintenance step (see the strategies within this package).
+
+    Parameters
+    ==========
+    name : string, optional
+        Name used to choose the strategy (defaults to the name of the decorated function)
+    """
+
+    def register(strategy):
+        registered_strategies[name or strategy.__name__] = strategy
+        return(strategy)
+
+    return(register)
+
+
+def strategy_entry_points():
+    """ Gathers the maintenance strategies provided by installed packages through entry points.
+
+    Returns
+    =======
+    entry_points : Dictionary
+        Entry points indexed by strategy name
+    """
+
+    # Python 3.8 and 3.9 don't support selecting entry points by group, returning a dictionary indexed by group
+    installed_entry_points = entry_points()
+    if hasattr(installed_entry_points, 'select'):
+        group_entry_points = installed_entry_points.select(group=ENTRY_POINT_GROUP)
+    else:
+        group_entry_points = installed_entry_points.get(ENTRY_POINT_GROUP, [])
+
+    return({entry_point.name: entry_point for entry_point in group_entry_points})
+
+
+def available_strategies():
+    """ Gathers the names of all maintenance strategies (without importing them). Bundled strategies come first.
+
+    Returns
+    =======
+    names : List
+        Names of the available maintenance strategies
+    """
+
+    names = list(BUILTIN_STRATEGIES)
+    names += sorted(name for name in registered_strategies if name not in BUILTIN_STRATEGIES)
+    names += sorted(name for name in strategy_entry_points() if name not in names)
+
+    return(names)
+
+
+def check_strategies(names):
+    """ Makes sure maintenance strategies exist before running simulations with them.
+
+    Parameters
+    ==========
+    names : List
+        Names of maintenance strategies
+    """
+
+    # Installed packages are only scanned for entry points when some strategy is neither bundled nor loaded
+    unknown_names = [name for name in names if name not in BUILTIN_STRATEGIES and name not in registered_strategies]
+    if len(unknown_names) == 0:
+        return
+
+    installed_strategies = strategy_entry_points()
+
+    for name in unknown_names:
+        if name not in installed_strategies:
+            raise Exception(f'Invalid data center maintenance strategy "{name}" (available strategies: '
+                f'{", ".join(available_strategies())})! Exiting.')
+
+
+def get_strategy(name):
+    """ Gathers a maintenance strategy by its name, importing it on first use.
+
+    Parameters
+    ==========
+    name : string
+        Name of the maintenance strategy
+
+    Returns
+    =======
+    strategy : Function
+        Generator function that performs the maintenance strategy
+    """
+
+    if name not in registered_strategies:
+        if name in BUILTIN_STRATEGIES:
+            # Importing the module registers the strategy through the 'maintenance_strategy' decorator
+            importlib.import_module(BUILTIN_STRATEGIES[name])
+        else:
+            installed_strategies = strategy_entry_points()
+            if name not in installed_strategies:
+                check_strategies([name])
+
+            strategy = installed_strategies[name].load()
+            registered_strategies.setdefault(name, strategy)
+
+    return(registered_strategies[name])
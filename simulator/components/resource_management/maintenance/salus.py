@@ -5,8 +5,11 @@ import simulator.misc.constants as constants
 # Simulator Components
 from simulator.components.infrastructure.server import Server
 from simulator.components.application.virtual_machine import VirtualMachine
+from simulator.components.resource_management.host_selection import HostSelectionIndex
+from simulator.components.resource_management.maintenance.registry import maintenance_strategy
 
 
+@maintenance_strategy()
 def salus():
     """ Salus is the Roman goddess of safety. This maintenance
     strategy was proposed by Severo et al. in 2020.
@@ -57,18 +60,18 @@ def salus():
             vms = sorted(vms, key=lambda vm: -vm.demand())
 
             if Server.can_host_vms(candidate_servers, vms):
+                # Sorting servers by update status (updated ones first) and demand (decreasing)
+                candidate_servers = HostSelectionIndex(candidate_servers, key=lambda sv:
+                    (-sv.updated, -sv.occupation_rate()))
+
                 for _ in range(len(server.virtual_machines)):
                     vm = vms.pop(0)
 
-                    # Sorting servers by update status (updated ones first) and demand (decreasing)
-                    candidate_servers = sorted(candidate_servers, key=lambda sv:
-                        (-sv.updated, -sv.occupation_rate()))
-
                     # Using a Best-Fit Decreasing strategy to select a candidate host for each VM
-                    for cand_server in candidate_servers:
-                        if cand_server.has_capacity_to_host(vm):
-                            yield SimulationEnvironment.first().env.timeout(vm.migrate(cand_server))
-                            break
+                    cand_server = candidate_servers.first_fit(vm)
+                    if cand_server is not None:
+                        yield SimulationEnvironment.first().migration_engine.migrate(vm, cand_server)
+                        candidate_servers.update(cand_server)
 
             if len(server.virtual_machines) == 0:
                 servers_being_emptied.append(server)
@@ -0,0 +1,62 @@
+# Python Libraries
+import numpy as np
+
+
+def check_placement(servers, virtual_machines):
+    """ Checks whether each VM of a collection fits into at least one of the candidate servers (other than the
+    server currently hosting it). Each VM is checked against the current demand of servers (tentative allocations
+    are not accumulated), using a copy of the servers' residual capacity matrix, so neither servers nor VMs are
+    changed.
+
+    Parameters
+    ==========
+    servers : List
+        List of candidate host servers for the VMs
+
+    virtual_machines : List
+        List of VMs that we will try to host
+
+    Returns
+    =======
+    feasible : boolean
+        Tells whether all VMs could be hosted by the candidate servers
+    """
+
+    if len(virtual_machines) == 0:
+        return(True)
+
+    if len(servers) == 0:
+        return(False)
+
+    # Gathering the residual capacity of servers and the demand of VMs into matrices (servers backed by a columnar
+    # cluster state already store them as arrays)
+    cluster_state = getattr(servers[0], 'cluster_state', None)
+    if cluster_state is not None:
+        rows = np.array([server.row for server in servers], dtype=np.int64)
+        vms_rows = np.array([vm.row for vm in virtual_machines], dtype=np.int64)
+
+        residual_capacity = cluster_state.residual_capacity()[rows]
+        vms_demand = cluster_state.vm_demand[vms_rows]
+
+        # Position (within the list of candidate servers) of the server currently hosting each VM
+        positions = np.full(len(cluster_state.servers), -1, dtype=np.int64)
+        positions[rows] = np.arange(len(servers))
+        vms_host_rows = cluster_state.vm_server[vms_rows]
+        vms_host = np.where(vms_host_rows >= 0, positions[vms_host_rows], -1)
+    else:
+        capacity = np.array([[sv.cpu_capacity, sv.memory_capacity, sv.disk_capacity] for sv in servers],
+            dtype=np.int64)
+        demand = np.array([[sv.cpu_demand, sv.memory_demand, sv.disk_demand] for sv in servers], dtype=np.int64)
+        residual_capacity = capacity - demand
+        vms_demand = np.array([[vm.cpu_demand, vm.memory_demand, vm.disk_demand] for vm in virtual_machines],
+            dtype=np.int64)
+
+        # Position (within the list of candidate servers) of the server currently hosting each VM
+        positions = {id(server): position for position, server in enumerate(servers)}
+        vms_host = np.array([positions.get(id(vm.server), -1) for vm in virtual_machines], dtype=np.int64)
+
+    # Checking all VMs at once against the current residual capacity of servers
+    fits = np.all(residual_capacity[np.newaxis, :, :] >= vms_demand[:, np.newaxis, :], axis=2)
+    fits &= np.arange(len(servers))[np.newaxis, :] != vms_host[:, np.newaxis]
+
+    return(bool(np.all(np.any(fits, axis=1))))
@@ -0,0 +1,438 @@
+# Python Libraries
+import numpy as np
+
+# General-purpose simulator modules
+from simulator.misc.binary_dataset import BinaryDataset, SERVER_DTYPE, VIRTUAL_MACHINE_DTYPE, BINARY_DATASET_SUFFIX
+
+
+# Default attribute values (and the share of objects that receive each value) used by generated datasets
+SERVER_CAPACITIES = [[4, 4, 32], [8, 8, 64], [16, 16, 128]]
+PATCH_DURATIONS = [[300, 600], [900, 1800], [2700, 5400]]
+VIRTUAL_MACHINE_DEMANDS = [[1, 1, 8], [2, 2, 16], [4, 4, 32]]
+LINK_BANDWIDTHS = [125]
+
+# Vocabularies of the node attributes of fat-tree topologies (following the attributes created by FNSS)
+NODE_ATTRIBUTES = {'layer': ['core', 'aggregation', 'edge', 'leaf'], 'type': ['switch', 'host'], 'pod': None}
+
+# Number of rows formatted at once while writing JSON datasets
+JSON_CHUNK_SIZE = 100000
+
+
+def proportional_choice(rng, n_items, weights=None, n_values=None):
+    """ Assigns one of a list of values to each item, so that the number of items that receive each value is
+    proportional to its weight (leftovers are assigned randomly according to the weights). Assignments are
+    shuffled to avoid unbalanced objects.
+
+    Parameters
+    ==========
+    rng : numpy.random.Generator
+        Random number generator
+
+    n_items : int
+        Number of items
+
+    weights : List, optional
+        Weight of each value (defaults to the same weight for all values)
+
+    n_values : int, optional
+        Number of values (only needed when weights are not informed)
+
+    Returns
+    =======
+    choices : numpy.ndarray
+        Index of the value assigned to each item
+    """
+
+    weights = np.ones(n_values) if weights is None else np.asarray(weights, dtype=float)
+    weights = weights / weights.sum()
+
+    counts = np.floor(weights * n_items).astype(np.int64)
+    choices = np.repeat(np.arange(len(weights)), counts)
+
+    leftover = rng.choice(len(weights), size=n_items - counts.sum(), p=weights)
+
+    return(rng.permutation(np.concatenate([choices, leftover])))
+
+
+def fat_tree(k, hosts):
+    """ Creates a fat-tree topology with the same node numbering used by FNSS ('fat_tree_topology'): core switches
+    come first, followed by the aggregation and edge switches of each pod and, finally, by hosts (connected to
+    edge switches in order). Only the first 'hosts' hosts are created.
+
+    Parameters
+    ==========
+    k : int
+        Number of ports of each switch (the topology has up to k^3/4 hosts)
+
+    hosts : int
+        Number of hosts
+
+    Returns
+    =======
+    node_attribute_values : numpy.ndarray
+        Matrix with the layer, type and pod of each node (see 'NODE_ATTRIBUTES')
+
+    links : numpy.ndarray
+        Matrix with the position of both nodes of each link
+    """
+
+    if k < 2 or k % 2 == 1:
+        raise Exception(f'Invalid fat-tree arity {k} (it must be a positive even number)! Exiting.')
+
+    if hosts > k ** 3 // 4:
+        raise Exception(f'A fat-tree with k={k} supports up to {k ** 3 // 4} servers! Exiting.')
+
+    half = k // 2
+    cores = half ** 2
+    switches = cores + k * k
+
+    # Position of the aggregation and edge switches of each pod
+    pods = np.arange(k)
+    aggregation = cores + pods[:, np.newaxis] * k + np.arange(half)
+    edge = aggregation + half
+
+    # Links between aggregation and edge switches (all pairs within each pod)
+    aggregation_edge = np.stack([np.repeat(aggregation, half, axis=1).ravel(), np.tile(edge, half).ravel()], axis=1)
+
+    # Links between core switches and aggregation switches (each core switch reaches one aggregation switch per pod)
+    core_nodes = np.arange(cores)
+    core_aggregation = np.stack([np.repeat(core_nodes, k),
+        (cores + core_nodes[:, np.newaxis] // half + k * pods).ravel()], axis=1)
+
+    # Links between edge switches and hosts
+    host_nodes = np.arange(hosts)
+    edge_host = np.stack([edge.ravel()[host_nodes // half], switches + host_nodes], axis=1)
+
+    # Node attributes (layer, type, pod)
+    node_attribute_values = np.zeros((switches + hosts, 3), dtype=np.int64)
+    node_attribute_values[:cores] = [0, 0, -1]
+    node_attribute_values[aggregation.ravel(), 0] = 1
+    node_attribute_values[edge.ravel(), 0] = 2
+    node_attribute_values[cores:switches, 2] = np.repeat(pods, k)
+    node_attribute_values[switches:] = np.stack([np.full(hosts, 3), np.ones(hosts, dtype=np.int64),
+        host_nodes // (half * half)], axis=1)
+
+    return(node_attribute_values, np.concatenate([aggregation_edge, core_aggregation, edge_host]))
+
+
+def place_virtual_machines(rng, capacity, demand):
+    """ Places each VM on a random server with resources to host it. VMs are placed in rounds: each unplaced VM
+    picks a random server among the servers that can still host it, and the VMs that picked the same server are
+    accepted in order while the server has resources. The first VM that picks each server always fits, so every
+    round places at least one VM, and the placement finishes (or fails because some VM fits nowhere) after a
+    bounded number of rounds.
+
+    Parameters
+    ==========
+    rng : numpy.random.Generator
+        Random number generator
+
+    capacity : numpy.ndarray
+        Matrix with the capacity (columns) of each server (rows)
+
+    demand : numpy.ndarray
+        Matrix with the demand (columns) of each VM (rows)
+
+    Returns
+    =======
+    placement : numpy.ndarray
+        Position of the server that hosts each VM
+    """
+
+    residual = capacity.copy()
+    placement = np.full(len(demand), -1, dtype=np.int64)
+
+    # VMs with the same demand share the same set of candidate servers
+    demand_types, vm_types = np.unique(demand, axis=0, return_inverse=True)
+    vm_types = vm_types.ravel()
+
+    unplaced = np.arange(len(demand))
+    while len(unplaced) > 0:
+        proposals = np.empty(len(unplaced), dtype=np.int64)
+        unplaced_types = vm_types[unplaced]
+
+        for demand_type in np.unique(unplaced_types):
+            vms = unplaced_types == demand_type
+            candidates = np.flatnonzero((residual >= demand_types[demand_type]).all(axis=1))
+
+            if len(candidates) == 0:
+                raise Exception(f'There are no servers with resources to host VMs with demand '
+                    f'{demand_types[demand_type].tolist()} (try a lower occupation or more servers)! Exiting.')
+
+            proposals[vms] = candidates[rng.integers(len(candidates), size=np.count_nonzero(vms))]
+
+        # Grouping proposals by server (keeping VMs in order within each group)
+        order = np.lexsort((unplaced, proposals))
+        servers = proposals[order]
+        vms = unplaced[order]
+        vm_demand = demand[vms]
+
+        # Computing the demand accumulated by each VM and the VMs before it within its group
+        accumulated_demand = np.cumsum(vm_demand, axis=0)
+        group_starts = np.flatnonzero(np.r_[True, servers[1:] != servers[:-1]])
+        group_sizes = np.diff(np.r_[group_starts, len(servers)])
+        accumulated_demand -= np.repeat(accumulated_demand[group_starts] - vm_demand[group_starts], group_sizes,
+            axis=0)
+
+        # Accepting the VMs that fit (demands are non-negative, so accepted VMs are a prefix of each group)
+        accepted = (accumulated_demand <= residual[servers]).all(axis=1)
+        placement[vms[accepted]] = servers[accepted]
+        np.subtract.at(residual, servers[accepted], vm_demand[accepted])
+
+        unplaced = np.sort(vms[~accepted])
+
+    return(placement)
+
+
+def generate_dataset(servers=128, virtual_machines=None, occupation=0.5, server_capacities=None,
+    server_capacity_weights=None, patch_durations=None, patch_duration_weights=None, updated_servers=0,
+    vm_demands=None, vm_demand_weights=None, link_bandwidths=None, link_bandwidth_weights=None, k=None, seed=1):
+    """ Generates a data center dataset with servers connected through a fat-tree topology.
+
+    Parameters
+    ==========
+    servers : int, optional
+        Number of servers
+
+    virtual_machines : int, optional
+        Number of VMs (when not informed, it's derived from 'occupation')
+
+    occupation : float, optional
+        Share (between 0 and 1) of the data center capacity used by VMs, averaged across CPU, memory and disk (as
+        VMs are placed randomly, smaller servers tend to be fuller, so the average occupation rate of servers is
+        usually higher)
+
+    server_capacities : List, optional
+        Valid (CPU, memory, disk) capacities of servers
+
+    server_capacity_weights : List, optional
+        Share of servers that receive each capacity (defaults to the same share for all capacities)
+
+    patch_durations : List, optional
+        Valid (patch duration, sanity check duration) pairs of servers
+
+    patch_duration_weights : List, optional
+        Share of servers that receive each pair of durations
+
+    updated_servers : float, optional
+        Share of servers that are already updated
+
+    vm_demands : List, optional
+        Valid (CPU, memory, disk) demands of VMs
+
+    vm_demand_weights : List, optional
+        Share of VMs that receive each demand
+
+    link_bandwidths : List, optional
+        Valid bandwidths of network links
+
+    link_bandwidth_weights : List, optional
+        Share of links that receive each bandwidth
+
+    k : int, optional
+        Number of ports of each fat-tree switch (defaults to the smallest fat-tree that fits all servers)
+
+    seed : int, optional
+        Seed value that allows reproducibility
+
+    Returns
+    =======
+    dataset : BinaryDataset
+        Generated dataset
+    """
+
+    rng = np.random.default_rng(seed)
+
+    server_capacities = np.array(server_capacities or SERVER_CAPACITIES, dtype=np.int64)
+    patch_durations = np.array(patch_durations or PATCH_DURATIONS, dtype=np.int64)
+    vm_demands = np.array(vm_demands or VIRTUAL_MACHINE_DEMANDS, dtype=np.int64)
+    link_bandwidths = np.array(link_bandwidths or LINK_BANDWIDTHS, dtype=np.int64)
+
+    # Servers (IDs start from 1, following the IDs given by 'ObjectCollection')
+    capacity = server_capacities[proportional_choice(rng, servers, server_capacity_weights, len(server_capacities))]
+    durations = patch_durations[proportional_choice(rng, servers, patch_duration_weights, len(patch_durations))]
+
+    server_table = np.zeros(servers, dtype=SERVER_DTYPE)
+    server_table['id'] = np.arange(1, servers + 1)
+    server_table['cpu_capacity'], server_table['memory_capacity'], server_table['disk_capacity'] = capacity.T
+    server_table['updated'] = rng.permutation(np.arange(servers) < round(updated_servers * servers))
+    server_table['patch_duration'], server_table['sanity_check_duration'] = durations.T
+
+    # Virtual machines (the number of VMs is derived from the share of the data center capacity they must use)
+    if virtual_machines is None:
+        vm_demand_weights_array = np.ones(len(vm_demands)) if vm_demand_weights is None else np.asarray(
+            vm_demand_weights, dtype=float)
+        vm_demand_shares = vm_demand_weights_array / vm_demand_weights_array.sum()
+        average_demand = (vm_demands * vm_demand_shares[:, np.newaxis]).sum(axis=0)
+
+        virtual_machines = int(round(occupation / (average_demand / capacity.sum(axis=0)).mean()))
+
+    demand = vm_demands[proportional_choice(rng, virtual_machines, vm_demand_weights, len(vm_demands))]
+
+    vm_table = np.zeros(virtual_machines, dtype=VIRTUAL_MACHINE_DTYPE)
+    vm_table['id'] = np.arange(1, virtual_machines + 1)
+    vm_table['cpu_demand'], vm_table['memory_demand'], vm_table['disk_demand'] = demand.T
+    vm_table['server'] = server_table['id'][place_virtual_machines(rng, capacity, demand)]
+
+    # Network topology (the smallest fat-tree that fits all servers is used by default)
+    if k is None:
+        k = 2
+        while k ** 3 // 4 < servers:
+            k += 2
+
+    node_attribute_values, links = fat_tree(k=k, hosts=servers)
+    switches = len(node_attribute_values) - servers
+
+    node_servers = np.arange(len(node_attribute_values)) >= switches
+    node_ids = np.where(node_servers, np.arange(len(node_attribute_values)) - switches + 1,
+        np.arange(len(node_attribute_values)))
+
+    bandwidth = link_bandwidths[proportional_choice(rng, len(links), link_bandwidth_weights, len(link_bandwidths))]
+
+    # Building the CSR adjacency list (links are stored in both directions)
+    sources = np.concatenate([links[:, 0], links[:, 1]])
+    targets = np.concatenate([links[:, 1], links[:, 0]])
+    order = np.argsort(sources, kind='stable')
+
+    indptr = np.zeros(len(node_attribute_values) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum(np.bincount(sources, minlength=len(node_attribute_values)))
+
+    return(BinaryDataset(servers=server_table, virtual_machines=vm_table, node_servers=node_servers,
+        node_ids=node_ids, node_attributes=NODE_ATTRIBUTES, node_attribute_values=node_attribute_values,
+        indptr=indptr, indices=targets[order], bandwidth=np.concatenate([bandwidth, bandwidth])[order]))
+
+
+def host_positions(dataset):
+    """ Gathers the position (within the server table) of the server that hosts each VM of a dataset.
+    """
+
+    sorter = np.argsort(dataset.servers['id'])
+
+    return(sorter[np.searchsorted(dataset.servers['id'], dataset.virtual_machines['server'], sorter=sorter)])
+
+
+def write_json(dataset, path):
+    """ Writes a dataset into a JSON file (using the format of the datasets within the 'data' directory). The file
+    is written in chunks of rows formatted at once, so the whole JSON document is never kept in memory.
+
+    Parameters
+    ==========
+    dataset : BinaryDataset
+        Dataset that will be written
+
+    path : string
+        Path of the JSON file
+    """
+
+    servers = dataset.servers
+    virtual_machines = dataset.virtual_machines
+
+    # Gathering the VMs hosted by each server (in the order of their IDs)
+    server_positions = host_positions(dataset)
+    hosted_vms = virtual_machines['id'][np.argsort(server_positions, kind='stable')]
+    hosted_vm_ends = np.cumsum(np.bincount(server_positions, minlength=len(servers)))
+
+    # Formatting the description of each topology node
+    node_descriptions = []
+    for node, (is_server, node_id) in enumerate(zip(dataset.node_servers.tolist(), dataset.node_ids.tolist())):
+        node_data = ', '.join(f'"{name}": "{value}"' if isinstance(value, str) else f'"{name}": {value}'
+            for name, value in dataset.node_data(node).items())
+        node_descriptions.append(f'{{"type": "{"Server" if is_server else "int"}", "id": {node_id}, '
+            f'"data": {{{node_data}}}}}')
+
+    with open(path, 'w') as output_file:
+        output_file.write('{"servers": [')
+
+        hosted_vms_list = hosted_vms.tolist()
+        hosted_vm_ends_list = hosted_vm_ends.tolist()
+        for start in range(0, len(servers), JSON_CHUNK_SIZE):
+            chunk = servers[start:start + JSON_CHUNK_SIZE]
+            rows = []
+
+            for position, (id, cpu, memory, disk, updated, patch_duration, sanity_check_duration) in enumerate(zip(
+                chunk['id'].tolist(), chunk['cpu_capacity'].tolist(), chunk['memory_capacity'].tolist(),
+                chunk['disk_capacity'].tolist(), chunk['updated'].tolist(), chunk['patch_duration'].tolist(),
+                chunk['sanity_check_duration'].tolist()), start=start):
+
+                first_vm = hosted_vm_ends_list[position - 1] if position > 0 else 0
+                vm_ids = ', '.join(map(str, hosted_vms_list[first_vm:hosted_vm_ends_list[position]]))
+
+                rows.append(f'{{"id": {id}, "cpu_capacity": {cpu}, "memory_capacity": {memory}, '
+                    f'"disk_capacity": {disk}, "virtual_machines": [{vm_ids}], "updated": {str(updated).lower()}, '
+                    f'"patch_duration": {patch_duration}, "sanity_check_duration": {sanity_check_duration}}}')
+
+            output_file.write((', ' if start > 0 else '') + ', '.join(rows))
+
+        output_file.write('], "virtual_machines": [')
+
+        for start in range(0, len(virtual_machines), JSON_CHUNK_SIZE):
+            chunk = virtual_machines[start:start + JSON_CHUNK_SIZE]
+
+            rows = [f'{{"id": {id}, "cpu_demand": {cpu}, "memory_demand": {memory}, "disk_demand": {disk}, '
+                f'"server": {server}}}' for id, cpu, memory, disk, server in zip(chunk['id'].tolist(),
+                chunk['cpu_demand'].tolist(), chunk['memory_demand'].tolist(), chunk['disk_demand'].tolist(),
+                chunk['server'].tolist())]
+
+            output_file.write((', ' if start > 0 else '') + ', '.join(rows))
+
+        output_file.write('], "network_topology": [')
+
+        rows = []
+        for node_1, node_2, bandwidth in dataset.links():
+            rows.append(f'{{"nodes": [{node_descriptions[node_1]}, {node_descriptions[node_2]}], '
+                f'"bandwidth": {bandwidth}}}')
+
+            if len(rows) == JSON_CHUNK_SIZE:
+                output_file.write(', '.join(rows) + ', ')
+                rows = []
+
+        output_file.write(', '.join(rows) + ']}')
+
+
+def save_dataset(dataset, output_file):
+    """ Stores a generated dataset either as a binary dataset (when the name of the output file ends with the
+    binary dataset suffix, '.npd') or as a JSON file.
+
+    Parameters
+    ==========
+    dataset : BinaryDataset
+        Generated dataset
+
+    output_file : string
+        Path of the output file
+    """
+
+    if output_file.endswith(BINARY_DATASET_SUFFIX):
+        dataset.save(output_file)
+    else:
+        write_json(dataset, output_file)
+
+
+def describe_dataset(dataset):
+    """ Describes a generated dataset.
+
+    Returns
+    =======
+    description : string
+        Number of servers, VMs, topology nodes and links, the data center occupation (average occupation rate
+        of servers) and the share of the data center capacity used by VMs
+    """
+
+    servers = dataset.servers
+    capacity = np.stack([servers['cpu_capacity'], servers['memory_capacity'], servers['disk_capacity']], axis=1)
+
+    # Computing the occupation rate of each server (as 'Server.occupation_rate' does)
+    server_positions = host_positions(dataset)
+    demand = np.zeros_like(capacity)
+    for column, attribute in enumerate(['cpu_demand', 'memory_demand', 'disk_demand']):
+        demand[:, column] = np.bincount(server_positions, weights=dataset.virtual_machines[attribute],
+            minlength=len(servers))
+
+    occupation_rate = (demand * 100 / capacity).mean()
+
+    # Computing the share of the data center capacity used by VMs (as informed through 'occupation')
+    capacity_usage = (demand.sum(axis=0) * 100 / capacity.sum(axis=0)).mean()
+
+    return(f'{len(servers)} servers, {len(dataset.virtual_machines)} VMs, {len(dataset.node_ids)} topology nodes, '
+        f'{len(dataset.indices) // 2} links. Data center occupation: {occupation_rate:.2f}% (capacity usage: '
+        f'{capacity_usage:.2f}%)')
@@ -0,0 +1,399 @@
+# Python Libraries
+import os
+import json
+import numpy as np
+
+
+# Suffix of binary datasets (each binary dataset is a directory with one '.npy' file per table)
+BINARY_DATASET_SUFFIX = '.npd'
+
+# Layout of the tables that store servers and VMs
+SERVER_DTYPE = np.dtype([('id', np.int64), ('cpu_capacity', np.int64), ('memory_capacity', np.int64),
+    ('disk_capacity', np.int64), ('updated', np.bool_), ('patch_duration', np.int64),
+    ('sanity_check_duration', np.int64)])
+
+VIRTUAL_MACHINE_DTYPE = np.dtype([('id', np.int64), ('cpu_demand', np.int64), ('memory_demand', np.int64),
+    ('disk_demand', np.int64), ('server', np.int64)])
+
+# Value used by node attribute columns to represent attributes that a node doesn't have
+MISSING_ATTRIBUTE = -1
+
+
+def table_from_records(records, dtype, table_name):
+    """ Creates a structured array from the records of a JSON dataset. Capacities, demands and durations are
+    stored as integers, so records with fractional values in integer columns are rejected instead of having
+    their values truncated.
+
+    Parameters
+    ==========
+    records : List
+        List of dictionaries with the attributes of each object
+
+    dtype : numpy.dtype
+        Layout of the table (see 'SERVER_DTYPE' and 'VIRTUAL_MACHINE_DTYPE')
+
+    table_name : string
+        Name of the table (used in error messages)
+
+    Returns
+    =======
+    table : numpy.ndarray
+        Structured array with one row per record
+    """
+
+    integer_fields = [field for field in dtype.names if np.issubdtype(dtype[field], np.integer)]
+
+    rows = []
+    for record in records:
+        for field in integer_fields:
+            value = record[field]
+            if isinstance(value, float) and not value.is_integer():
+                raise Exception(f'Object {record.get("id")} of "{table_name}" has a non-integer "{field}" '
+                    f'({value}), but only integer values are supported! Exiting.')
+
+        rows.append(tuple(record[field] for field in dtype.names))
+
+    return(np.array(rows, dtype=dtype))
+
+
+def json_adjacency(links):
+    """ Gathers the nodes and the adjacency list of the network topology of a JSON dataset. Nodes follow the order
+    in which they appear in the list of links, and duplicated links keep the bandwidth of their first occurrence
+    (as the network topology graph built from JSON datasets does).
+
+    Parameters
+    ==========
+    links : List
+        Links of the JSON dataset ('network_topology')
+
+    Returns
+    =======
+    nodes : List
+        Tuples with the key (whether the node is a server and its ID) and the attributes of each node
+
+    neighbors : List
+        Dictionaries that map the neighbors of each node (by position) to the bandwidth of the link between them
+    """
+
+    positions = {}
+    nodes = []
+    neighbors = []
+    for link in links:
+        link_positions = []
+
+        for node in link['nodes']:
+            key = (node['type'] == 'Server', node['id'])
+
+            if key not in positions:
+                positions[key] = len(nodes)
+                nodes.append((key, node['data']))
+                neighbors.append({})
+
+            link_positions.append(positions[key])
+
+        # Links are stored in both directions (duplicated links are ignored)
+        node_1, node_2 = link_positions
+        neighbors[node_1].setdefault(node_2, link['bandwidth'])
+        neighbors[node_2].setdefault(node_1, link['bandwidth'])
+
+    return(nodes, neighbors)
+
+
+def csr_adjacency(neighbors, bandwidth_dtype=None):
+    """ Builds the CSR (Compressed Sparse Row) representation of an adjacency list.
+
+    Parameters
+    ==========
+    neighbors : List
+        Dictionaries that map the neighbors of each node (by position) to the bandwidth of the link between them
+
+    bandwidth_dtype : numpy.dtype, optional
+        Type of the bandwidth array (inferred from the bandwidths when not informed)
+
+    Returns
+    =======
+    indptr : numpy.ndarray
+        Position of the first neighbor of each node within 'indices'
+
+    indices : numpy.ndarray
+        Neighbors of each node
+
+    bandwidth : numpy.ndarray
+        Bandwidth of the link to each neighbor (following 'indices')
+    """
+
+    indptr = np.zeros(len(neighbors) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(node_neighbors) for node_neighbors in neighbors])
+    indices = np.array([neighbor for node_neighbors in neighbors for neighbor in node_neighbors], dtype=np.int64)
+    bandwidth = np.array([link_bandwidth for node_neighbors in neighbors
+        for link_bandwidth in node_neighbors.values()], dtype=bandwidth_dtype)
+
+    return(indptr, indices, bandwidth)
+
+
+class BinaryDataset:
+    """ This class represents a dataset in a columnar binary format. Servers and VMs are stored as structured
+    NumPy arrays, and the network topology is stored as a node table (with one column per node attribute) plus
+    an adjacency list in the CSR (Compressed Sparse Row) format, so that loading a dataset doesn't involve any
+    parsing: each table is a '.npy' file that is memory-mapped when the dataset is loaded.
+
+    Node attributes with string values (e.g., 'layer' and 'type') are stored as indexes of a vocabulary kept
+    in the dataset metadata, whereas non-negative integer attributes (e.g., 'pod') are stored as they are.
+    """
+
+    # Tables stored by binary datasets
+    TABLES = ['servers', 'virtual_machines', 'node_servers', 'node_ids', 'node_attribute_values', 'indptr',
+        'indices', 'bandwidth']
+
+    def __init__(self, servers, virtual_machines, node_servers, node_ids, node_attributes, node_attribute_values,
+        indptr, indices, bandwidth):
+        """ Creates a BinaryDataset object.
+
+        Parameters
+        ==========
+        servers : numpy.ndarray
+            Structured array with server attributes (see 'SERVER_DTYPE')
+
+        virtual_machines : numpy.ndarray
+            Structured array with VM attributes (see 'VIRTUAL_MACHINE_DTYPE')
+
+        node_servers : numpy.ndarray
+            Tells whether each topology node is a server (otherwise it's a switch)
+
+        node_ids : numpy.ndarray
+            ID of each topology node (server IDs for servers)
+
+        node_attributes : Dictionary
+            Maps the name of each node attribute to its vocabulary (or None for integer attributes)
+
+        node_attribute_values : numpy.ndarray
+            Matrix with the value of each attribute (columns) of each topology node (rows)
+
+        indptr : numpy.ndarray
+            Position of the first neighbor of each node within 'indices' (CSR adjacency list)
+
+        indices : numpy.ndarray
+            Neighbors of each node (CSR adjacency list)
+
+        bandwidth : numpy.ndarray
+            Bandwidth of the link to each neighbor (following 'indices')
+        """
+
+        self.servers = servers
+        self.virtual_machines = virtual_machines
+
+        self.node_servers = node_servers
+        self.node_ids = node_ids
+        self.node_attributes = node_attributes
+        self.node_attribute_values = node_attribute_values
+
+        self.indptr = indptr
+        self.indices = indices
+        self.bandwidth = bandwidth
+
+
+    @classmethod
+    def from_json(cls, data):
+        """ Creates a binary dataset from the contents of a JSON dataset (see 'convert_dataset'). Values that the
+        binary encoding can't represent are rejected instead of being changed, whereas simulations of JSON datasets
+        use their values as they are.
+
+        Parameters
+        ==========
+        data : Dictionary
+            Contents of the JSON dataset
+
+        Returns
+        =======
+        dataset : BinaryDataset
+            Binary representation of the dataset
+        """
+
+        servers = table_from_records(data['servers'], dtype=SERVER_DTYPE, table_name='servers')
+        virtual_machines = table_from_records(data['virtual_machines'], dtype=VIRTUAL_MACHINE_DTYPE,
+            table_name='virtual_machines')
+
+        # Bandwidths are stored as integers as well, so fractional values are rejected instead of truncated
+        for link in data['network_topology']:
+            if isinstance(link['bandwidth'], float) and not link['bandwidth'].is_integer():
+                raise Exception(f'The link between nodes {" and ".join(str(node["id"]) for node in link["nodes"])} has '
+                    f'a non-integer bandwidth ({link["bandwidth"]}), but only integer values are supported! Exiting.')
+
+        nodes, neighbors = json_adjacency(data['network_topology'])
+
+        # Building vocabularies for attributes with string values
+        node_attributes = {}
+        for _, node_data in nodes:
+            for attribute_name, value in node_data.items():
+                vocabulary = node_attributes.setdefault(attribute_name, [] if isinstance(value, str) else None)
+
+                # Numeric attributes must be non-negative integers (booleans, nulls, lists and dictionaries have no
+                # binary representation), and each attribute must have either string or numeric values
+                if vocabulary is None:
+                    supported = type(value) in [int, float] and value >= 0 and float(value).is_integer()
+                else:
+                    supported = isinstance(value, str)
+
+                if not supported:
+                    raise Exception(f'Unsupported value for node attribute "{attribute_name}" ({value!r}) in binary '
+                        'datasets! Exiting.')
+
+                if vocabulary is not None and value not in vocabulary:
+                    vocabulary.append(value)
+
+        node_attribute_values = np.full((len(nodes), len(node_attributes)), MISSING_ATTRIBUTE, dtype=np.int64)
+        for position, (_, node_data) in enumerate(nodes):
+            for column, (attribute_name, vocabulary) in enumerate(node_attributes.items()):
+                if attribute_name in node_data:
+                    value = node_data[attribute_name]
+                    if vocabulary is not None:
+                        value = vocabulary.index(value)
+
+                    node_attribute_values[position, column] = value
+
+        indptr, indices, bandwidth = csr_adjacency(neighbors, bandwidth_dtype=np.int64)
+
+        return(cls(servers=servers, virtual_machines=virtual_machines,
+            node_servers=np.array([key[0] for key, _ in nodes], dtype=np.bool_),
+            node_ids=np.array([key[1] for key, _ in nodes], dtype=np.int64), node_attributes=node_attributes,
+            node_attribute_values=node_attribute_values, indptr=indptr, indices=indices, bandwidth=bandwidth))
+
+
+    @classmethod
+    def topology_from_json(cls, data):
+        """ Creates a dataset with only the network topology of a JSON dataset (used to build topology caches of
+        JSON datasets, which are loaded without the binary encoding). Node attributes are left out and bandwidths
+        are kept as they are, so any JSON dataset can be represented.
+
+        Parameters
+        ==========
+        data : Dictionary
+            Contents of the JSON dataset
+
+        Returns
+        =======
+        dataset : BinaryDataset
+            Dataset whose server table only has the ID of each server and whose VM table is empty
+        """
+
+        nodes, neighbors = json_adjacency(data['network_topology'])
+        indptr, indices, bandwidth = csr_adjacency(neighbors)
+
+        return(cls(servers=np.array([(server['id'],) for server in data['servers']], dtype=[('id', np.int64)]),
+            virtual_machines=np.zeros(0, dtype=VIRTUAL_MACHINE_DTYPE),
+            node_servers=np.array([key[0] for key, _ in nodes], dtype=np.bool_),
+            node_ids=np.array([key[1] for key, _ in nodes], dtype=np.int64), node_attributes={},
+            node_attribute_values=np.zeros((len(nodes), 0), dtype=np.int64), indptr=indptr, indices=indices,
+            bandwidth=bandwidth))
+
+
+    @classmethod
+    def load(cls, path):
+        """ Loads a binary dataset, memory-mapping its tables.
+
+        Parameters
+        ==========
+        path : string
+            Path of the binary dataset directory
+
+        Returns
+        =======
+        dataset : BinaryDataset
+            Binary dataset whose tables are backed by the files stored in the dataset directory
+        """
+
+        with open(os.path.join(path, 'metadata.json'), 'r') as metadata_file:
+            metadata = json.load(metadata_file)
+
+        tables = {table: np.load(os.path.join(path, f'{table}.npy'), mmap_mode='r') for table in cls.TABLES}
+
+        return(cls(node_attributes=metadata['node_attributes'], **tables))
+
+
+    def save(self, path):
+        """ Stores the binary dataset into a directory (one '.npy' file per table).
+
+        Parameters
+        ==========
+        path : string
+            Path of the binary dataset directory
+        """
+
+        os.makedirs(path, exist_ok=True)
+
+        for table in BinaryDataset.TABLES:
+            np.save(os.path.join(path, f'{table}.npy'), np.ascontiguousarray(getattr(self, table)))
+
+        with open(os.path.join(path, 'metadata.json'), 'w') as metadata_file:
+            json.dump({'node_attributes': self.node_attributes}, metadata_file)
+
+
+    def node_data(self, node):
+        """ Returns the attributes of a topology node.
+
+        Parameters
+        ==========
+        node : int
+            Position of the node within the node table
+
+        Returns
+        =======
+        node_data : Dictionary
+            Node attributes (using the same values found in JSON datasets)
+        """
+
+        node_data = {}
+        for (attribute_name, vocabulary), value in zip(self.node_attributes.items(),
+            self.node_attribute_values[node].tolist()):
+
+            if value != MISSING_ATTRIBUTE:
+                node_data[attribute_name] = vocabulary[value] if vocabulary is not None else value
+
+        return(node_data)
+
+
+    def links(self):
+        """ Iterates over the links of the topology (each link is informed once).
+
+        Returns
+        =======
+        links : Generator
+            Tuples with the position of both nodes of each link and the link bandwidth
+        """
+
+        indptr = self.indptr.tolist()
+        indices = self.indices.tolist()
+        bandwidth = self.bandwidth.tolist()
+
+        for node in range(len(indptr) - 1):
+            for position in range(indptr[node], indptr[node + 1]):
+                if node < indices[position]:
+                    yield(node, indices[position], bandwidth[position])
+
+
+def convert_dataset(input_file, output_file=None):
+    """ Converts a JSON dataset into the binary format.
+
+    Parameters
+    ==========
+    input_file : string
+        Path of the JSON dataset
+
+    output_file : string, optional
+        Path of the binary dataset directory (defaults to the input path with the binary dataset suffix)
+
+    Returns
+    =======
+    output_file : string
+        Path of the binary dataset directory
+    """
+
+    if output_file is None:
+        output_file = f'{os.path.splitext(input_file)[0]}{BINARY_DATASET_SUFFIX}'
+
+    with open(input_file, 'r') as read_file:
+        data = json.load(read_file)
+
+    BinaryDataset.from_json(data).save(output_file)
+
+    return(output_file)
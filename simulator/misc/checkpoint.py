@@ -0,0 +1,223 @@
+# Python Libraries
+import json
+import numpy as np
+
+
+# Suffix of checkpoint files
+CHECKPOINT_SUFFIX = '.checkpoint.npz'
+
+# Value that represents a missing update step (i.e., servers that were not updated yet)
+MISSING_UPDATE_STEP = -1
+
+
+class Checkpoint:
+    """ This class stores the state of a simulation at the end of a maintenance step, so that the simulation can
+    be resumed from that point later on. The state includes the demand, update status and hosted VMs of each
+    server (following the order in which VMs are stored within servers, which is relevant to strategies that
+    rely on stable sorts), the migration log (the records it retains and the number and duration of migrations
+    of each maintenance step and VM), the metrics collected so far, the simulation clock and the
+    maintenance step. Static data (e.g., capacities and the network topology) is not stored, as it's
+    loaded from the dataset before the checkpoint is restored.
+
+    Checkpoints are stored as '.npz' files: servers, VMs and migrations are stored as NumPy arrays, while
+    scalar values and the (small) list of metrics of each step are stored as a JSON document, which keeps
+    their original types (e.g., integer and floating-point durations).
+    """
+
+    # Arrays stored within checkpoint files
+    ARRAYS = ['server_ids', 'cpu_demand', 'memory_demand', 'disk_demand', 'updated', 'update_step',
+        'hosted_vm_counts', 'hosted_vms', 'vm_ids', 'migration_steps', 'migration_vms', 'migration_origins',
+        'migration_destinations', 'migration_starts', 'migration_durations']
+
+    # Arrays that checkpoints stored before migration aggregates were kept may lack (the aggregates of such
+    # checkpoints are rebuilt from the migration records they retain)
+    OPTIONAL_ARRAYS = ['vm_migration_counts', 'vm_migration_durations']
+
+    def __init__(self, metadata, arrays):
+        """ Creates a Checkpoint object.
+
+        Parameters
+        ==========
+        metadata : Dictionary
+            Scalar values of the simulation ('dataset', 'maintenance_strategy', 'now', 'maintenance_step'),
+            the aggregated migrations of each maintenance step ('migration_summaries')
+            and the metrics of each maintenance step ('metrics')
+
+        arrays : Dictionary
+            Arrays with the state of servers, VMs and migrations (see 'ARRAYS' and 'OPTIONAL_ARRAYS')
+        """
+
+        self.metadata = metadata
+        self.arrays = arrays
+
+
+    @classmethod
+    def from_environment(cls, simulation_environment, servers, virtual_machines):
+        """ Captures the state of a simulation.
+
+        Parameters
+        ==========
+        simulation_environment : SimulationEnvironment
+            Simulation environment whose state will be captured
+
+        servers : List
+            List of servers
+
+        virtual_machines : List
+            List of VMs
+
+        Returns
+        =======
+        checkpoint : Checkpoint
+            State of the simulation
+        """
+
+        migration_log = simulation_environment.migration_log
+        migrations = list(migration_log)
+
+        arrays = {
+            'server_ids': np.array([server.id for server in servers], dtype=np.int64),
+            'cpu_demand': np.array([server.cpu_demand for server in servers]),
+            'memory_demand': np.array([server.memory_demand for server in servers]),
+            'disk_demand': np.array([server.disk_demand for server in servers]),
+            'updated': np.array([server.updated for server in servers], dtype=bool),
+            'update_step': np.array([MISSING_UPDATE_STEP if server.update_step is None else server.update_step
+                for server in servers], dtype=np.int64),
+            'hosted_vm_counts': np.array([len(server.virtual_machines) for server in servers], dtype=np.int64),
+            'hosted_vms': np.array([vm.id for server in servers for vm in server.virtual_machines], dtype=np.int64),
+            'vm_ids': np.array([vm.id for vm in virtual_machines], dtype=np.int64),
+            'migration_steps': np.array([migration.maintenance_step for migration in migrations], dtype=np.int64),
+            'migration_vms': np.array([migration.vm for migration in migrations], dtype=np.int64),
+            'migration_origins': np.array([migration.origin for migration in migrations], dtype=np.int64),
+            'migration_destinations': np.array([migration.destination for migration in migrations], dtype=np.int64),
+            'migration_starts': np.array([migration.start for migration in migrations]),
+            'migration_durations': np.array([migration.duration for migration in migrations]),
+            'vm_migration_counts': np.array([migration_log.vm_counts.get(vm.id, 0) for vm in virtual_machines],
+                dtype=np.int64),
+            'vm_migration_durations': np.array([migration_log.vm_durations.get(vm.id, 0) for vm in virtual_machines]),
+        }
+
+        metadata = {'dataset': simulation_environment.dataset,
+            'maintenance_strategy': simulation_environment.maintenance_strategy,
+            'now': simulation_environment.env.now, 'maintenance_step': simulation_environment.maintenance_step,
+            'metrics': list(simulation_environment.metrics.rows()),
+            'migration_summaries': [[step, *summary] for step, summary in migration_log.step_summaries.items()]}
+
+        return(cls(metadata=metadata, arrays=arrays))
+
+
+    @classmethod
+    def load(cls, path):
+        """ Loads a checkpoint stored by 'save'.
+
+        Parameters
+        ==========
+        path : string
+            Path of the checkpoint file
+
+        Returns
+        =======
+        checkpoint : Checkpoint
+            State of the simulation
+        """
+
+        with np.load(path) as data:
+            missing_arrays = [name for name in Checkpoint.ARRAYS if name not in data.files]
+            if len(missing_arrays) > 0:
+                raise Exception(f'Invalid checkpoint "{path}" (missing arrays: {", ".join(missing_arrays)})! Exiting.')
+
+            arrays = {name: data[name] for name in Checkpoint.ARRAYS + Checkpoint.OPTIONAL_ARRAYS
+                if name in data.files}
+            metadata = json.loads(data['metadata'].tobytes().decode('utf-8'))
+
+        return(cls(metadata=metadata, arrays=arrays))
+
+
+    def save(self, path):
+        """ Stores the checkpoint into a compressed '.npz' file.
+
+        Parameters
+        ==========
+        path : string
+            Path of the checkpoint file
+        """
+
+        metadata = np.frombuffer(json.dumps(self.metadata).encode('utf-8'), dtype=np.uint8)
+
+        with open(path, 'wb') as checkpoint_file:
+            np.savez_compressed(checkpoint_file, metadata=metadata, **self.arrays)
+
+
+    def restore(self, simulation_environment, servers, virtual_machines):
+        """ Restores the state of a simulation whose servers and VMs were loaded from the checkpoint's dataset.
+
+        Parameters
+        ==========
+        simulation_environment : SimulationEnvironment
+            Simulation environment whose state will be restored (before the simulation starts)
+
+        servers : List
+            List of servers
+
+        virtual_machines : List
+            List of VMs
+        """
+
+        arrays = self.arrays
+
+        # Making sure the checkpoint was taken from a simulation with the same servers and VMs
+        if (simulation_environment.dataset != self.metadata['dataset'] or
+            arrays['server_ids'].tolist() != [server.id for server in servers] or
+            arrays['vm_ids'].tolist() != [vm.id for vm in virtual_machines]):
+            raise Exception(f'The checkpoint was taken from a simulation of dataset "{self.metadata["dataset"]}"'
+                f' and doesn\'t match the loaded dataset "{simulation_environment.dataset}"! Exiting.')
+
+        virtual_machines_by_id = {vm.id: vm for vm in virtual_machines}
+
+        # Servers (VMs are placed following the order in which they were stored within each server)
+        hosted_vms = iter(arrays['hosted_vms'].tolist())
+
+        for server, cpu_demand, memory_demand, disk_demand, updated, update_step, hosted_vm_count in zip(servers,
+            arrays['cpu_demand'].tolist(), arrays['memory_demand'].tolist(), arrays['disk_demand'].tolist(),
+            arrays['updated'].tolist(), arrays['update_step'].tolist(), arrays['hosted_vm_counts'].tolist()):
+
+            server.cpu_demand = cpu_demand
+            server.memory_demand = memory_demand
+            server.disk_demand = disk_demand
+            server.updated = updated
+            server.update_step = None if update_step == MISSING_UPDATE_STEP else update_step
+
+            server.virtual_machines = [virtual_machines_by_id[next(hosted_vms)] for _ in range(hosted_vm_count)]
+            for vm in server.virtual_machines:
+                vm.server = server
+
+        # Migrations (VMs gather their migration history from the migration log)
+        for maintenance_step, vm_id, origin, destination, start, duration in zip(
+            arrays['migration_steps'].tolist(), arrays['migration_vms'].tolist(),
+            arrays['migration_origins'].tolist(), arrays['migration_destinations'].tolist(),
+            arrays['migration_starts'].tolist(), arrays['migration_durations'].tolist()):
+
+            simulation_environment.migration_log.append(maintenance_step=maintenance_step, vm=vm_id, origin=origin,
+                destination=destination, start=start, duration=duration)
+
+        # Migration aggregates (which also count migrations whose records were not retained by the checkpoint)
+        if 'vm_migration_counts' in arrays and 'migration_summaries' in self.metadata:
+            vm_aggregates = [(vm_id, count, duration) for vm_id, count, duration in zip(arrays['vm_ids'].tolist(),
+                arrays['vm_migration_counts'].tolist(), arrays['vm_migration_durations'].tolist()) if count > 0]
+
+            simulation_environment.migration_log.restore_summaries(
+                step_summaries={step: summary for step, *summary in self.metadata['migration_summaries']},
+                vm_counts={vm_id: count for vm_id, count, _ in vm_aggregates},
+                vm_durations={vm_id: duration for vm_id, _, duration in vm_aggregates})
+
+        # Metrics collected so far
+        for row in self.metadata['metrics']:
+            simulation_environment.metrics.append(row)
+
+        # Maintenance strategy that produced the restored metrics (results written before the simulation starts,
+        # such as the rows restored above, are labeled with it)
+        simulation_environment.maintenance_strategy = self.metadata['maintenance_strategy']
+
+        # Simulation clock
+        simulation_environment.initial_time = self.metadata['now']
+        simulation_environment.maintenance_step = self.metadata['maintenance_step']
@@ -0,0 +1,287 @@
+# Python Libraries
+import numpy as np
+
+# Simulator components
+from simulator.components.infrastructure.server import Server
+from simulator.components.application.virtual_machine import VirtualMachine
+
+
+class ClusterState:
+    """ This class stores the state of servers and VMs in a columnar (struct-of-arrays) layout. Servers and
+    VMs created through 'ArrayServer' and 'ArrayVirtualMachine' are thin views over these arrays, so existing
+    maintenance strategies keep working while fit checks, occupation rates and metrics can be computed with
+    vectorized NumPy operations across all servers at once.
+
+    Views are regular server and VM objects (they inherit the slots of 'Server' and 'VirtualMachine' and add
+    their row within the arrays), so the columnar layout speeds up fleet-wide computations but doesn't save
+    memory: each entity uses more memory than with the 'object' backend.
+
+    Arrays store capacity and demand attributes as integers (following the format of datasets), with one
+    column for each resource ('cpu', 'memory', 'disk').
+    """
+
+    def __init__(self, servers=0, virtual_machines=0):
+        """ Creates a ClusterState object.
+
+        Parameters
+        ==========
+        servers : int
+            Expected number of servers (arrays grow automatically if more servers are added)
+
+        virtual_machines : int
+            Expected number of VMs (arrays grow automatically if more VMs are added)
+        """
+
+        # Server columns
+        self.server_capacity = np.zeros((max(servers, 1), 3), dtype=np.int64)
+        self.server_demand = np.zeros((max(servers, 1), 3), dtype=np.int64)
+        self.server_updated = np.zeros(max(servers, 1), dtype=bool)
+
+        # VM columns (the assignment array stores the row of the host server, or -1 for VMs not hosted yet)
+        self.vm_demand = np.zeros((max(virtual_machines, 1), 3), dtype=np.int64)
+        self.vm_server = np.full(max(virtual_machines, 1), -1, dtype=np.int64)
+
+        # Objects that represent each row of the arrays
+        self.servers = []
+        self.virtual_machines = []
+
+
+    def add_server(self, server):
+        """ Reserves a row of the server arrays to a given server view.
+
+        Parameters
+        ==========
+        server : ArrayServer
+            Server view that will be backed by the new row
+
+        Returns
+        =======
+        row : int
+            Row assigned to the server
+        """
+
+        row = len(self.servers)
+
+        if row == len(self.server_updated):
+            self.server_capacity = np.concatenate([self.server_capacity, np.zeros_like(self.server_capacity)])
+            self.server_demand = np.concatenate([self.server_demand, np.zeros_like(self.server_demand)])
+            self.server_updated = np.concatenate([self.server_updated, np.zeros_like(self.server_updated)])
+
+        self.servers.append(server)
+
+        return(row)
+
+
+    def add_virtual_machine(self, vm):
+        """ Reserves a row of the VM arrays to a given VM view.
+
+        Parameters
+        ==========
+        vm : ArrayVirtualMachine
+            VM view that will be backed by the new row
+
+        Returns
+        =======
+        row : int
+            Row assigned to the VM
+        """
+
+        row = len(self.virtual_machines)
+
+        if row == len(self.vm_server):
+            self.vm_demand = np.concatenate([self.vm_demand, np.zeros_like(self.vm_demand)])
+            self.vm_server = np.concatenate([self.vm_server, np.full_like(self.vm_server, -1)])
+
+        self.virtual_machines.append(vm)
+
+        return(row)
+
+
+    def occupation_rates(self):
+        """ Computes the occupation rate of all servers. Operations follow the same order
+        used by 'Server.occupation_rate' so that both methods give the same results.
+
+        Returns
+        =======
+        occupation_rates : numpy.ndarray
+            Occupation rate of each server
+        """
+
+        capacity = self.server_capacity[:len(self.servers)]
+        demand = self.server_demand[:len(self.servers)]
+
+        usage_percentage = demand * 100 / capacity
+
+        return((usage_percentage[:, 0] + usage_percentage[:, 1] + usage_percentage[:, 2]) / 3)
+
+
+    def residual_capacity(self):
+        """ Computes the amount of free resources on each server.
+
+        Returns
+        =======
+        residual_capacity : numpy.ndarray
+            Matrix with the free resources (columns) of each server (rows)
+        """
+
+        return(self.server_capacity[:len(self.servers)] - self.server_demand[:len(self.servers)])
+
+
+    def hosted_vms(self):
+        """ Counts the number of VMs hosted by each server.
+
+        Returns
+        =======
+        hosted_vms : numpy.ndarray
+            Number of VMs hosted by each server
+        """
+
+        vm_server = self.vm_server[:len(self.virtual_machines)]
+
+        return(np.bincount(vm_server[vm_server >= 0], minlength=len(self.servers)))
+
+
+    def safeguarded_vms(self):
+        """ Counts the number of VMs hosted by updated servers.
+
+        Returns
+        =======
+        safeguarded_vms : int
+            Number of VMs hosted by updated servers
+        """
+
+        vm_server = self.vm_server[:len(self.virtual_machines)]
+
+        return(int(np.count_nonzero(self.server_updated[vm_server[vm_server >= 0]])))
+
+
+def server_column(array_name, column):
+    """ Creates a property that reads and writes a server attribute from a column of the cluster state.
+    """
+
+    def getter(server):
+        return(int(getattr(server.cluster_state, array_name)[server.row, column]))
+
+    def setter(server, value):
+        getattr(server.cluster_state, array_name)[server.row, column] = value
+
+    return(property(getter, setter))
+
+
+def vm_column(column):
+    """ Creates a property that reads and writes a VM demand attribute from a column of the cluster state.
+    """
+
+    def getter(vm):
+        return(int(vm.cluster_state.vm_demand[vm.row, column]))
+
+    def setter(vm, value):
+        vm.cluster_state.vm_demand[vm.row, column] = value
+
+    return(property(getter, setter))
+
+
+class ArrayServer(Server):
+    """ This class allows the creation of server objects whose capacity,
+    demand and update status are stored in a ClusterState object.
+    """
+
+    __slots__ = ['cluster_state', 'row']
+
+    cpu_capacity = server_column('server_capacity', 0)
+    memory_capacity = server_column('server_capacity', 1)
+    disk_capacity = server_column('server_capacity', 2)
+
+    cpu_demand = server_column('server_demand', 0)
+    memory_demand = server_column('server_demand', 1)
+    disk_demand = server_column('server_demand', 2)
+
+    def __init__(self, id, cpu, memory, disk, updated, cluster_state):
+        """ This method creates a server object backed by a ClusterState object.
+
+        Parameters
+        ==========
+        id : int
+            Unique identifier
+
+        cpu : int
+            CPU capacity of the server
+
+        memory : int
+            Memory capacity of the server
+
+        disk : int
+            Disk capacity of the server
+
+        updated : boolean
+            Initial update status
+
+        cluster_state : ClusterState
+            Object that stores the server attributes
+        """
+
+        # Reserving a row of the cluster state before attributes are defined
+        object.__setattr__(self, 'cluster_state', cluster_state)
+        object.__setattr__(self, 'row', cluster_state.add_server(self))
+
+        super().__init__(id=id, cpu=cpu, memory=memory, disk=disk, updated=updated)
+
+
+    @property
+    def updated(self):
+        return(bool(self.cluster_state.server_updated[self.row]))
+
+
+    @updated.setter
+    def updated(self, value):
+        self.cluster_state.server_updated[self.row] = bool(value)
+
+
+class ArrayVirtualMachine(VirtualMachine):
+    """ This class allows the creation of VM objects whose demand
+    and host server are stored in a ClusterState object.
+    """
+
+    __slots__ = ['cluster_state', 'row']
+
+    cpu_demand = vm_column(0)
+    memory_demand = vm_column(1)
+    disk_demand = vm_column(2)
+
+    def __init__(self, id, cpu, memory, disk, cluster_state):
+        """ This method creates a VM object backed by a ClusterState object.
+
+        Parameters
+        ==========
+        id : int
+            Unique identifier
+
+        cpu : int
+            CPU demand of the VM
+
+        memory : int
+            Memory demand of the VM
+
+        disk : int
+            Disk demand of the VM
+
+        cluster_state : ClusterState
+            Object that stores the VM attributes
+        """
+
+        # Reserving a row of the cluster state before attributes are defined
+        object.__setattr__(self, 'cluster_state', cluster_state)
+        object.__setattr__(self, 'row', cluster_state.add_virtual_machine(self))
+
+        super().__init__(id=id, cpu=cpu, memory=memory, disk=disk)
+
+
+    @property
+    def server(self):
+        row = self.cluster_state.vm_server[self.row]
+        return(None if row < 0 else self.cluster_state.servers[row])
+
+
+    @server.setter
+    def server(self, server):
+        self.cluster_state.vm_server[self.row] = -1 if server is None else server.row
@@ -1,5 +1,8 @@
 SEED_VALUE = 1
 
+# Enables consistency checks (e.g., comparing the demand maintained by servers with a full recompute) after each step
+DEBUG = False
+
 ###############################
 ## Virtual Machine Migration ##
 ###############################
@@ -7,6 +10,10 @@ SAVE_TIME = 30 # Amount of time it takes to save the state of a VM
 RESTORE_TIME = 30 # Amount of time it takes to restore the state of a VM
 # NETWORK_BW = 1024 # Network bandwidth (PAPER FIGURE EXAMPLE)
 NETWORK_BW = 125 # Network bandwidth (in this case, 1Gbit) (PAPER EXPERIMENTS PARAMETER)
+TOPOLOGY_AWARE_MIGRATION = True # Uses the bottleneck bandwidth of the path between servers instead of NETWORK_BW
+CONCURRENT_MIGRATIONS = False # Runs the migrations of each maintenance step concurrently (sharing link bandwidth)
+MIGRATION_HISTORY = 'all' # Migration records kept by the migration log ('all', 'last' per VM or 'aggregate' only)
+MIGRATION_HISTORY_LENGTH = 10 # Number of migration records kept for each VM when MIGRATION_HISTORY = 'last'
 
 
 ########################
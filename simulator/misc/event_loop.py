@@ -0,0 +1,329 @@
+# Python Libraries
+import heapq
+from itertools import count
+
+
+# Event priorities (events scheduled to the same time are processed by priority and then by scheduling order)
+URGENT = 0
+NORMAL = 1
+
+
+class Event:
+    """ This class represents an event that may happen at some point in time. Processes waiting for the event
+    (and conditions that depend on it) register themselves as callbacks, which are called once the event is
+    processed by the event loop.
+    """
+
+    __slots__ = ['loop', 'callbacks', 'triggered', 'value']
+
+    def __init__(self, loop):
+        """ Creates an Event object.
+
+        Parameters
+        ==========
+        loop : EventLoop
+            Event loop that processes the event
+        """
+
+        self.loop = loop
+
+        # Functions called when the event is processed (set to None once the event is processed)
+        self.callbacks = []
+
+        # Tells whether the event has been scheduled to be processed
+        self.triggered = False
+
+        # Value sent to processes waiting for the event
+        self.value = None
+
+
+    @property
+    def processed(self):
+        """ Tells whether the event has already been processed.
+        """
+
+        return(self.callbacks is None)
+
+
+    def succeed(self, value=None):
+        """ Triggers the event, scheduling it to be processed at the current simulation time.
+
+        Parameters
+        ==========
+        value : Any, optional
+            Value sent to processes waiting for the event
+
+        Returns
+        =======
+        event : Event
+            The event itself
+        """
+
+        if self.triggered:
+            raise RuntimeError(f'{self} has already been triggered')
+
+        self.triggered = True
+        self.value = value
+        self.loop.schedule(self)
+
+        return(self)
+
+
+class Timeout(Event):
+    """ This class represents an event that happens after a given delay.
+    """
+
+    __slots__ = []
+
+    def __init__(self, loop, delay, value=None):
+        """ Creates a Timeout object.
+
+        Parameters
+        ==========
+        loop : EventLoop
+            Event loop that processes the event
+
+        delay : float
+            Amount of simulation time until the event happens
+
+        value : Any, optional
+            Value sent to processes waiting for the event
+        """
+
+        if delay < 0:
+            raise ValueError(f'Negative delay {delay}')
+
+        super().__init__(loop)
+
+        self.triggered = True
+        self.value = value
+        loop.schedule(self, delay=delay)
+
+
+class Process(Event):
+    """ This class runs a generator that yields events, resuming it whenever the event it waits for is
+    processed. The process itself is an event, triggered when the generator finishes (its value is the
+    generator's return value), so processes can wait for each other.
+    """
+
+    __slots__ = ['generator', 'resume_callback']
+
+    def __init__(self, loop, generator):
+        """ Creates a Process object.
+
+        Parameters
+        ==========
+        loop : EventLoop
+            Event loop that runs the process
+
+        generator : Generator
+            Generator that describes the process behavior
+        """
+
+        super().__init__(loop)
+
+        self.generator = generator
+
+        # Bound method registered as callback of the events the process waits for (created only once)
+        self.resume_callback = self.resume
+
+        # Starting the process at the current simulation time (before other events scheduled to the same time)
+        initialize = Event(loop)
+        initialize.triggered = True
+        initialize.callbacks.append(self.resume_callback)
+        loop.schedule(initialize, priority=URGENT)
+
+
+    def resume(self, event):
+        """ Resumes the generator with the value of the event it was waiting for.
+
+        Parameters
+        ==========
+        event : Event
+            Event the process was waiting for
+        """
+
+        send = self.generator.send
+
+        while True:
+            try:
+                event = send(event.value)
+            except StopIteration as stop:
+                # The generator has finished, so processes waiting for this process can be resumed
+                self.triggered = True
+                self.value = stop.value
+                self.loop.schedule(self)
+                return
+
+            # Waiting for events that were not processed yet (processed events resume the generator right away)
+            if event.callbacks is not None:
+                event.callbacks.append(self.resume_callback)
+                return
+
+
+class Condition(Event):
+    """ This class represents an event that happens once all (or any) of a collection of events happen. The
+    condition value is a dictionary with the values of the events that happened when the condition was met.
+    """
+
+    __slots__ = ['events', 'wait_all', 'count']
+
+    def __init__(self, loop, events, wait_all):
+        """ Creates a Condition object.
+
+        Parameters
+        ==========
+        loop : EventLoop
+            Event loop that processes the event
+
+        events : Iterable
+            Events the condition depends on
+
+        wait_all : boolean
+            Tells whether the condition waits for all events (otherwise, it waits for any of them)
+        """
+
+        super().__init__(loop)
+
+        self.events = tuple(events)
+        self.wait_all = wait_all
+
+        # Number of events that have already been processed
+        self.count = 0
+
+        if len(self.events) == 0:
+            self.succeed({})
+            return
+
+        for event in self.events:
+            if event.callbacks is None:
+                self.check(event)
+            else:
+                event.callbacks.append(self.check)
+
+
+    def check(self, event):
+        """ Checks whether the condition is met after one of its events is processed.
+
+        Parameters
+        ==========
+        event : Event
+            Event that has just been processed
+        """
+
+        if self.triggered:
+            return
+
+        self.count += 1
+
+        if not self.wait_all or self.count == len(self.events):
+            self.succeed({event: event.value for event in self.events if event.callbacks is None})
+
+
+class EventLoop:
+    """ This class implements a minimal discrete-event simulation core that offers the subset of SimPy's
+    environment API used by the simulator ('now', 'event', 'timeout', 'process', 'all_of', 'any_of' and 'run'),
+    so maintenance strategies run unchanged on top of it. Events are kept in a binary heap ordered by time,
+    priority and scheduling order (the same ordering criteria used by SimPy), and processing an event is just
+    a matter of calling its callbacks, which avoids most of the generic machinery SimPy has for each event.
+    """
+
+    def __init__(self, initial_time=0):
+        """ Creates an EventLoop object.
+
+        Parameters
+        ==========
+        initial_time : float, optional
+            Simulation time in which the simulation starts
+        """
+
+        # Current simulation time
+        self.now = initial_time
+
+        # Heap of scheduled events
+        self.queue = []
+
+        # Counter that keeps events scheduled to the same time and priority in scheduling order
+        self.event_ids = count()
+
+
+
+    def schedule(self, event, priority=NORMAL, delay=0):
+        """ Schedules an event to be processed after a given delay.
+
+        Parameters
+        ==========
+        event : Event
+            Event that will be processed
+
+        priority : int, optional
+            Priority of the event among events scheduled to the same time
+
+        delay : float, optional
+            Amount of simulation time until the event is processed
+        """
+
+        heapq.heappush(self.queue, (self.now + delay, priority, next(self.event_ids), event))
+
+
+    def event(self):
+        """ Creates an event that is triggered manually (through 'succeed').
+        """
+
+        return(Event(self))
+
+
+    def timeout(self, delay, value=None):
+        """ Creates an event that happens after a given delay. Timeouts are the most common events, so their
+        attributes are set (and they are scheduled) inline, without going through 'Timeout.__init__'.
+        """
+
+        if delay < 0:
+            raise ValueError(f'Negative delay {delay}')
+
+        timeout = Timeout.__new__(Timeout)
+        timeout.loop = self
+        timeout.callbacks = []
+        timeout.triggered = True
+        timeout.value = value
+        heapq.heappush(self.queue, (self.now + delay, NORMAL, next(self.event_ids), timeout))
+
+        return(timeout)
+
+
+    def process(self, generator):
+        """ Starts a process described by a generator.
+        """
+
+        return(Process(self, generator))
+
+
+    def all_of(self, events):
+        """ Creates an event that happens once all of the given events happen.
+        """
+
+        return(Condition(self, events, wait_all=True))
+
+
+    def any_of(self, events):
+        """ Creates an event that happens once any of the given events happens.
+        """
+
+        return(Condition(self, events, wait_all=False))
+
+
+    def run(self):
+        """ Processes events until there are no more events scheduled.
+        """
+
+        queue = self.queue
+        heappop = heapq.heappop
+
+        while queue:
+            self.now, _, _, event = heappop(queue)
+
+            callbacks = event.callbacks
+            event.callbacks = None
+
+            for callback in callbacks:
+                callback(event)
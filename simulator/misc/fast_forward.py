@@ -0,0 +1,160 @@
+class Delay:
+    """ This class represents a request to wait for a known amount of time in fast-forward simulations.
+    """
+
+    __slots__ = ['delay', 'value']
+
+    def __init__(self, delay, value=None):
+        """ Creates a Delay object.
+
+        Parameters
+        ==========
+        delay : float
+            Amount of simulation time to wait
+
+        value : Any, optional
+            Value sent back to the generator once the delay elapses
+        """
+
+        if delay < 0:
+            raise ValueError(f'Negative delay {delay}')
+
+        self.delay = delay
+        self.value = value
+
+
+class Task:
+    """ This class represents a generator scheduled to run in a fast-forward simulation.
+    """
+
+    __slots__ = ['generator', 'finished', 'value']
+
+    def __init__(self, generator):
+        """ Creates a Task object.
+
+        Parameters
+        ==========
+        generator : Generator
+            Generator that describes the task behavior
+        """
+
+        self.generator = generator
+
+        # Tells whether the generator has already been executed (and the value it returned)
+        self.finished = False
+        self.value = None
+
+
+class Join:
+    """ This class represents a request to wait for a group of tasks in fast-forward simulations.
+    """
+
+    __slots__ = ['tasks']
+
+    def __init__(self, tasks):
+        self.tasks = tasks
+
+
+class FastForward:
+    """ This class runs simulations without an event loop. Maintenance strategies only wait for durations that
+    are known in advance (migration times and patching times) and for the tasks they start, so the simulation
+    is a deterministic sequence of decisions: generators are executed inline, and each timeout they yield
+    advances the simulation time arithmetically. The class offers the subset of SimPy's environment API needed
+    to do so ('now', 'timeout', 'process', 'all_of' and 'run'), so strategies run unchanged.
+
+    Tasks run sequentially: a task starts when it's yielded (or when 'run' is called), which matches how the
+    simulator uses processes (they are always waited for right after being created). Events that depend on
+    other processes running at the same time (e.g., concurrent migrations) are not supported.
+    """
+
+    def __init__(self, initial_time=0):
+        """ Creates a FastForward object.
+
+        Parameters
+        ==========
+        initial_time : float, optional
+            Simulation time in which the simulation starts
+        """
+
+        # Current simulation time
+        self.now = initial_time
+
+        # Tasks created but not executed yet
+        self.pending_tasks = []
+
+
+    def timeout(self, delay, value=None):
+        """ Creates a request to wait for a given delay.
+        """
+
+        return(Delay(delay, value))
+
+
+    def process(self, generator):
+        """ Creates a task that runs a generator.
+        """
+
+        task = Task(generator)
+        self.pending_tasks.append(task)
+
+        return(task)
+
+
+    def all_of(self, events):
+        """ Creates a request to wait for a group of tasks.
+        """
+
+        return(Join(list(events)))
+
+
+    def run(self):
+        """ Executes all tasks that were not executed yet.
+        """
+
+        while len(self.pending_tasks) > 0:
+            self.execute(self.pending_tasks.pop(0))
+
+
+    def execute(self, task):
+        """ Executes a task, advancing the simulation time according to the delays it yields.
+
+        Parameters
+        ==========
+        task : Task
+            Task that will be executed
+
+        Returns
+        =======
+        value : Any
+            Value returned by the task generator
+        """
+
+        if task.finished:
+            return(task.value)
+
+        if task in self.pending_tasks:
+            self.pending_tasks.remove(task)
+
+        send = task.generator.send
+        value = None
+
+        while True:
+            try:
+                request = send(value)
+            except StopIteration as stop:
+                task.finished = True
+                task.value = stop.value
+                return(task.value)
+
+            if type(request) is Delay:
+                self.now += request.delay
+                value = request.value
+
+            elif type(request) is Task:
+                value = self.execute(request)
+
+            elif type(request) is Join:
+                value = {joined_task: self.execute(joined_task) for joined_task in request.tasks}
+
+            else:
+                raise Exception(f'Fast-forward simulations don\'t support waiting for "{request}"! Exiting.')
@@ -0,0 +1,378 @@
+# Python Libraries
+import json
+import time
+import cProfile
+import functools
+
+
+class Instrumentation:
+    """ This class measures where the wall time of simulations goes. Once enabled, it wraps the methods behind
+    each phase of the simulation (see 'INSTRUMENTED_METHODS') and the maintenance strategy, recording the wall
+    time and number of calls of each phase, alongside the wall time, number of scheduled events and phase
+    totals of each maintenance step. Methods are only wrapped while the instrumentation is enabled and are
+    restored when it's disabled, so simulations that are not instrumented run the original methods untouched.
+
+    Phase times are inclusive (e.g., the time of the maintenance strategy includes the 'can_host_vms' checks and
+    migrations it performs). The 'run' phase spans the whole simulation loop, whereas generator-based phases
+    (e.g., the maintenance strategy) only count the time spent executing them, not the simulated time they wait.
+
+    Optionally, the instrumentation stores either a cProfile dump (readable with 'pstats') or a Chrome trace
+    (a JSON file readable with 'chrome://tracing' or Perfetto) of the simulation.
+    """
+
+    # Methods timed by the instrumentation: (phase, module, class, method). Classes are imported on 'enable',
+    # and subclasses that override a method (e.g., the ones used by the 'array' backend) are wrapped as well
+    INSTRUMENTED_METHODS = [
+        ('run', 'simulator.misc.simulation_environment', 'SimulationEnvironment', 'run'),
+        ('collect_metrics', 'simulator.misc.simulation_environment', 'SimulationEnvironment', 'collect_metrics'),
+        ('patch_batching', 'simulator.components.infrastructure.server', 'Server', 'ready_to_patch'),
+        ('patching', 'simulator.components.infrastructure.server', 'Server', 'update'),
+        ('candidate_sorting', 'simulator.components.resource_management.host_selection', 'HostSelectionIndex',
+            '__init__'),
+        ('host_selection', 'simulator.components.resource_management.host_selection', 'HostSelectionIndex',
+            'first_fit'),
+        ('can_host_vms', 'simulator.components.infrastructure.server', 'Server', 'can_host_vms'),
+        ('migrate', 'simulator.components.application.virtual_machine', 'VirtualMachine', 'migrate'),
+        ('relocate', 'simulator.components.application.virtual_machine', 'VirtualMachine', 'relocate'),
+    ]
+
+    # Phase of the maintenance strategy (whose generator function is wrapped when the simulator gathers it)
+    STRATEGY_PHASE = 'maintenance_strategy'
+
+    def __init__(self, output_file=None):
+        """ Creates an Instrumentation object.
+
+        Parameters
+        ==========
+        output_file : string, optional
+            Path of a Chrome trace (when it ends with '.json') or of a cProfile dump (any other name)
+        """
+
+        self.output_file = output_file
+
+        # Tells whether a Chrome trace is recorded (and, otherwise, whether a cProfile dump is stored)
+        self.trace = output_file is not None and output_file.endswith('.json')
+        self.profiler = cProfile.Profile() if output_file is not None and not self.trace else None
+
+        # Number of calls and wall time of each phase (phases follow the order they were first called)
+        self.phases = {}
+
+        # Wall time, number of scheduled events and phase totals (only the phases called) of each maintenance step
+        self.steps = []
+
+        # Phase totals, number of scheduled events and wall clock at the beginning of the current maintenance step
+        self.step_phases = {}
+        self.step_events = 0
+        self.step_start = None
+
+        # Number of events scheduled during the simulation
+        self.events = 0
+
+        # Timed intervals (phase, start and duration, in seconds) of the Chrome trace
+        self.spans = []
+
+        # Original methods replaced by the instrumentation: (owner, attribute name, original attribute)
+        self.originals = []
+
+        # Wall clock when the instrumentation was enabled
+        self.start = None
+
+
+    def enable(self):
+        """ Starts instrumenting simulations.
+        """
+
+        # Importing instrumented modules only when the instrumentation is used
+        import importlib
+        import simulator.simulator as simulator_module
+
+        self.start = time.perf_counter()
+        self.step_start = self.start
+
+        for phase, module_name, class_name, method_name in Instrumentation.INSTRUMENTED_METHODS:
+            owner = getattr(importlib.import_module(module_name), class_name)
+
+            for cls in [owner] + all_subclasses(owner):
+                if method_name in vars(cls):
+                    self.wrap(cls, method_name, phase)
+
+        # Wrapping maintenance strategies as they are gathered by the simulator
+        get_strategy = simulator_module.get_strategy
+        self.originals.append((simulator_module, 'get_strategy', get_strategy))
+        simulator_module.get_strategy = lambda name: self.timed_generator_function(get_strategy(name),
+            Instrumentation.STRATEGY_PHASE)
+
+        if self.profiler is not None:
+            self.profiler.enable()
+
+
+    def disable(self):
+        """ Stops instrumenting simulations (restoring the original methods) and stores the Chrome trace or
+        cProfile dump (if requested).
+        """
+
+        if self.profiler is not None:
+            self.profiler.disable()
+            self.profiler.dump_stats(self.output_file)
+
+        for owner, attribute_name, original in reversed(self.originals):
+            setattr(owner, attribute_name, original)
+
+        self.originals = []
+
+        if self.trace:
+            self.save_trace(self.output_file)
+
+
+    def wrap(self, owner, method_name, phase):
+        """ Replaces a method by a version that records the time spent on it.
+
+        Parameters
+        ==========
+        owner : class
+            Class that defines the method
+
+        method_name : string
+            Name of the method
+
+        phase : string
+            Phase represented by the method
+        """
+
+        original = vars(owner)[method_name]
+        self.originals.append((owner, method_name, original))
+
+        # Simulation loops are generators, so the whole loop (rather than the call that creates it) is timed
+        if method_name == 'run':
+            wrapper = self.timed_simulation_loop(original, phase)
+        elif isinstance(original, classmethod):
+            wrapper = classmethod(self.timed_function(original.__func__, phase))
+        elif isinstance(original, staticmethod):
+            wrapper = staticmethod(self.timed_function(original.__func__, phase))
+        else:
+            wrapper = self.timed_function(original, phase)
+
+        # The end of each metrics collection closes the current maintenance step
+        if method_name == 'collect_metrics':
+            collect_metrics = wrapper
+
+            def wrapper(*args, **kwargs):
+                result = collect_metrics(*args, **kwargs)
+                self.finish_step()
+                return(result)
+
+        setattr(owner, method_name, wrapper)
+
+
+    def record(self, phase, start, duration, new_call=True):
+        """ Records the time spent on a phase.
+
+        Parameters
+        ==========
+        phase : string
+            Phase called
+
+        start : float
+            Wall clock when the phase started running
+
+        duration : float
+            Wall time spent on the phase
+
+        new_call : boolean, optional
+            Tells whether the time belongs to a new call (resumed generators add time to their ongoing call)
+        """
+
+        for phases in (self.phases, self.step_phases):
+            totals = phases.setdefault(phase, [0, 0])
+            totals[0] += 1 if new_call else 0
+            totals[1] += duration
+
+        if self.trace:
+            self.spans.append((phase, start, duration))
+
+
+    def timed_function(self, function, phase):
+        """ Wraps a function so that each call is recorded as a call to a phase.
+        """
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return(function(*args, **kwargs))
+            finally:
+                self.record(phase, start, time.perf_counter() - start)
+
+        return(wrapper)
+
+
+    def timed_generator_function(self, generator_function, phase):
+        """ Wraps a generator function so that each generator it creates is recorded as a call to a phase,
+        whose time is the time spent executing the generator (i.e., while it's resumed).
+        """
+
+        @functools.wraps(generator_function)
+        def wrapper(*args, **kwargs):
+            return(self.timed_generator(generator_function(*args, **kwargs), phase))
+
+        return(wrapper)
+
+
+    def timed_generator(self, generator, phase):
+        """ Runs a generator, recording the time spent executing it each time it's resumed (the first resume
+        counts as a call to the phase, whereas later resumes only add time to it).
+
+        Parameters
+        ==========
+        generator : Generator
+            Generator that will be timed
+
+        phase : string
+            Phase represented by the generator
+        """
+
+        value = None
+        exception = None
+        new_call = True
+
+        while True:
+            start = time.perf_counter()
+            try:
+                if exception is not None:
+                    event = generator.throw(exception)
+                else:
+                    event = generator.send(value)
+            except StopIteration as stop:
+                self.record(phase, start, time.perf_counter() - start, new_call)
+                return(stop.value)
+            except BaseException:
+                self.record(phase, start, time.perf_counter() - start, new_call)
+                raise
+
+            self.record(phase, start, time.perf_counter() - start, new_call)
+            new_call = False
+
+            try:
+                value = yield event
+                exception = None
+            except GeneratorExit:
+                generator.close()
+                raise
+            except BaseException as thrown_exception:
+                exception = thrown_exception
+
+
+    def timed_simulation_loop(self, run, phase):
+        """ Wraps the simulation loop ('SimulationEnvironment.run'), timing it from its beginning to its end and
+        counting the events scheduled by the discrete-event engine while it runs.
+        """
+
+        @functools.wraps(run)
+        def wrapper(simulation_environment, *args, **kwargs):
+            self.count_events(simulation_environment.env)
+
+            start = time.perf_counter()
+            try:
+                return((yield from run(simulation_environment, *args, **kwargs)))
+            finally:
+                self.record(phase, start, time.perf_counter() - start)
+
+        return(wrapper)
+
+
+    def count_events(self, env):
+        """ Wraps the methods through which events are scheduled on a discrete-event environment (timeouts and
+        processes) so that they are counted. The methods are only replaced on the given environment object.
+        """
+
+        for method_name in ['timeout', 'process']:
+            method = getattr(env, method_name)
+
+            def wrapper(*args, method=method, **kwargs):
+                self.events += 1
+                self.step_events += 1
+                return(method(*args, **kwargs))
+
+            setattr(env, method_name, wrapper)
+
+
+    def finish_step(self):
+        """ Closes the current maintenance step, storing its wall time, events and phase totals.
+        """
+
+        step_end = time.perf_counter()
+
+        self.steps.append({'wall_time': step_end - self.step_start, 'events': self.step_events,
+            'phases': self.step_phases})
+
+        if self.trace:
+            self.spans.append((f'maintenance_step_{len(self.steps)}', self.step_start, step_end - self.step_start))
+
+        self.step_phases = {}
+        self.step_events = 0
+        self.step_start = step_end
+
+
+    def summary(self):
+        """ Describes the time spent on each phase and on each maintenance step.
+
+        Returns
+        =======
+        summary : string
+            Table with the calls, wall time and share of the total time of each phase, followed by a table with
+            the wall time, events and time of the main phases of each maintenance step
+        """
+
+        total_time = sum(step['wall_time'] for step in self.steps) or 1
+        lines = ['=== PHASES ===', f'{"Phase":<22}{"Calls":>10}{"Time (s)":>12}{"Mean (ms)":>12}{"Share":>9}']
+
+        for phase, (calls, phase_time) in self.phases.items():
+            lines.append(f'{phase:<22}{calls:>10}{phase_time:>12.4f}{phase_time * 1000 / max(calls, 1):>12.4f}'
+                f'{phase_time * 100 / total_time:>8.1f}%')
+
+        # Per-step table with the phases that take most of the time
+        main_phases = [phase for phase in sorted(self.phases, key=lambda phase: -self.phases[phase][1])
+            if phase != 'run'][:4]
+
+        lines += ['', '=== MAINTENANCE STEPS ===', f'{"Step":<6}{"Time (s)":>10}{"Events":>9}' +
+            ''.join(f'{phase[:20]:>22}' for phase in main_phases)]
+
+        for step_number, step in enumerate(self.steps, start=1):
+            lines.append(f'{step_number:<6}{step["wall_time"]:>10.4f}{step["events"]:>9}' +
+                ''.join(f'{step["phases"].get(phase, [0, 0])[1]:>22.4f}' for phase in main_phases))
+
+        return('\n'.join(lines))
+
+
+    def save_trace(self, path):
+        """ Stores the recorded intervals as a Chrome trace (one complete event per interval, with times given
+        in microseconds since the instrumentation was enabled, and maintenance steps on a separate track).
+
+        Parameters
+        ==========
+        path : string
+            Path of the JSON file
+        """
+
+        events = [{'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': 1, 'args': {'name': 'Simulation'}},
+            {'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': 2, 'args': {'name': 'Maintenance steps'}}]
+
+        for phase, start, duration in self.spans:
+            events.append({'name': phase, 'ph': 'X', 'pid': 1,
+                'tid': 2 if phase.startswith('maintenance_step_') else 1,
+                'ts': (start - self.start) * 1e6, 'dur': duration * 1e6})
+
+        with open(path, 'w') as trace_file:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, trace_file)
+
+
+def all_subclasses(cls):
+    """ Gathers all direct and indirect subclasses of a class.
+    """
+
+    subclasses = []
+
+    for subclass in cls.__subclasses__():
+        subclasses += [subclass] + all_subclasses(subclass)
+
+    return(subclasses)
@@ -0,0 +1,236 @@
+# Python Libraries
+import json
+from collections import namedtuple
+
+
+# Immutable snapshots of servers and VMs (only stored when explicitly requested)
+ServerSnapshot = namedtuple('ServerSnapshot', ['id', 'occupation_rate', 'cpu_capacity', 'memory_capacity',
+    'disk_capacity', 'cpu_demand', 'memory_demand', 'disk_demand', 'virtual_machines', 'updated', 'update_step'])
+
+VirtualMachineSnapshot = namedtuple('VirtualMachineSnapshot', ['id', 'cpu_demand', 'memory_demand', 'disk_demand',
+    'server', 'server_update_status', 'migrations'])
+
+
+class MetricsCollector:
+    """ This class computes the aggregated metrics of each maintenance step at collection time and stores them
+    in a compact columnar buffer (one list per metric), which can optionally be spilled to a JSON-lines file.
+    Raw per-server and per-VM data is only kept when snapshots are explicitly requested, in which case it's
+    stored as immutable copies (VMs and servers are referenced by their IDs).
+    """
+
+    # Metrics stored for each maintenance step
+    COLUMNS = ['maintenance_step', 'simulation_step', 'consolidation_rate', 'occupation_rate', 'safeguarded_servers',
+        'vulnerable_servers', 'updated_servers', 'safeguarded_vms', 'vulnerable_vms', 'vulnerability_surface',
+        'migrations', 'overall_migration_duration', 'average_migration_duration', 'longest_migration_duration']
+
+    def __init__(self, keep_snapshots=False, spill_file=None, buffer_size=1000):
+        """ Creates a MetricsCollector object.
+
+        Parameters
+        ==========
+        keep_snapshots : boolean, optional
+            Tells whether immutable copies of servers and VMs data must be stored at each step
+
+        spill_file : string, optional
+            Path of a JSON-lines file where rows are written whenever the buffer gets full
+
+        buffer_size : int, optional
+            Number of rows kept in memory before spilling them to 'spill_file'
+        """
+
+        self.keep_snapshots = keep_snapshots
+        self.spill_file = spill_file
+        self.buffer_size = buffer_size
+
+        # Columnar buffer with the metrics of each step
+        self.columns = {column: [] for column in MetricsCollector.COLUMNS}
+
+        # Number of rows already written to the spill file
+        self.spilled_rows = 0
+
+        # Immutable copies of servers and VMs data of each step
+        self.snapshots = []
+
+        # Starting with an empty spill file
+        if self.spill_file:
+            open(self.spill_file, 'w').close()
+
+
+    def __len__(self):
+        return(self.spilled_rows + len(self.columns['maintenance_step']))
+
+
+    def __iter__(self):
+        return(self.rows())
+
+
+    def collect(self, maintenance_step, simulation_step, servers, virtual_machines, migration_summary,
+        cluster_state=None):
+        """ Computes the aggregated metrics of a maintenance step and appends them to the buffer.
+
+        Parameters
+        ==========
+        maintenance_step : int
+            Current maintenance step
+
+        simulation_step : int
+            Current simulation time
+
+        servers : List
+            List of servers
+
+        virtual_machines : List
+            List of VMs
+
+        migration_summary : MigrationSummary
+            Number of migrations, overall migration duration and longest migration of the current maintenance step
+
+        cluster_state : ClusterState, optional
+            Columnar cluster state used to compute server and VM metrics with vectorized operations
+
+        Returns
+        =======
+        row : Dictionary
+            Metrics of the maintenance step
+        """
+
+        # Gathering the occupation rate and the number of VMs hosted by servers (with
+        # vectorized operations when servers are backed by a columnar cluster state)
+        if cluster_state is not None:
+            occupation_rates = cluster_state.occupation_rates().tolist()
+            hosted_vms = cluster_state.hosted_vms().tolist()
+        else:
+            occupation_rates = [server.occupation_rate() for server in servers]
+            hosted_vms = [len(server.virtual_machines) for server in servers]
+
+        # Server-related metrics
+        safeguarded_servers = 0
+        updated_servers = 0
+        for server in servers:
+            # Security-related metrics
+            if server.updated:
+                safeguarded_servers += 1
+
+            if server.update_step == maintenance_step:
+                updated_servers += 1
+
+        vulnerable_servers = len(servers) - safeguarded_servers
+
+        # Capacity-related metrics (the sum follows the servers ordering to avoid floating-point discrepancies)
+        occupation_rate = sum(occupation_rates) / len(servers)
+        consolidation_rate = hosted_vms.count(0) * 100 / len(servers)
+
+        # Virtual-Machine-related metrics
+        if cluster_state is not None:
+            safeguarded_vms = cluster_state.safeguarded_vms()
+        else:
+            safeguarded_vms = 0
+            for vm in virtual_machines:
+                # Security-related metrics
+                if vm.server.updated:
+                    safeguarded_vms += 1
+
+        vulnerable_vms = len(virtual_machines) - safeguarded_vms
+
+        # Post-processing security metrics
+        vulnerability_surface = simulation_step * vulnerable_servers
+
+        # Migration-related metrics (aggregated by the migration log as migrations are performed)
+        overall_migration_duration = migration_summary.total_duration
+        longest_migration_duration = migration_summary.longest_duration
+
+        # Post-processing migration metrics
+        if migration_summary.count > 0:
+            average_migration_duration = overall_migration_duration / migration_summary.count
+        else:
+            average_migration_duration = 0
+
+        row = dict(zip(MetricsCollector.COLUMNS, [maintenance_step, simulation_step, consolidation_rate,
+            occupation_rate, safeguarded_servers, vulnerable_servers, updated_servers, safeguarded_vms,
+            vulnerable_vms, vulnerability_surface, migration_summary.count, overall_migration_duration,
+            average_migration_duration, longest_migration_duration]))
+
+        self.append(row)
+
+        # Storing immutable copies of servers and VMs data
+        if self.keep_snapshots:
+            self.snapshots.append(self.snapshot(maintenance_step, simulation_step, servers, virtual_machines,
+                occupation_rates))
+
+        return(row)
+
+
+    def append(self, row):
+        """ Appends the metrics of a maintenance step to the buffer (spilling the buffer when it gets full).
+
+        Parameters
+        ==========
+        row : Dictionary
+            Metrics of the maintenance step (see 'COLUMNS')
+        """
+
+        for column in MetricsCollector.COLUMNS:
+            self.columns[column].append(row[column])
+
+        if self.spill_file and len(self.columns['maintenance_step']) >= self.buffer_size:
+            self.spill()
+
+
+    @classmethod
+    def snapshot(cls, maintenance_step, simulation_step, servers, virtual_machines, occupation_rates):
+        """ Creates immutable copies of servers and VMs data.
+
+        Returns
+        =======
+        snapshot : Dictionary
+            Servers and VMs data of the current maintenance step
+        """
+
+        servers_data = tuple(ServerSnapshot(id=server.id, occupation_rate=occupation_rate,
+            cpu_capacity=server.cpu_capacity, memory_capacity=server.memory_capacity,
+            disk_capacity=server.disk_capacity, cpu_demand=server.cpu_demand, memory_demand=server.memory_demand,
+            disk_demand=server.disk_demand, virtual_machines=tuple(vm.id for vm in server.virtual_machines),
+            updated=server.updated, update_step=server.update_step)
+            for server, occupation_rate in zip(servers, occupation_rates))
+
+        virtual_machines_data = tuple(VirtualMachineSnapshot(id=vm.id, cpu_demand=vm.cpu_demand,
+            memory_demand=vm.memory_demand, disk_demand=vm.disk_demand, server=vm.server.id,
+            server_update_status=vm.server.updated,
+            migrations=tuple((migration['maintenance_step'], migration['duration'], migration['origin'].id,
+                migration['destination'].id) for migration in vm.migrations))
+            for vm in virtual_machines)
+
+        return({'maintenance_step': maintenance_step, 'simulation_step': simulation_step,
+            'servers': servers_data, 'virtual_machines': virtual_machines_data})
+
+
+    def spill(self):
+        """ Writes the rows stored in the buffer to the spill file and empties the buffer.
+        """
+
+        with open(self.spill_file, 'a') as spill_file:
+            for row in self.buffered_rows():
+                spill_file.write(json.dumps(row) + '\n')
+
+        self.spilled_rows += len(self.columns['maintenance_step'])
+        self.columns = {column: [] for column in MetricsCollector.COLUMNS}
+
+
+    def buffered_rows(self):
+        """ Iterates over the rows stored in the buffer.
+        """
+
+        for values in zip(*[self.columns[column] for column in MetricsCollector.COLUMNS]):
+            yield(dict(zip(MetricsCollector.COLUMNS, values)))
+
+
+    def rows(self):
+        """ Iterates over the metrics of all maintenance steps (including rows spilled to disk).
+        """
+
+        if self.spilled_rows > 0:
+            with open(self.spill_file, 'r') as spill_file:
+                for line in spill_file:
+                    yield(json.loads(line))
+
+        yield from self.buffered_rows()
@@ -0,0 +1,313 @@
+# Python Libraries
+import heapq
+
+# General-purpose simulator modules
+import simulator.misc.constants as constants
+
+
+# Amount of data (in megabytes) below which a transfer is considered finished (absorbs floating-point residues)
+TRANSFER_TOLERANCE = 1e-6
+
+
+class Flow:
+    """ This class represents the network transfer of a VM migration.
+    """
+
+    def __init__(self, links, size, done):
+        """ Creates a Flow object.
+
+        Parameters
+        ==========
+        links : List
+            Links used by the transfer (each link is represented by a tuple with its origin and destination nodes)
+
+        size : float
+            Amount of data (in megabytes) that must be transferred
+
+        done : simpy.Event
+            Event triggered when the transfer finishes
+        """
+
+        self.links = links
+        self.remaining = size
+        self.done = done
+
+        # Bandwidth currently assigned to the transfer
+        self.rate = 0
+
+
+class MigrationEngine:
+    """ This class performs VM migrations on behalf of maintenance strategies. By default, migrations are
+    sequential: each migration takes the time given by 'VirtualMachine.migration_time', and strategies wait
+    for it to finish before moving on (which is the behavior assumed by the original strategies).
+
+    When concurrent migrations are enabled (see 'CONCURRENT_MIGRATIONS' in 'constants'), each migration runs
+    as a SimPy process that saves the VM state, transfers it through the path between the origin and destination
+    servers, and restores it at the destination. Transfers share the bandwidth of the links they use according
+    to the max-min fairness criterion, and rates are recomputed whenever a transfer starts or finishes. In this
+    mode, 'migrate' returns right away, so strategies launch whole batches of migrations, and the simulation
+    waits for all outstanding migrations (see 'join') before moving to the next maintenance step.
+    """
+
+    def __init__(self, env, topology=None, concurrent=False):
+        """ Creates a MigrationEngine object.
+
+        Parameters
+        ==========
+        env : simpy.Environment
+            SimPy's simulation environment
+
+        topology : FatTree, optional
+            Network topology through which VMs are migrated
+
+        concurrent : boolean, optional
+            Tells whether migrations run concurrently (sharing link bandwidth) or sequentially
+        """
+
+        self.env = env
+        self.topology = topology
+        self.concurrent = concurrent
+
+        # Migration processes that may still be running
+        self.migrations = []
+
+        # Transfers currently using the network
+        self.flows = []
+
+        # Simulation time in which the remaining data of transfers was last updated
+        self.last_update = env.now
+
+        # Process that finishes transfers (only running while there are active transfers)
+        self.controller_process = None
+
+        # Event used to wake the controller up when the set of active transfers changes
+        self.wakeup = None
+
+        # Tells whether the set of active transfers changed since rates were last computed
+        self.rates_outdated = False
+
+        # Bandwidth of the links used by transfers
+        self.link_bandwidths = {}
+
+
+    def migrate(self, vm, destination_server):
+        """ Migrates a VM to a destination host.
+
+        Parameters
+        ==========
+        vm : VirtualMachine
+            VM that will be migrated
+
+        destination_server : Server
+            Server object to which the VM will be migrated
+
+        Returns
+        =======
+        event : simpy.Event
+            Event that strategies must wait for (concurrent migrations don't block strategies)
+        """
+
+        if not self.concurrent:
+            return(self.env.timeout(vm.migrate(destination_server)))
+
+        # VMs are allocated to their destination right away, so that strategies can keep planning the maintenance
+        origin_server = vm.relocate(destination_server)
+
+        self.migrations.append(self.env.process(self.migration(vm, origin_server, destination_server)))
+
+        return(self.env.timeout(0))
+
+
+    def join(self):
+        """ Creates an event that waits for all outstanding migrations.
+
+        Returns
+        =======
+        event : simpy.Event
+            Event triggered when all migrations finish
+        """
+
+        migrations = [migration for migration in self.migrations if not migration.triggered]
+        self.migrations = []
+
+        return(self.env.all_of(migrations))
+
+
+    def migration(self, vm, origin_server, destination_server):
+        """ SimPy process that performs a VM migration.
+
+        Parameters
+        ==========
+        vm : VirtualMachine
+            VM being migrated
+
+        origin_server : Server
+            Server that hosted the VM before the migration
+
+        destination_server : Server
+            Server to which the VM is migrated
+        """
+
+        start = self.env.now
+
+        # Saving the VM state, transferring it through the network and restoring it on the destination host.
+        # We multiply memory and disk demands by 1024 to convert these values from gigabytes to megabytes
+        yield self.env.timeout(constants.SAVE_TIME)
+        yield self.transfer(links=self.links(vm, origin_server, destination_server),
+            size=vm.memory_demand * 1024 + vm.disk_demand * 1024)
+        yield self.env.timeout(constants.RESTORE_TIME)
+
+        vm.record_migration(origin_server=origin_server, destination_server=destination_server, start=start,
+            duration=self.env.now - start)
+
+
+    def links(self, vm, origin_server, destination_server):
+        """ Gathers the links used to migrate a VM. Migrations between servers that are not part of the
+        topology use a dedicated link whose bandwidth is the default network bandwidth.
+
+        Returns
+        =======
+        links : List
+            Links within the path between the origin and destination servers
+        """
+
+        path = None
+        if self.topology is not None and origin_server in self.topology and destination_server in self.topology:
+            path = self.topology.widest_shortest_path(origin_server, destination_server)
+
+        if path is None:
+            return([('migration', vm.id)])
+
+        return(list(zip(path[:-1], path[1:])))
+
+
+    def link_bandwidth(self, link):
+        """ Gathers the bandwidth of a link.
+        """
+
+        if link not in self.link_bandwidths:
+            if link[0] == 'migration':
+                self.link_bandwidths[link] = constants.NETWORK_BW
+            else:
+                self.link_bandwidths[link] = self.topology[link[0]][link[1]]['bandwidth']
+
+        return(self.link_bandwidths[link])
+
+
+    def transfer(self, links, size):
+        """ Starts a network transfer.
+
+        Parameters
+        ==========
+        links : List
+            Links used by the transfer
+
+        size : float
+            Amount of data (in megabytes) that must be transferred
+
+        Returns
+        =======
+        event : simpy.Event
+            Event triggered when the transfer finishes
+        """
+
+        flow = Flow(links=links, size=size, done=self.env.event())
+
+        self.update_progress()
+        self.flows.append(flow)
+
+        # Waking the controller up so it shares bandwidth with the new transfer. Rates are only recomputed once the
+        # controller runs, so transfers starting at the same time trigger a single computation
+        self.rates_outdated = True
+        if self.controller_process is None:
+            self.controller_process = self.env.process(self.controller())
+        elif not self.wakeup.triggered:
+            self.wakeup.succeed()
+
+        return(flow.done)
+
+
+    def controller(self):
+        """ SimPy process that finishes transfers. The process sleeps until the earliest transfer completion
+        (given the current rates) or until a new transfer starts, whichever happens first.
+        """
+
+        while len(self.flows) > 0:
+            if self.rates_outdated:
+                self.allocate_rates()
+
+            self.wakeup = self.env.event()
+            next_completion = min(flow.remaining / flow.rate for flow in self.flows)
+
+            yield self.env.any_of([self.env.timeout(next_completion), self.wakeup])
+
+            self.update_progress()
+
+            finished_flows = [flow for flow in self.flows if flow.remaining <= TRANSFER_TOLERANCE]
+            if len(finished_flows) > 0:
+                for flow in finished_flows:
+                    self.flows.remove(flow)
+                    flow.done.succeed()
+
+                self.rates_outdated = True
+
+        self.controller_process = None
+
+
+    def update_progress(self):
+        """ Updates the amount of data that remains to be transferred by each transfer.
+        """
+
+        elapsed_time = self.env.now - self.last_update
+
+        for flow in self.flows:
+            flow.remaining -= flow.rate * elapsed_time
+
+        self.last_update = self.env.now
+
+
+    def allocate_rates(self):
+        """ Shares link bandwidth among transfers according to the max-min fairness criterion (progressive
+        filling): the link offering the smallest fair share is saturated first, its transfers get that share,
+        and the process is repeated with the capacity left on the other links. Fair shares never decrease
+        along the process, so links are kept in a heap and outdated shares are refreshed as they are popped.
+        """
+
+        capacity = {}
+        link_flows = {}
+        for flow in self.flows:
+            for link in flow.links:
+                if link not in capacity:
+                    capacity[link] = self.link_bandwidth(link)
+                    link_flows[link] = {}
+
+                link_flows[link][flow] = None
+
+        # Heap of fair shares offered by links (the position of links breaks ties deterministically). Flows are
+        # stored in dictionaries (used as ordered sets), so shares are subtracted in a deterministic order
+        positions = {link: position for position, link in enumerate(capacity)}
+        heap = [(capacity[link] / len(flows), positions[link], link) for link, flows in link_flows.items()]
+        heapq.heapify(heap)
+
+        while len(heap) > 0:
+            fair_share, position, bottleneck = heapq.heappop(heap)
+
+            flows = link_flows[bottleneck]
+            if len(flows) == 0:
+                continue
+
+            current_fair_share = capacity[bottleneck] / len(flows)
+            if current_fair_share != fair_share:
+                heapq.heappush(heap, (current_fair_share, position, bottleneck))
+                continue
+
+            for flow in list(flows):
+                flow.rate = fair_share
+
+                for link in flow.links:
+                    capacity[link] -= fair_share
+
+                    if link != bottleneck:
+                        link_flows[link].pop(flow, None)
+
+            flows.clear()
@@ -0,0 +1,243 @@
+# Python Libraries
+from collections import namedtuple
+
+
+# Record of a VM migration (servers and VMs are referenced by their IDs)
+Migration = namedtuple('Migration', ['maintenance_step', 'vm', 'origin', 'destination', 'start', 'duration'])
+
+# Aggregated migrations of a maintenance step or VM (the longest duration is only tracked for maintenance steps)
+MigrationSummary = namedtuple('MigrationSummary', ['count', 'total_duration', 'longest_duration'])
+
+
+class MigrationLog:
+    """ This class stores an append-only log with the VM migrations performed during the simulation. Records
+    are indexed by maintenance step, so the migrations of a given step can be gathered without walking through
+    the migration history of each VM, and by VM (the log is where the migration history of VMs is kept).
+
+    The log keeps the number and overall duration of migrations of each maintenance step and VM incrementally,
+    so metrics don't depend on the records it retains. How many records are retained is given by the
+    retention mode:
+
+    - 'all': every migration record is kept
+    - 'last': only the last 'history_length' migration records of each VM are kept
+    - 'aggregate': no migration records are kept (only the number and duration of migrations)
+    """
+
+    # Valid retention modes
+    RETENTION_MODES = ['all', 'last', 'aggregate']
+
+    def __init__(self, retention='all', history_length=10):
+        """ Creates a MigrationLog object.
+
+        Parameters
+        ==========
+        retention : string, optional
+            Retention mode ('all', 'last' or 'aggregate')
+
+        history_length : int, optional
+            Number of migration records kept for each VM when the retention mode is 'last'
+        """
+
+        if retention not in MigrationLog.RETENTION_MODES:
+            raise Exception(f'Invalid migration history retention "{retention}" (valid values: '
+                f'{", ".join(MigrationLog.RETENTION_MODES)})! Exiting.')
+
+        if retention == 'last' and history_length < 1:
+            raise Exception(f'The migration history length must be positive (got {history_length})! Exiting.')
+
+        self.retention = retention
+        self.history_length = history_length
+
+        # List of migration records (following the order in which migrations were performed). Only used when all
+        # records are kept, as other retention modes keep records within the index of each VM
+        self.migrations = []
+
+        # Index that maps maintenance steps to their migration records (only used when all records are kept)
+        self.steps = {}
+
+        # Index that maps VM IDs to their migration records (when only the last records of each VM are kept, older
+        # records are dropped as new ones are added, using small lists instead of bounded queues to save memory)
+        self.vms = {}
+
+        # Number of migrations, overall migration duration and longest migration of each maintenance step
+        self.step_summaries = {}
+
+        # Number of migrations and overall migration duration of each VM
+        self.vm_counts = {}
+        self.vm_durations = {}
+
+        # Number of migrations performed during the simulation
+        self.count = 0
+
+
+    def __len__(self):
+        return(self.count)
+
+
+    def __iter__(self):
+        # Records kept for each VM are gathered following the order of maintenance steps and migration start times
+        if self.retention == 'last':
+            return(iter(sorted((migration for migrations in self.vms.values() for migration in migrations),
+                key=lambda migration: (migration.maintenance_step, migration.start))))
+
+        return(iter(self.migrations))
+
+
+    def append(self, maintenance_step, vm, origin, destination, start, duration):
+        """ Adds a migration record to the log.
+
+        Parameters
+        ==========
+        maintenance_step : int
+            Maintenance step in which the migration was performed
+
+        vm : int
+            ID of the migrated VM
+
+        origin : int
+            ID of the server that hosted the VM before the migration
+
+        destination : int
+            ID of the server that hosts the VM after the migration
+
+        start : int
+            Simulation time in which the migration started
+
+        duration : int
+            Migration duration
+
+        Returns
+        =======
+        migration : Migration
+            Migration record
+        """
+
+        migration = Migration(maintenance_step=maintenance_step, vm=vm, origin=origin, destination=destination,
+            start=start, duration=duration)
+
+        # Retaining the migration record
+        if self.retention == 'all':
+            self.migrations.append(migration)
+            self.steps.setdefault(maintenance_step, []).append(migration)
+            self.vms.setdefault(vm, []).append(migration)
+
+        elif self.retention == 'last':
+            migrations = self.vms.setdefault(vm, [])
+            migrations.append(migration)
+            if len(migrations) > self.history_length:
+                del migrations[0]
+
+        # Updating aggregates (durations are added following the order of migrations to avoid floating-point
+        # discrepancies)
+        summary = self.step_summaries.get(maintenance_step)
+        if summary is None:
+            self.step_summaries[maintenance_step] = MigrationSummary(count=1, total_duration=duration,
+                longest_duration=duration)
+        else:
+            self.step_summaries[maintenance_step] = MigrationSummary(count=summary.count + 1,
+                total_duration=summary.total_duration + duration,
+                longest_duration=max(summary.longest_duration, duration))
+
+        self.vm_counts[vm] = self.vm_counts.get(vm, 0) + 1
+        self.vm_durations[vm] = self.vm_durations.get(vm, 0) + duration
+
+        self.count += 1
+
+        return(migration)
+
+
+    def by_step(self, maintenance_step):
+        """ Gathers the migrations performed in a given maintenance step that are retained by the log.
+
+        Parameters
+        ==========
+        maintenance_step : int
+            Maintenance step whose migrations we want to gather
+
+        Returns
+        =======
+        migrations : List
+            List of migration records
+        """
+
+        if self.retention == 'all':
+            return(self.steps.get(maintenance_step, []))
+
+        return([migration for migration in self if migration.maintenance_step == maintenance_step])
+
+
+    def by_vm(self, vm):
+        """ Gathers the migrations of a given VM that are retained by the log.
+
+        Parameters
+        ==========
+        vm : int
+            ID of the VM whose migrations we want to gather
+
+        Returns
+        =======
+        migrations : List
+            List of migration records (following the order in which migrations were performed)
+        """
+
+        return(self.vms.get(vm, []))
+
+
+    def step_summary(self, maintenance_step):
+        """ Gathers the number of migrations, overall migration duration and longest migration of a given
+        maintenance step (regardless of the retention mode).
+
+        Parameters
+        ==========
+        maintenance_step : int
+            Maintenance step whose migrations we want to summarize
+
+        Returns
+        =======
+        summary : MigrationSummary
+            Aggregated migrations of the maintenance step
+        """
+
+        return(self.step_summaries.get(maintenance_step, MigrationSummary(count=0, total_duration=0,
+            longest_duration=0)))
+
+
+    def vm_summary(self, vm):
+        """ Gathers the number of migrations and overall migration duration of a given VM (regardless of the
+        retention mode). The longest duration is not tracked for VMs, so it's always None.
+
+        Parameters
+        ==========
+        vm : int
+            ID of the VM whose migrations we want to summarize
+
+        Returns
+        =======
+        summary : MigrationSummary
+            Aggregated migrations of the VM
+        """
+
+        return(MigrationSummary(count=self.vm_counts.get(vm, 0), total_duration=self.vm_durations.get(vm, 0),
+            longest_duration=None))
+
+
+    def restore_summaries(self, step_summaries, vm_counts, vm_durations):
+        """ Replaces the aggregates of the log (e.g., with the ones stored by a checkpoint, which may include
+        migrations whose records were not retained).
+
+        Parameters
+        ==========
+        step_summaries : Dictionary
+            Aggregated migrations of each maintenance step
+
+        vm_counts : Dictionary
+            Number of migrations of each VM
+
+        vm_durations : Dictionary
+            Overall migration duration of each VM
+        """
+
+        self.step_summaries = {step: MigrationSummary(*summary) for step, summary in step_summaries.items()}
+        self.vm_counts = dict(vm_counts)
+        self.vm_durations = dict(vm_durations)
+        self.count = sum(summary.count for summary in self.step_summaries.values())
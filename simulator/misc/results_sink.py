@@ -0,0 +1,298 @@
+# Python Libraries
+import os
+import csv
+import json
+from abc import ABC, abstractmethod
+
+
+# Names of the metrics of each maintenance step (following the order of columns within output files)
+STEP_METRIC_NAMES = ['Dataset', 'Heuristic', 'Maintenance Step', 'Maintenance Duration', 'Consolidation Rate',
+    'Occupation Rate', 'Safeguarded Servers', 'Vulnerable Servers', 'Updated Servers',
+    'Safeguarded Virtual Machines', 'Vulnerable Virtual Machines', 'Vulnerability Surface', 'Migrations',
+    'Overall Migration Duration', 'Average Migration Duration', 'Longest Migration Duration']
+
+# Names of the overall simulation metrics (a subset of the metrics of each maintenance step)
+OVERALL_METRIC_NAMES = ['Dataset', 'Heuristic', 'Maintenance Duration', 'Consolidation Rate', 'Occupation Rate',
+    'Vulnerability Surface', 'Migrations', 'Overall Migration Duration', 'Average Migration Duration',
+    'Longest Migration Duration']
+
+
+def step_row(dataset, heuristic, metrics):
+    """ Labels the metrics of a maintenance step (as stored by 'MetricsCollector') with the names used in outputs.
+
+    Parameters
+    ==========
+    dataset : string
+        Name of the dataset used in the simulation
+
+    heuristic : string
+        Name of the maintenance strategy used in the simulation
+
+    metrics : Dictionary
+        Metrics of the maintenance step
+
+    Returns
+    =======
+    row : Dictionary
+        Metrics of the maintenance step indexed by their names
+    """
+
+    metric_values = [dataset, heuristic, metrics['maintenance_step'], metrics['simulation_step'],
+        metrics['consolidation_rate'], metrics['occupation_rate'], metrics['safeguarded_servers'],
+        metrics['vulnerable_servers'], metrics['updated_servers'], metrics['safeguarded_vms'],
+        metrics['vulnerable_vms'], metrics['vulnerability_surface'], metrics['migrations'],
+        metrics['overall_migration_duration'], metrics['average_migration_duration'],
+        metrics['longest_migration_duration']]
+
+    return(dict(zip(STEP_METRIC_NAMES, metric_values)))
+
+
+def plain_value(value):
+    """ Converts NumPy scalars (e.g., metrics computed with NumPy) into built-in Python values.
+    """
+
+    return(value.item() if hasattr(value, 'item') else value)
+
+
+class ResultsSink(ABC):
+    """ This class represents the destination of simulation results. Sinks receive the metrics of each maintenance
+    step as soon as they are collected (so that formats that support streaming don't keep results in memory) and
+    the overall simulation metrics at the end of the simulation, after which they are closed.
+
+    Rows share the columns of the metrics of each maintenance step. The overall metrics are written as the last
+    row, with the columns that don't apply to the whole simulation (e.g., 'Maintenance Step') left empty. Sinks
+    can also be created with other columns (e.g., the overall metrics of each simulation of a sweep along with
+    the parameters of each simulation), in which case rows are expected to only have the informed columns.
+    """
+
+    def __init__(self, path, columns=None):
+        """ Creates a ResultsSink object.
+
+        Parameters
+        ==========
+        path : string
+            Path of the output file
+
+        columns : List, optional
+            Names of the columns of the output file (defaults to 'STEP_METRIC_NAMES')
+        """
+
+        self.path = path
+        self.columns = STEP_METRIC_NAMES if columns is None else columns
+
+
+    @classmethod
+    def create(cls, output_file, columns=None):
+        """ Creates the sink that stores results in the format given by the extension of the output file (files
+        without a known extension are stored as Excel spreadsheets, with the 'xlsx' extension appended to them).
+
+        Parameters
+        ==========
+        output_file : string
+            Name of the output file
+
+        columns : List, optional
+            Names of the columns of the output file (defaults to 'STEP_METRIC_NAMES')
+
+        Returns
+        =======
+        sink : ResultsSink
+            Sink that stores results into the output file
+        """
+
+        extension = os.path.splitext(output_file)[1].lower()
+
+        if extension == '.csv':
+            return(CSVSink(output_file, columns))
+        elif extension in ['.jsonl', '.ndjson']:
+            return(JSONLinesSink(output_file, columns))
+        elif extension == '.parquet':
+            return(ParquetSink(output_file, columns))
+        elif extension == '.xlsx':
+            return(ExcelSink(output_file, columns))
+        else:
+            return(ExcelSink(f'{output_file}.xlsx', columns))
+
+
+    @abstractmethod
+    def write_step(self, row):
+        """ Writes the metrics of a maintenance step.
+
+        Parameters
+        ==========
+        row : Dictionary
+            Metrics of the maintenance step (see 'STEP_METRIC_NAMES', or the columns informed to the sink)
+        """
+
+
+    def write_overall(self, row):
+        """ Writes the overall simulation metrics.
+
+        Parameters
+        ==========
+        row : Dictionary
+            Overall simulation metrics (see 'OVERALL_METRIC_NAMES')
+        """
+
+        self.write_step({name: row.get(name) for name in self.columns})
+
+
+    def close(self):
+        """ Finishes writing the output file.
+        """
+
+        pass
+
+
+class CSVSink(ResultsSink):
+    """ This class writes results as CSV rows (the overall metrics row has an empty 'Maintenance Step').
+    """
+
+    def __init__(self, path, columns=None):
+        super().__init__(path, columns)
+
+        self.output_file = open(path, 'w', newline='')
+        self.writer = csv.DictWriter(self.output_file, fieldnames=self.columns)
+        self.writer.writeheader()
+
+
+    def write_step(self, row):
+        self.writer.writerow({name: plain_value(value) for name, value in row.items()})
+
+
+    def close(self):
+        self.output_file.close()
+
+
+class JSONLinesSink(ResultsSink):
+    """ This class writes results as JSON-lines records (the overall metrics record has a null 'Maintenance Step').
+    """
+
+    def __init__(self, path, columns=None):
+        super().__init__(path, columns)
+
+        self.output_file = open(path, 'w')
+
+
+    def write_step(self, row):
+        self.output_file.write(json.dumps({name: plain_value(value) for name, value in row.items()}) + '\n')
+
+
+    def close(self):
+        self.output_file.close()
+
+
+class ParquetSink(ResultsSink):
+    """ This class writes results into a Parquet file (the overall metrics row has a null 'Maintenance Step').
+    Rows are buffered and written as row groups, so results are streamed to disk during the simulation. Parquet
+    files have a fixed schema, so metrics other than the dataset, heuristic and maintenance step are stored as
+    floating-point numbers (the type of columns other than metrics is inferred from the first row). Writing
+    Parquet files requires the optional 'pyarrow' package.
+    """
+
+    # Number of rows buffered before a row group is written
+    ROW_GROUP_SIZE = 1000
+
+    def __init__(self, path, columns=None):
+        super().__init__(path, columns)
+
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise Exception('Writing Parquet files requires the "pyarrow" package (pip install pyarrow)! Exiting.')
+
+        self.pyarrow = pyarrow
+
+        # The schema and writer are created along with the first row group
+        self.schema = None
+        self.writer = None
+
+        # Rows waiting to be written
+        self.rows = []
+
+
+    def write_step(self, row):
+        self.rows.append(row)
+
+        if len(self.rows) >= ParquetSink.ROW_GROUP_SIZE:
+            self.flush()
+
+
+    def flush(self):
+        """ Writes the buffered rows as a row group.
+        """
+
+        if len(self.rows) > 0:
+            if self.writer is None:
+                self.schema = self.pyarrow.schema([(name, self.column_type(name, self.rows[0].get(name)))
+                    for name in self.columns])
+                self.writer = self.pyarrow.parquet.ParquetWriter(self.path, self.schema)
+
+            self.writer.write_table(self.pyarrow.Table.from_pylist([{name: plain_value(row.get(name))
+                for name in self.columns} for row in self.rows], schema=self.schema))
+            self.rows = []
+
+
+    def column_type(self, name, value):
+        """ Gathers the Parquet type of a column.
+
+        Parameters
+        ==========
+        name : string
+            Name of the column
+
+        value : object
+            Value of the column within the first row
+        """
+
+        if name in ['Dataset', 'Heuristic']:
+            return(self.pyarrow.string())
+        elif name == 'Maintenance Step':
+            return(self.pyarrow.int64())
+        elif name in STEP_METRIC_NAMES or value is None:
+            return(self.pyarrow.float64())
+        else:
+            return(self.pyarrow.scalar(plain_value(value)).type)
+
+
+    def close(self):
+        self.flush()
+
+        # Files without rows only have the schema of metrics
+        if self.writer is None:
+            self.schema = self.pyarrow.schema([(name, self.column_type(name, None)) for name in self.columns])
+            self.writer = self.pyarrow.parquet.ParquetWriter(self.path, self.schema)
+
+        self.writer.close()
+
+
+class ExcelSink(ResultsSink):
+    """ This class writes results into an Excel spreadsheet with two worksheets ('Overall Results' and 'Metrics
+    By Maintenance Step', which is left out when only overall metrics are written, as in sweeps). Spreadsheets
+    can't be written incrementally, so rows are kept until the sink is closed.
+    """
+
+    def __init__(self, path, columns=None):
+        super().__init__(path, columns)
+
+        self.step_rows = []
+        self.overall_rows = []
+
+
+    def write_step(self, row):
+        self.step_rows.append(row)
+
+
+    def write_overall(self, row):
+        self.overall_rows.append(row)
+
+
+    def close(self):
+        # Importing pandas (and the Excel writer) only when spreadsheets are written
+        import pandas as pd
+
+        with pd.ExcelWriter(self.path) as writer:
+            pd.DataFrame(self.overall_rows).to_excel(writer, sheet_name='Overall Results')
+            if len(self.step_rows) > 0:
+                pd.DataFrame(self.step_rows).to_excel(writer, sheet_name='Metrics By Maintenance Step')
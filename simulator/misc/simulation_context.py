@@ -0,0 +1,143 @@
+# Python Libraries
+import threading
+
+
+class Collection:
+    """ This class stores the objects of a given ObjectCollection class within a simulation context,
+    alongside the hash indexes used to find them (see 'ObjectCollection' for details on indexes).
+    """
+
+    def __init__(self, index_names, context=None):
+        """ Creates a Collection object.
+
+        Parameters
+        ==========
+        index_names : Iterable
+            Names of the indexed attributes
+
+        context : SimulationContext, optional
+            Simulation context that owns the collection
+        """
+
+        # Simulation context that owns the collection (objects reach shared references, such as the network
+        # topology and the simulation environment, through it)
+        self.context = context
+
+        # List of objects (following the order in which they were created)
+        self.instances = []
+
+        # Each index maps attribute values to dictionaries (used as ordered sets) of objects and their positions
+        self.indexes = {attribute_name: {} for attribute_name in index_names}
+
+        # Index buckets that received objects out of the instances ordering
+        self.unordered_buckets = set()
+
+
+class SimulationContext:
+    """ This class allows the creation of isolated simulation contexts. Each context owns the objects (servers,
+    VMs, network topology and simulation environment) created while it is active, and ObjectCollection queries
+    (e.g., 'Server.all()' or 'SimulationEnvironment.first()') resolve against the active context. Contexts are
+    activated with the 'with' statement, and each thread keeps its own stack of active contexts. When no context
+    is active, a process-wide default context is used (which is what the command-line interface relies on).
+
+    Usage example:
+        with SimulationContext() as context:
+            Simulator.create_environment(simulation_type='normal')
+            Simulator.load_dataset(input_file='dataset25occupation')
+            Simulator.start(maintenance_strategy='salus')
+    """
+
+    # Context used when no context is active
+    default = None
+
+    # Per-thread stack of active contexts
+    local = threading.local()
+
+    def __init__(self):
+        """ Creates a SimulationContext object.
+        """
+
+        # Collections of objects indexed by their ObjectCollection class
+        self.collections = {}
+
+        # Simulation environment
+        self.environment = None
+
+        # Network topology
+        self.topology = None
+
+
+    def __enter__(self):
+        SimulationContext.active_contexts().append(self)
+        return(self)
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        SimulationContext.active_contexts().pop()
+
+
+    @classmethod
+    def active_contexts(cls):
+        """ Returns the stack of contexts activated by the current thread.
+        """
+
+        if not hasattr(cls.local, 'contexts'):
+            cls.local.contexts = []
+
+        return(cls.local.contexts)
+
+
+    @classmethod
+    def current(cls):
+        """ Returns the active simulation context.
+
+        Returns
+        =======
+        context : SimulationContext
+            Last context activated by the current thread (or the default context if no context is active)
+        """
+
+        active_contexts = cls.active_contexts()
+        if len(active_contexts) > 0:
+            return(active_contexts[-1])
+
+        if cls.default is None:
+            cls.default = SimulationContext()
+
+        return(cls.default)
+
+
+    @classmethod
+    def reset_default(cls):
+        """ Replaces the default context with an empty one (discarding all objects created outside other contexts).
+        """
+
+        cls.default = SimulationContext()
+
+
+    def collection(self, owner):
+        """ Returns the collection of objects of a given ObjectCollection class.
+
+        Parameters
+        ==========
+        owner : class
+            ObjectCollection class that owns the collection
+
+        Returns
+        =======
+        collection : Collection
+            Collection of objects of the class within this context
+        """
+
+        if owner not in self.collections:
+            self.collections[owner] = Collection(index_names=owner._index_names, context=self)
+
+        return(self.collections[owner])
+
+
+    @property
+    def metrics(self):
+        """ Returns the object that stores the simulation metrics.
+        """
+
+        return(self.environment.metrics if self.environment is not None else None)
@@ -1,8 +1,17 @@
 # Python Libraries
-import simpy
+import warnings
 
 # General-purpose components
 from simulator.components.misc.object_collection import ObjectCollection
+from simulator.misc.metrics_collector import MetricsCollector
+from simulator.misc.migration_log import MigrationLog
+from simulator.misc.migration_engine import MigrationEngine
+from simulator.misc.checkpoint import Checkpoint
+from simulator.misc.results_sink import step_row
+from simulator.misc.event_loop import EventLoop
+from simulator.misc.fast_forward import FastForward
+from simulator.misc.simulation_context import SimulationContext
+import simulator.misc.constants as constants
 
 # Simulator components
 from simulator.components.infrastructure.server import Server
@@ -14,21 +23,34 @@ class SimulationEnvironment(ObjectCollection):
     control the whole life cycle of simulations.
     """
 
-    # Class attribute that allows the class to use ObjectCollection methods
-    instances = []
-
-    def __init__(self, simulation_type='normal'):
+    def __init__(self, simulation_type='normal', engine='simpy'):
         """ Initializes the simulation object.
+
+        Parameters
+        ==========
+        simulation_type : string, optional
+            Type of simulation ('normal', 'real_time' or 'fast_forward')
+
+        engine : string, optional
+            Discrete-event engine that runs the simulation: SimPy ('simpy') or the simulator's
+            lightweight event loop ('event_loop'), which only supports 'normal' simulations
         """
 
         # Auto increment identifier
         self.id = SimulationEnvironment.count() + 1
 
-        # Simulation type ('normal', 'real_time')
+        # Simulation type ('normal', 'real_time', 'fast_forward')
         self.type = simulation_type
 
-        # List object that can be used to store any event that occurs during the simulation
-        self.metrics = []
+        # Discrete-event engine ('simpy', 'event_loop')
+        self.engine = engine
+
+        # Object that computes and stores the metrics of each maintenance step during the simulation
+        self.metrics = MetricsCollector()
+
+        # Append-only log of the VM migrations performed during the simulation (see 'MIGRATION_HISTORY' in 'constants')
+        self.migration_log = MigrationLog(retention=constants.MIGRATION_HISTORY,
+            history_length=constants.MIGRATION_HISTORY_LENGTH)
 
         # Number of maintenance steps
         self.maintenance_step = 1
@@ -36,6 +58,9 @@ class SimulationEnvironment(ObjectCollection):
         # SimPy's simulation environment
         self.env = None
 
+        # Object that performs VM migrations on behalf of maintenance strategies
+        self.migration_engine = None
+
         # SimPy's initial time
         self.initial_time = 0
 
@@ -51,28 +76,68 @@ class SimulationEnvironment(ObjectCollection):
         # Data center maintenance strategy
         self.maintenance_strategy = None
 
+        # Columnar cluster state that backs servers and VMs (only used by the 'array' backend)
+        self.cluster_state = None
+
+        # Destination of the metrics of each maintenance step, which are written as soon as they are collected
+        self.results_sink = None
+
+        # Maintenance step after which the simulation state is stored into 'checkpoint_file' (if any)
+        self.checkpoint_step = None
+        self.checkpoint_file = None
+
 
         # Adding the new object to the list of instances of its class
-        SimulationEnvironment.instances.append(self)
+        SimulationEnvironment.register(self)
 
 
     def start(self, tasks):
         """ Starts the simulation.
         """
 
-        # Creating SimPy environment
-        if self.type == 'normal':
+        # Creating the discrete-event environment (both engines offer the same API to strategies). Fast-forward
+        # simulations don't need an engine, as strategies are executed inline with time advancing arithmetically
+        if self.type == 'fast_forward':
+            if constants.CONCURRENT_MIGRATIONS:
+                raise Exception('Fast-forward simulations don\'t support concurrent migrations! Exiting.')
+
+            self.env = FastForward(initial_time=self.initial_time)
+
+        elif self.engine == 'event_loop':
+            if self.type != 'normal':
+                raise Exception(f'The event loop engine doesn\'t support "{self.type}" simulations! Exiting.')
+
+            self.env = EventLoop(initial_time=self.initial_time)
+
+        elif self.engine != 'simpy':
+            raise Exception(f'Invalid engine "{self.engine}"! Exiting.')
+
+        elif self.type == 'normal':
+            # Importing SimPy only when it runs the simulation
+            import simpy
+
             self.env = simpy.Environment(initial_time=self.initial_time)
         elif self.type == 'real_time':
+            import simpy.rt
+
             self.env = simpy.rt.RealtimeEnvironment(initial_time=self.initial_time,
                 factor=self.factor, strict=self.strict)
 
+        # Creating the object that performs VM migrations
+        self.migration_engine = MigrationEngine(env=self.env, topology=SimulationContext.current().topology,
+            concurrent=constants.CONCURRENT_MIGRATIONS)
+
 
         # Executing the simulation
         self.env.process(self.run(tasks=tasks))
 
         self.env.run()
 
+        # Letting users know when the simulation finished before reaching the step after which the checkpoint is taken
+        if self.checkpoint_step is not None and self.checkpoint_step >= self.maintenance_step:
+            warnings.warn(f'The simulation finished at maintenance step {self.maintenance_step - 1}, so no checkpoint '
+                f'was stored after maintenance step {self.checkpoint_step}.')
+
 
     def run(self, tasks):
         """ Triggers the set of events that ocurr during the simulation.
@@ -85,40 +150,61 @@ class SimulationEnvironment(ObjectCollection):
             #########################################
             yield self.env.process(tasks())
 
+            # Waiting for migrations launched by the tasks that are still running
+            yield self.migration_engine.join()
+
             ####################################################################################
             ## Collecting simulation metrics for the current step and moving to the next step ##
             ####################################################################################
             self.collect_metrics()
             self.maintenance_step += 1
 
+            # Making sure the demand maintained by servers is consistent with the VMs they host
+            if constants.DEBUG:
+                Server.check_demand_consistency()
+
+            # Storing the simulation state so that the simulation can be resumed from the current step
+            if self.checkpoint_step == self.maintenance_step - 1:
+                self.save_checkpoint(self.checkpoint_file)
+
 
     def collect_metrics(self):
         """ Stores relevant events that occur during the simulation.
         """
 
-        # Collecting Server metrics
-        servers = []
-        for server in Server.all():
-            server_data = { 'server': server, 'occupation_rate': server.occupation_rate(),
-                'cpu_capacity': server.cpu_capacity, 'memory_capacity': server.memory_capacity,
-                'disk_capacity': server.disk_capacity, 'cpu_demand': server.cpu_demand,
-                'memory_demand': server.memory_demand, 'disk_demand': server.disk_demand,
-                'virtual_machines': server.virtual_machines, 'updated': server.updated,
-                'update_step': server.update_step }
+        metrics = self.metrics.collect(maintenance_step=self.maintenance_step, simulation_step=self.env.now,
+            servers=Server.all(), virtual_machines=VirtualMachine.all(),
+            migration_summary=self.migration_log.step_summary(self.maintenance_step), cluster_state=self.cluster_state)
+
+        if self.results_sink is not None:
+            self.results_sink.write_step(step_row(dataset=self.dataset, heuristic=self.maintenance_strategy,
+                metrics=metrics))
+
 
-            servers.append(server_data)
+    def save_checkpoint(self, path):
+        """ Stores the simulation state into a checkpoint file. Checkpoints are taken between maintenance steps,
+        when there are no migrations in progress.
 
+        Parameters
+        ==========
+        path : string
+            Path of the checkpoint file
+        """
+
+        Checkpoint.from_environment(simulation_environment=self, servers=Server.all(),
+            virtual_machines=VirtualMachine.all()).save(path)
 
-        # Collecting VirtualMachine metrics
-        virtual_machines = []
-        for vm in VirtualMachine.all():
-            vm_data = { 'cpu_demand': vm.cpu_demand, 'memory_demand': vm.memory_demand,
-            'disk_demand': vm.disk_demand, 'server_update_status': vm.server.updated,
-            'migrations': vm.migrations }
 
-            virtual_machines.append(vm_data)
+    def restore_checkpoint(self, path):
+        """ Restores the simulation state stored into a checkpoint file, so that the simulation continues from
+        the maintenance step that follows the checkpoint. Must be called after the dataset is loaded and
+        before the simulation starts.
 
+        Parameters
+        ==========
+        path : string
+            Path of the checkpoint file
+        """
 
-        # Creating the structure to accommodate simulation metrics
-        self.metrics.append({'maintenance_step': self.maintenance_step, 'simulation_step': self.env.now,
-            'servers': servers, 'virtual_machines': virtual_machines})
+        Checkpoint.load(path).restore(simulation_environment=self, servers=Server.all(),
+            virtual_machines=VirtualMachine.all())
@@ -0,0 +1,257 @@
+class StateFork:
+    """ This class represents a copy-on-write overlay of the cluster state, which allows maintenance strategies
+    to explore tentative sequences of VM migrations (e.g., for lookahead or rollout strategies) without changing
+    servers and VMs. Forks only store the entities they change (the demand, update status and hosted VMs of
+    servers, and the host of VMs), whereas the other entities are read from the parent state, so creating a
+    fork is O(1) and each tentative migration is O(changed entities) rather than a deep copy of the cluster.
+
+    Forks can be nested (see 'fork'), and each fork is either committed, which applies its changes to the parent
+    state, or discarded. Committing a fork of the live cluster state relocates VMs without performing migrations
+    (i.e., no simulation time elapses and no migration is recorded), so strategies that want to perform the
+    tentative migrations go through the migration engine with the list given by 'migrations' instead. When used
+    as a context manager, forks that were not committed are discarded on exit.
+    """
+
+    def __init__(self, parent=None):
+        """ Creates a StateFork object.
+
+        Parameters
+        ==========
+        parent : StateFork, optional
+            Fork on top of which the new fork is created (forks without a parent are created on top of the live
+            cluster state)
+        """
+
+        self.parent = parent
+
+        # Changed server attributes (indexed by server ID): demand tuple (CPU, memory, disk) and list of hosted
+        # VMs (copied from the parent state the first time the server is changed)
+        self.server_demands = {}
+        self.server_virtual_machines = {}
+
+        # Servers tentatively updated (indexed by server ID)
+        self.updated_servers = {}
+
+        # Changed VM hosts (indexed by VM ID)
+        self.hosts = {}
+
+        # Tentative migrations as (VM, origin server, destination server) tuples, following the order they were made
+        self.migrations = []
+
+        # Tells whether the fork was already committed or discarded
+        self.closed = False
+
+
+    def __enter__(self):
+        return(self)
+
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        if not self.closed:
+            self.discard()
+
+
+    def fork(self):
+        """ Creates a fork on top of this fork.
+
+        Returns
+        =======
+        fork : StateFork
+            Nested fork, whose changes are applied to this fork once committed
+        """
+
+        self.check_open()
+
+        return(StateFork(parent=self))
+
+
+    def check_open(self):
+        """ Makes sure the fork was not committed or discarded yet.
+        """
+
+        if self.closed:
+            raise Exception('The state fork was already committed or discarded! Exiting.')
+
+
+    def demand(self, server):
+        """ Gathers the demand of a server within the fork.
+
+        Returns
+        =======
+        demand : Tuple
+            CPU, memory and disk demand of the server
+        """
+
+        if server.id in self.server_demands:
+            return(self.server_demands[server.id])
+
+        if self.parent is not None:
+            return(self.parent.demand(server))
+
+        return((server.cpu_demand, server.memory_demand, server.disk_demand))
+
+
+    def updated(self, server):
+        """ Gathers the update status of a server within the fork.
+        """
+
+        if server.id in self.updated_servers:
+            return(True)
+
+        if self.parent is not None:
+            return(self.parent.updated(server))
+
+        return(server.updated)
+
+
+    def virtual_machines(self, server):
+        """ Gathers the VMs hosted by a server within the fork. The returned list must not be changed.
+        """
+
+        if server.id in self.server_virtual_machines:
+            return(self.server_virtual_machines[server.id])
+
+        if self.parent is not None:
+            return(self.parent.virtual_machines(server))
+
+        return(server.virtual_machines)
+
+
+    def host(self, vm):
+        """ Gathers the server that hosts a VM within the fork.
+        """
+
+        if vm.id in self.hosts:
+            return(self.hosts[vm.id])
+
+        if self.parent is not None:
+            return(self.parent.host(vm))
+
+        return(vm.server)
+
+
+    def has_capacity_to_host(self, server, vm):
+        """ Checks whether a server has resources to host a VM within the fork (see 'Server.has_capacity_to_host').
+        """
+
+        cpu_demand, memory_demand, disk_demand = self.demand(server)
+
+        return(cpu_demand + vm.cpu_demand <= server.cpu_capacity and
+            memory_demand + vm.memory_demand <= server.memory_capacity and
+            disk_demand + vm.disk_demand <= server.disk_capacity)
+
+
+    def occupation_rate(self, server):
+        """ Computes the occupation rate of a server within the fork (see 'Server.occupation_rate').
+        """
+
+        cpu_demand, memory_demand, disk_demand = self.demand(server)
+
+        cpu_usage_percentage = cpu_demand * 100 / server.cpu_capacity
+        memory_usage_percentage = memory_demand * 100 / server.memory_capacity
+        disk_usage_percentage = disk_demand * 100 / server.disk_capacity
+
+        return((cpu_usage_percentage + memory_usage_percentage + disk_usage_percentage) / 3)
+
+
+    def migrate(self, vm, destination_server):
+        """ Tentatively migrates a VM to a destination server.
+
+        Parameters
+        ==========
+        vm : VirtualMachine
+            VM that will be migrated
+
+        destination_server : Server
+            Server to which the VM will be migrated
+
+        Returns
+        =======
+        origin_server : Server
+            Server that hosted the VM before the migration
+        """
+
+        self.check_open()
+
+        origin_server = self.host(vm)
+
+        # Copying the list of VMs hosted by both servers before changing them
+        origin_virtual_machines = self.writable_virtual_machines(origin_server)
+        origin_virtual_machines.remove(vm)
+        self.writable_virtual_machines(destination_server).append(vm)
+
+        cpu_demand, memory_demand, disk_demand = self.demand(origin_server)
+        self.server_demands[origin_server.id] = (cpu_demand - vm.cpu_demand, memory_demand - vm.memory_demand,
+            disk_demand - vm.disk_demand)
+
+        cpu_demand, memory_demand, disk_demand = self.demand(destination_server)
+        self.server_demands[destination_server.id] = (cpu_demand + vm.cpu_demand,
+            memory_demand + vm.memory_demand, disk_demand + vm.disk_demand)
+
+        self.hosts[vm.id] = destination_server
+        self.migrations.append((vm, origin_server, destination_server))
+
+        return(origin_server)
+
+
+    def update(self, server):
+        """ Tentatively marks a server as updated (committing the fork on top of the live cluster state calls
+        'Server.update', so the server is updated in the current maintenance step).
+        """
+
+        self.check_open()
+
+        self.updated_servers[server.id] = server
+
+
+    def writable_virtual_machines(self, server):
+        """ Gathers the fork's own copy of the list of VMs hosted by a server (copying it on the first write).
+        """
+
+        if server.id not in self.server_virtual_machines:
+            self.server_virtual_machines[server.id] = list(self.virtual_machines(server))
+
+        return(self.server_virtual_machines[server.id])
+
+
+    def commit(self):
+        """ Applies the fork's changes to its parent state and closes the fork.
+
+        Returns
+        =======
+        migrations : List
+            Tentative migrations made within the fork, as (VM, origin server, destination server) tuples
+        """
+
+        self.check_open()
+
+        if self.parent is not None:
+            self.parent.check_open()
+
+            # The fork's changes replace the parent's ones, as they were computed on top of them
+            self.parent.server_demands.update(self.server_demands)
+            self.parent.updated_servers.update(self.updated_servers)
+            self.parent.server_virtual_machines.update(self.server_virtual_machines)
+            self.parent.hosts.update(self.hosts)
+            self.parent.migrations.extend(self.migrations)
+
+        else:
+            # Relocating VMs in the order they were migrated keeps servers' lists of VMs in the same order
+            for vm, origin_server, destination_server in self.migrations:
+                vm.relocate(destination_server)
+
+            for server in self.updated_servers.values():
+                server.update()
+
+        self.closed = True
+
+        return(self.migrations)
+
+
+    def discard(self):
+        """ Throws the fork's changes away and closes the fork.
+        """
+
+        self.check_open()
+
+        self.closed = True
@@ -1,24 +1,22 @@
 # Python Libraries
-import simpy
 import json
-import fnss
-import networkx as nx
-import pandas as pd
+import numpy as np
 
 # General-purpose simulator modules
 from simulator.misc.simulation_environment import SimulationEnvironment
+from simulator.misc.simulation_context import SimulationContext
+from simulator.misc.cluster_state import ClusterState, ArrayServer, ArrayVirtualMachine
+from simulator.misc.binary_dataset import BinaryDataset, BINARY_DATASET_SUFFIX
+from simulator.misc.binary_dataset import SERVER_DTYPE, VIRTUAL_MACHINE_DTYPE, table_from_records
+from simulator.misc.results_sink import ResultsSink, step_row, STEP_METRIC_NAMES, OVERALL_METRIC_NAMES
 
 # Simulator components
 from simulator.components.infrastructure.server import Server
 from simulator.components.application.virtual_machine import VirtualMachine
-from simulator.components.communication.fat_tree import FatTree
+from simulator.components.communication.topology_cache import TopologyCache, TOPOLOGY_CACHE_SUFFIX
 
-# Data center maintenance strategies
-from simulator.components.resource_management.maintenance.best_fit_like import best_fit_like
-from simulator.components.resource_management.maintenance.first_fit_like import first_fit_like
-from simulator.components.resource_management.maintenance.worst_fit_like import worst_fit_like
-from simulator.components.resource_management.maintenance.greedy_least_batch import greedy_least_batch
-from simulator.components.resource_management.maintenance.salus import salus
+# Data center maintenance strategies (imported on first use)
+from simulator.components.resource_management.maintenance.registry import get_strategy
 
 
 # Auxiliary variable that defines whether the
@@ -27,78 +25,124 @@ CSV_READY_OUTPUT = False
 
 class Simulator:
     """ This class allows the creation objects that
-    control the whole life cycle of simulations.
+    control the whole life cycle of simulations. Simulations run within the active simulation
+    context (see 'SimulationContext'), which stores the environment, topology, servers and VMs.
     """
 
-    environment = None
-
-
     @classmethod
-    def create_environment(cls, simulation_type='normal'):
+    def create_environment(cls, simulation_type='normal', engine='simpy'):
         """ Creates the simulation environment.
+
+        Parameters
+        ==========
+        simulation_type : string, optional
+            Type of simulation ('normal', 'real_time' or 'fast_forward')
+
+        engine : string, optional
+            Discrete-event engine that runs the simulation ('simpy' or 'event_loop')
         """
 
         # Creating SimPy environment
         if simulation_type == 'normal':
-            Simulator.environment = SimulationEnvironment(simulation_type='normal')
+            SimulationContext.current().environment = SimulationEnvironment(simulation_type='normal', engine=engine)
         elif simulation_type == 'real_time':
-            Simulator.environment = SimulationEnvironment(simulation_type='real_time')
+            SimulationContext.current().environment = SimulationEnvironment(simulation_type='real_time', engine=engine)
+        elif simulation_type == 'fast_forward':
+            SimulationContext.current().environment = SimulationEnvironment(simulation_type='fast_forward')
 
 
     @classmethod
-    def load_dataset(cls, input_file):
-        """ Creates simulation objects according to data from a JSON input file
+    def load_dataset(cls, input_file, backend='object'):
+        """ Creates simulation objects according to data from an input file. Datasets are read from the 'data'
+        directory either as JSON files or as memory-mapped binary datasets (when the name of the input file
+        ends with the binary dataset suffix, '.npd'). JSON datasets keep their values as they are (the binary
+        encoding is only applied to binary datasets). Topology caches stored next to datasets (see 'TopologyCache')
+        are loaded as well. Caches are only built on the fly for fast-forward simulations, which use them as their
+        topology, whereas other simulations without a stored cache query the network topology graph.
 
         Parameters
         ==========
         file : string
-            Path location of the JSON input file
+            Name of the input file (within the 'data' directory)
 
-        initial_edge_node_connection : boolean, optional
-            Informs if the input file provides information on which clients are initially connected to edge nodes
-
-        initial_placement : boolean, optional
-            Informs if the input file provides information on the services initial placement
+        backend : string, optional
+            Defines how servers and VMs store their state: either as plain objects ('object')
+            or as views over a columnar NumPy cluster state ('array')
         """
 
-        with open(f'data/{input_file}.json', 'r') as read_file:
-            data = json.load(read_file)
-            read_file.close()
+        if input_file.endswith(BINARY_DATASET_SUFFIX):
+            dataset_path = f'data/{input_file}'
+            dataset = BinaryDataset.load(dataset_path)
+            input_file = input_file[:-len(BINARY_DATASET_SUFFIX)]
+
+            server_table = dataset.servers
+            vm_table = dataset.virtual_machines
+        else:
+            dataset_path = f'data/{input_file}.json'
+            with open(dataset_path, 'r') as read_file:
+                data = json.load(read_file)
+
+            # JSON datasets are used as they are (the binary encoding is only applied by the 'convert' command),
+            # except for the array backend, whose arrays only store integers (fractional values are rejected)
+            dataset = None
+            if backend == 'array':
+                server_table = table_from_records(data['servers'], dtype=SERVER_DTYPE, table_name='servers')
+                vm_table = table_from_records(data['virtual_machines'], dtype=VIRTUAL_MACHINE_DTYPE,
+                    table_name='virtual_machines')
+            else:
+                server_table = {field: [server[field] for server in data['servers']] for field in SERVER_DTYPE.names}
+                vm_table = {field: [vm[field] for vm in data['virtual_machines']]
+                    for field in VIRTUAL_MACHINE_DTYPE.names}
 
         # Informing the simulation environment what's the dataset that will be used during the simulation
-        Simulator.environment.dataset = input_file
+        SimulationContext.current().environment.dataset = input_file
 
         ##########################
         # SIMULATION COMPONENTS ##
         ##########################
+        # Choosing the classes used to create servers and VMs according to the backend
+        if backend == 'array':
+            cluster_state = ClusterState(servers=len(server_table), virtual_machines=len(vm_table))
+            SimulationContext.current().environment.cluster_state = cluster_state
+
+            create_server = lambda **kwargs: ArrayServer(cluster_state=cluster_state, **kwargs)
+            create_vm = lambda **kwargs: ArrayVirtualMachine(cluster_state=cluster_state, **kwargs)
+
+        elif backend == 'object':
+            create_server = Server
+            create_vm = VirtualMachine
+
+        else:
+            raise Exception(f'Invalid backend "{backend}"! Exiting.')
+
+
+        # Gathering the columns of server and VM tables as lists (so that objects get built-in Python values)
+        def columns(table, fields):
+            return([table[field].tolist() if isinstance(table[field], np.ndarray) else table[field]
+                for field in fields])
+
         # Servers
-        for server_data in data['servers']:
+        for id, cpu, memory, disk, updated, patch_duration, sanity_check_duration in zip(*columns(server_table,
+            ['id', 'cpu_capacity', 'memory_capacity', 'disk_capacity', 'updated', 'patch_duration',
+            'sanity_check_duration'])):
+
             # Creating object
-            server = Server(id=None, cpu=None, memory=None, disk=None, updated=None)
+            server = create_server(id=id, cpu=cpu, memory=memory, disk=disk, updated=updated)
 
             # Defining object attributes
-            server.id = server_data['id']
-            server.cpu_capacity = server_data['cpu_capacity']
-            server.memory_capacity = server_data['memory_capacity']
-            server.disk_capacity = server_data['disk_capacity']
-            server.updated = server_data['updated']
-            server.patch_duration = server_data['patch_duration']
-            server.sanity_check_duration = server_data['sanity_check_duration']
+            server.patch_duration = patch_duration
+            server.sanity_check_duration = sanity_check_duration
 
 
         # Virtual Machines
-        for vm_data in data['virtual_machines']:
-            # Creating object
-            vm = VirtualMachine(id=None, cpu=None, memory=None, disk=None)
+        for id, cpu, memory, disk, server_id in zip(*columns(vm_table, ['id', 'cpu_demand', 'memory_demand',
+            'disk_demand', 'server'])):
 
-            # Defining object attributes
-            vm.id = vm_data['id']
-            vm.cpu_demand = vm_data['cpu_demand']
-            vm.memory_demand = vm_data['memory_demand']
-            vm.disk_demand = vm_data['disk_demand']
+            # Creating object
+            vm = create_vm(id=id, cpu=cpu, memory=memory, disk=disk)
 
             # Initial Placement
-            server = Server.find_by_id(vm_data['server'])
+            server = Server.find_by_id(server_id)
 
             server.cpu_demand += vm.cpu_demand
             server.memory_demand += vm.memory_demand
@@ -112,48 +156,152 @@ class Simulator:
         ######################
         ## Network Topology ##
         ######################
+        # Loading hop counts and bottleneck bandwidths between servers (stored next to the dataset, if available)
+        topology_cache = TopologyCache.load_stored(server_ids=columns(server_table, ['id'])[0],
+            dataset_path=dataset_path, cache_path=f'data/{input_file}{TOPOLOGY_CACHE_SUFFIX}')
+
+        # Fast-forward simulations only query bottleneck bandwidths between servers (concurrent migrations, which
+        # need paths through the network, are not supported), so they use the topology cache instead of building
+        # the network graph (which also avoids importing FNSS and NetworkX)
+        if SimulationContext.current().environment.type == 'fast_forward':
+            if topology_cache is None:
+                topology_cache = TopologyCache.from_dataset(dataset if dataset is not None else
+                    BinaryDataset.topology_from_json(data))
+
+            topology = topology_cache
+
+        elif dataset is not None:
+            topology = Simulator.build_topology(dataset=dataset, topology_cache=topology_cache)
+        else:
+            topology = Simulator.build_json_topology(links=data['network_topology'], topology_cache=topology_cache)
+
+        # Servers and VMs gather the topology and the simulation environment from the simulation context
+        SimulationContext.current().topology = topology
+
+
+    @classmethod
+    def build_topology(cls, dataset, topology_cache):
+        """ Creates the network topology graph of a dataset.
+
+        Parameters
+        ==========
+        dataset : BinaryDataset
+            Dataset with the network topology
+
+        topology_cache : TopologyCache
+            Hop counts and bottleneck bandwidths between servers (or None, in which case queries between servers
+            are answered by searching the graph)
+
+        Returns
+        =======
+        topology : FatTree
+            Network topology
+        """
+
+        # Importing the topology class (and FNSS) only when a topology is built
+        from simulator.components.communication.fat_tree import FatTree
+
         topology = FatTree()
 
-        # Creating links and nodes
-        for link in data['network_topology']:
-            
-            # Creating nodes
-            if link['nodes'][0]['type'] == 'Server':
-                node_1 = Server.find_by_id(link['nodes'][0]['id'])
-            else:
-                node_1 = link['nodes'][0]['id']
+        # Creating nodes (servers are represented by their objects, whereas switches are represented by their IDs)
+        nodes = [Server.find_by_id(node_id) if is_server else node_id
+            for is_server, node_id in zip(dataset.node_servers.tolist(), dataset.node_ids.tolist())]
 
-            # Creating node 1 if it doesn't exists yet
-            if node_1 not in topology:
-                topology.add_node(node_1)
-                for key, value in link['nodes'][0]['data'].items():
-                    topology.nodes[node_1][key] = value
+        for position, node in enumerate(nodes):
+            topology.add_node(node, **dataset.node_data(position))
 
-            if link['nodes'][1]['type'] == 'Server':
-                node_2 = Server.find_by_id(link['nodes'][1]['id'])
-            else:
-                node_2 = link['nodes'][1]['id']
+        # Creating links
+        for node_1, node_2, bandwidth in dataset.links():
+            topology.add_edge(nodes[node_1], nodes[node_2], bandwidth=bandwidth)
+
+        topology.topology_cache = topology_cache
+
+        return(topology)
+
+
+    @classmethod
+    def build_json_topology(cls, links, topology_cache):
+        """ Creates the network topology graph of a JSON dataset, using node attributes and bandwidths as they are.
+
+        Parameters
+        ==========
+        links : List
+            Links of the JSON dataset ('network_topology')
+
+        topology_cache : TopologyCache
+            Hop counts and bottleneck bandwidths between servers (or None, in which case queries between servers
+            are answered by searching the graph)
+
+        Returns
+        =======
+        topology : FatTree
+            Network topology
+        """
 
-            # Creating node 2 if it doesn't exists yet
-            if node_2 not in topology:
-                topology.add_node(node_2)
-                for key, value in link['nodes'][1]['data'].items():
-                    topology.nodes[node_2][key] = value
+        # Importing the topology class (and FNSS) only when a topology is built
+        from simulator.components.communication.fat_tree import FatTree
 
+        topology = FatTree()
+
+        # Creating links and nodes
+        for link in links:
+            link_nodes = []
+
+            for node_data in link['nodes']:
+                if node_data['type'] == 'Server':
+                    node = Server.find_by_id(node_data['id'])
+                else:
+                    node = node_data['id']
+
+                # Creating the node if it doesn't exist yet
+                if node not in topology:
+                    topology.add_node(node)
+                    for key, value in node_data['data'].items():
+                        topology.nodes[node][key] = value
+
+                link_nodes.append(node)
 
             # Creating link if it wasn't created yet
+            node_1, node_2 = link_nodes
             if not topology.has_edge(node_1, node_2):
                 topology.add_edge(node_1, node_2)
 
                 # Adding attributes to the link
                 topology[node_1][node_2]['bandwidth'] = link['bandwidth']
 
+        topology.topology_cache = topology_cache
+
+        return(topology)
+
+
+    @classmethod
+    def schedule_checkpoint(cls, maintenance_step, output_file):
+        """ Tells the simulation environment to store its state after a given maintenance step.
+
+        Parameters
+        ==========
+        maintenance_step : int
+            Maintenance step after which the simulation state is stored
+
+        output_file : string
+            Path of the checkpoint file
+        """
 
-        # Assigning 'topology' and 'simulation_environment' attributes to created objects
-        objects = Server.all() + VirtualMachine.all()
-        for obj in objects:
-            obj.topology = topology
-            obj.simulation_environment = Simulator.environment
+        SimulationContext.current().environment.checkpoint_step = maintenance_step
+        SimulationContext.current().environment.checkpoint_file = output_file
+
+
+    @classmethod
+    def resume(cls, input_file):
+        """ Restores the simulation state stored into a checkpoint file (after the dataset is loaded).
+
+        Parameters
+        ==========
+        input_file : string
+            Path of the checkpoint file
+        """
+
+        SimulationContext.current().environment.restore_checkpoint(input_file)
 
 
     @classmethod
@@ -162,10 +310,10 @@ class Simulator:
         """
 
         # Informing the simulation environment what's the maintenance strategy will be executed
-        Simulator.environment.maintenance_strategy = kwargs['maintenance_strategy']
+        SimulationContext.current().environment.maintenance_strategy = kwargs['maintenance_strategy']
 
         # Starting the simulation
-        Simulator.environment.start(tasks = lambda: Simulator.simulation_routine(**kwargs))
+        SimulationContext.current().environment.start(tasks = lambda: Simulator.simulation_routine(**kwargs))
 
 
     @classmethod
@@ -177,7 +325,8 @@ class Simulator:
         ## Data Center Maintenance ##
         #############################
         if 'maintenance_strategy' in kwargs:
-            yield Simulator.environment.env.process(Simulator.perform_datacenter_maintenance(kwargs['maintenance_strategy']))
+            maintenance = Simulator.perform_datacenter_maintenance(kwargs['maintenance_strategy'])
+            yield SimulationContext.current().environment.env.process(maintenance)
 
 
     @classmethod
@@ -190,239 +339,193 @@ class Simulator:
             Name of a valid data center maintenance strategy
         """
 
-        if maintenance_strategy == 'best_fit_like':
-            yield Simulator.environment.env.process(best_fit_like())
-        elif maintenance_strategy == 'first_fit_like':
-            yield Simulator.environment.env.process(first_fit_like())
-        elif maintenance_strategy == 'worst_fit_like':
-            yield Simulator.environment.env.process(worst_fit_like())
-        elif maintenance_strategy == 'greedy_least_batch':
-            yield Simulator.environment.env.process(greedy_least_batch())
-        elif maintenance_strategy == 'consolidation_aware':
-            yield Simulator.environment.env.process(consolidation_aware())
-        elif maintenance_strategy == 'hermes':
-            yield Simulator.environment.env.process(hermes())
-        elif maintenance_strategy == 'salus':
-            yield Simulator.environment.env.process(salus())
-        else:
-            raise Exception('Invalid data center maintenance strategy! Exiting.')
+        yield SimulationContext.current().environment.env.process(get_strategy(maintenance_strategy)())
 
 
     @classmethod
-    def show_results(cls, output_file):
-        """ Shows simulation results.
-        """
-
-        ################################
-        ## Parsing simulation metrics ##
-        ################################
+    def metrics_by_step(cls):
+        """ Gathers the metrics of each maintenance step.
 
-        metrics_by_step = []
-        overall_metrics = []
+        Returns
+        =======
+        metrics_by_step : List
+            List of dictionaries with the metrics of each maintenance step
+        """
 
-        dataset = Simulator.environment.dataset
-        heuristic = Simulator.environment.maintenance_strategy
+        dataset = SimulationContext.current().environment.dataset
+        heuristic = SimulationContext.current().environment.maintenance_strategy
 
+        metrics_by_step = [step_row(dataset=dataset, heuristic=heuristic, metrics=metrics)
+            for metrics in SimulationContext.current().environment.metrics.rows()]
 
-        #############################################################
-        ## ITERATING OVER THE METRICS OF EACH SIMULATION TIME STEP ##
-        #############################################################
-        for metrics in Simulator.environment.metrics:
-            # Server-related metrics
-            consolidation_rate = 0
-            occupation_rate = 0
-            safeguarded_servers = 0
-            vulnerable_servers = 0
-            updated_servers = 0
-
-            for server in metrics['servers']:
-                # Security-related metrics
-                if server['updated']:
-                    safeguarded_servers += 1
-                else:
-                    vulnerable_servers += 1
+        return(metrics_by_step)
 
-                if server['update_step'] == metrics['maintenance_step']:
-                    updated_servers += 1
 
+    @classmethod
+    def overall_metrics(cls, metrics_by_step):
+        """ Computes the overall simulation metrics.
 
-                # Capacity-related metrics
-                occupation_rate += server['occupation_rate']
-                if len(server['virtual_machines']) == 0:
-                    consolidation_rate += 1
+        Parameters
+        ==========
+        metrics_by_step : List
+            List of dictionaries with the metrics of each maintenance step
 
+        Returns
+        =======
+        overall_metrics : Dictionary
+            Overall simulation metrics
+        """
 
-            # Virtual-Machine-related metrics
-            safeguarded_vms = 0
-            vulnerable_vms = 0
-            migrations = 0
-            migrations_duration = []
-            overall_migration_duration = 0
-            average_migration_duration = 0
-            longest_migration_duration = 0
+        def values(metric):
+            return([metrics[metric] for metrics in metrics_by_step])
 
-            for vm in metrics['virtual_machines']:
-                # Security-related metrics
-                if vm['server_update_status']:
-                    safeguarded_vms += 1
-                else:
-                    vulnerable_vms += 1
+        # Means are computed with NumPy's pairwise summation (as pandas does), so their last digits don't change
+        def mean(metric):
+            return(float(np.array(values(metric), dtype=np.float64).sum() / len(metrics_by_step)))
 
-                # Migration-related metrics
-                for migration in vm['migrations']:
-                    if migration['maintenance_step'] == metrics['maintenance_step']:
-                        migrations_duration.append(migration['duration'])
+        # Data center's resource usage
+        consolidation_rate = mean('Consolidation Rate')
+        occupation_rate = mean('Occupation Rate')
 
+        # Data center's security
+        vulnerability_surface = sum(values('Vulnerability Surface'))
 
-            # Post-processing security metrics
-            vulnerability_surface = metrics['simulation_step'] * vulnerable_servers
+        # Virtual machine migrations
+        migrations = sum(values('Migrations'))
+        overall_migration_duration = sum(values('Overall Migration Duration'))
+        average_migration_duration = mean('Average Migration Duration')
+        longest_migration_duration = max(values('Longest Migration Duration'))
 
-            # Post-processing collected EdgeNode metrics
-            occupation_rate /= len(metrics['servers'])
-            consolidation_rate = consolidation_rate * 100 / len(metrics['servers'])
 
+        # Consolidating overall metrics
+        metric_values = [SimulationContext.current().environment.dataset,
+            SimulationContext.current().environment.maintenance_strategy,
+            metrics_by_step[-1]['Maintenance Duration'], consolidation_rate, occupation_rate,
+            vulnerability_surface, migrations, overall_migration_duration, average_migration_duration,
+            longest_migration_duration]
 
-            # Post-processing collected Service metrics
-            migrations = len(migrations_duration)
-            if len(migrations_duration) > 0:
-                overall_migration_duration = sum(migrations_duration)
-                average_migration_duration = sum(migrations_duration) / len(migrations_duration)
-                longest_migration_duration = max(migrations_duration)
+        return(dict(zip(OVERALL_METRIC_NAMES, metric_values)))
 
-            else:
-                average_migration_duration = 0
-                longest_migration_duration = 0
 
+    @classmethod
+    def open_results_sink(cls, output_file):
+        """ Creates the sink that stores the simulation results (see 'ResultsSink'), so that the metrics of each
+        maintenance step are written as soon as they are collected. Metrics collected before the sink is opened
+        (e.g., metrics restored from a checkpoint) are written right away.
 
-            # Printing Results
-            print(f'\n=== MAINTENANCE STEP {metrics["maintenance_step"]}. SIMULATION STEP {metrics["simulation_step"]} ===')
+        Parameters
+        ==========
+        output_file : string
+            Name of the output file (its extension defines the output format)
+        """
 
-            print(f'Maintenance Duration: {metrics["simulation_step"]}')
-            print(f'Occupation Rate: {occupation_rate}')
-            print(f'Safeguarded Servers: {safeguarded_servers}')
-            print(f'Vulnerable Servers: {vulnerable_servers}')
-            print(f'Updated Servers: {updated_servers}')
-            print(f'Vulnerability Surface: {vulnerability_surface}')
+        results_sink = ResultsSink.create(output_file)
 
-            print(f'Safeguarded Virtual Machines: {safeguarded_vms}')
-            print(f'Vulnerable Virtual Machines: {vulnerable_vms}')
-            print(f'Migrations: {migrations}')
-            print(f'    Overall Migration Duration: {overall_migration_duration}')
-            print(f'    Average Migration Duration: {average_migration_duration}')
-            print(f'    Longest Migration Duration: {longest_migration_duration}')
+        for row in Simulator.metrics_by_step():
+            results_sink.write_step(row)
 
+        SimulationContext.current().environment.results_sink = results_sink
 
-            # Consolidating step metrics
-            metric_names = ['Dataset', 'Heuristic', 'Maintenance Step', 'Maintenance Duration',
-            'Consolidation Rate', 'Occupation Rate', 'Safeguarded Servers', 'Vulnerable Servers',
-            'Updated Servers', 'Safeguarded Virtual Machines', 'Vulnerable Virtual Machines',
-            'Vulnerability Surface', 'Migrations', 'Overall Migration Duration',
-            'Average Migration Duration', 'Longest Migration Duration']
 
-            metric_values = [dataset, heuristic, metrics['maintenance_step'],
-                metrics['simulation_step'], consolidation_rate, occupation_rate,
-                safeguarded_servers, vulnerable_servers, updated_servers, safeguarded_vms,
-                vulnerable_vms, vulnerability_surface, migrations, overall_migration_duration,
-                average_migration_duration, longest_migration_duration]
+    @classmethod
+    def show_results(cls, output_file):
+        """ Shows simulation results.
+        """
 
-            # Storing step metrics
-            step_metrics = dict(zip(metric_names, metric_values))
+        ################################
+        ## Parsing simulation metrics ##
+        ################################
 
-            metrics_by_step.append(step_metrics)
+        dataset = SimulationContext.current().environment.dataset
+        heuristic = SimulationContext.current().environment.maintenance_strategy
 
+        metrics_by_step = Simulator.metrics_by_step()
 
-        ###############################
-        ## COMPUTING OVERALL METRICS ##
-        ###############################
-        metrics_by_step = pd.DataFrame(metrics_by_step)
 
+        #############################################################
+        ## ITERATING OVER THE METRICS OF EACH SIMULATION TIME STEP ##
+        #############################################################
+        for metrics in metrics_by_step:
+            # Printing Results
+            print(f'\n=== MAINTENANCE STEP {metrics["Maintenance Step"]}. '
+                f'SIMULATION STEP {metrics["Maintenance Duration"]} ===')
 
-        # Data center's resource usage
-        consolidation_rate = metrics_by_step['Consolidation Rate'].mean()
-        occupation_rate = metrics_by_step['Occupation Rate'].mean()
+            print(f'Maintenance Duration: {metrics["Maintenance Duration"]}')
+            print(f'Occupation Rate: {metrics["Occupation Rate"]}')
+            print(f'Safeguarded Servers: {metrics["Safeguarded Servers"]}')
+            print(f'Vulnerable Servers: {metrics["Vulnerable Servers"]}')
+            print(f'Updated Servers: {metrics["Updated Servers"]}')
+            print(f'Vulnerability Surface: {metrics["Vulnerability Surface"]}')
 
-        # Data center's security
-        vulnerability_surface = metrics_by_step['Vulnerability Surface'].sum()
+            print(f'Safeguarded Virtual Machines: {metrics["Safeguarded Virtual Machines"]}')
+            print(f'Vulnerable Virtual Machines: {metrics["Vulnerable Virtual Machines"]}')
+            print(f'Migrations: {metrics["Migrations"]}')
+            print(f'    Overall Migration Duration: {metrics["Overall Migration Duration"]}')
+            print(f'    Average Migration Duration: {metrics["Average Migration Duration"]}')
+            print(f'    Longest Migration Duration: {metrics["Longest Migration Duration"]}')
 
-        # Virtual machine migrations
-        migrations = metrics_by_step['Migrations'].sum()
-        overall_migration_duration = metrics_by_step['Overall Migration Duration'].sum()
-        average_migration_duration = metrics_by_step['Average Migration Duration'].mean()
-        longest_migration_duration = metrics_by_step['Longest Migration Duration'].max()
 
+        ###############################
+        ## COMPUTING OVERALL METRICS ##
+        ###############################
+        overall_metrics = Simulator.overall_metrics(metrics_by_step)
 
 
         print('\n\n=======================\n=== OVERALL RESULTS ===\n=======================')
         print(f'Dataset: {dataset}')
         print(f'Strategy: {heuristic}\n')
-        print(f'Maintenance Duration: {metrics_by_step["Maintenance Duration"].iloc[-1]}')
-        print(f'Consolidation Rate: {consolidation_rate}')
-        print(f'Occupation Rate: {occupation_rate}')
-        print(f'Vulnerability Surface: {vulnerability_surface}')
+        print(f'Maintenance Duration: {overall_metrics["Maintenance Duration"]}')
+        print(f'Consolidation Rate: {overall_metrics["Consolidation Rate"]}')
+        print(f'Occupation Rate: {overall_metrics["Occupation Rate"]}')
+        print(f'Vulnerability Surface: {overall_metrics["Vulnerability Surface"]}')
 
-        print(f'Migrations: {migrations}')
-        print(f'    Overall Migration Duration: {overall_migration_duration}')
-        print(f'    Average Migration Duration: {average_migration_duration}')
-        print(f'    Longest Migration Duration: {longest_migration_duration}')
+        print(f'Migrations: {overall_metrics["Migrations"]}')
+        print(f'    Overall Migration Duration: {overall_metrics["Overall Migration Duration"]}')
+        print(f'    Average Migration Duration: {overall_metrics["Average Migration Duration"]}')
+        print(f'    Longest Migration Duration: {overall_metrics["Longest Migration Duration"]}')
 
 
-        # Consolidating overall metrics
-        metric_names = ['Dataset', 'Heuristic', 'Maintenance Duration', 'Consolidation Rate',
-            'Occupation Rate', 'Vulnerability Surface', 'Migrations', 'Overall Migration Duration',
-            'Average Migration Duration', 'Longest Migration Duration']
-
-        metric_values = [dataset, heuristic, metrics_by_step['Maintenance Duration'].iloc[-1],
-            consolidation_rate, occupation_rate, vulnerability_surface, migrations,
-            overall_migration_duration, average_migration_duration, longest_migration_duration]
-
-        
-        # Storing overall metrics
-        overall_metrics = [dict(zip(metric_names, metric_values))]
-        overall_metrics = pd.DataFrame(overall_metrics)
-
-
-        # Creating spreadsheet with the results
-        writer = pd.ExcelWriter(f'{output_file}.xlsx')
-        overall_metrics.to_excel(writer, 'Overall Results')
-        metrics_by_step.to_excel(writer, 'Metrics By Maintenance Step')
-        writer.save()
+        # Storing the results (metrics of each step are written by the results sink as they are collected, so
+        # the sink is only opened here when it wasn't opened before the simulation started)
+        if output_file:
+            if SimulationContext.current().environment.results_sink is None:
+                Simulator.open_results_sink(output_file)
 
+            SimulationContext.current().environment.results_sink.write_overall(overall_metrics)
+            SimulationContext.current().environment.results_sink.close()
+            SimulationContext.current().environment.results_sink = None
 
         if CSV_READY_OUTPUT:
             # Printing CSV-ready results
             print('\n\n=========================\n=== CSV-READY RESULTS ===\n=========================')
             print('\n== Overall Results ==')
-            headers = [header for header in overall_metrics.head()]
+            headers = list(overall_metrics)
             for column in headers:
                 print(column, end='\t')
             print('\n')
 
-            for index, row in overall_metrics.iterrows():
+            for row in [overall_metrics]:
                 for column in headers:
-                    if type(row[column]) == float:
-                        row[column] = round(row[column], 4)
-
-                    print(f'{row[column]}', end='\t')
+                    value = round(row[column], 4) if type(row[column]) == float else row[column]
+                    print(f'{value}', end='\t')
                 print()
 
             print('\n== Metrics By Step ==')
-            headers = [header for header in metrics_by_step.head()]
+            headers = STEP_METRIC_NAMES
             for column in headers:
                 print(column, end='\t')
             print('\n')
 
-            for index, row in metrics_by_step.iterrows():
+            for row in metrics_by_step:
                 for column in headers:
-                    if type(row[column]) == float:
-                        row[column] = round(row[column], 4)
-
-                    print(f'{row[column]}', end='\t')
+                    value = round(row[column], 4) if type(row[column]) == float else row[column]
+                    print(f'{value}', end='\t')
                 print()
 
             print('\n== Safeguarded Servers By Step ==')
             safeguarded_servers_by_step = []
             maintenance_time_by_step = []
-            for index, row in metrics_by_step.iterrows():
+            for row in metrics_by_step:
                 maintenance_time_by_step.append(row['Maintenance Duration'])
                 safeguarded_servers_by_step.append(row['Safeguarded Servers'])
 
@@ -0,0 +1,199 @@
+# Python Libraries
+import ast
+import random
+import itertools
+import multiprocessing
+
+# General-purpose simulator modules
+from simulator.simulator import Simulator
+from simulator.misc.simulation_context import SimulationContext
+from simulator.misc.results_sink import ResultsSink
+import simulator.misc.constants as constants
+from simulator.misc.constants import SEED_VALUE
+from simulator.components.resource_management.maintenance.registry import check_strategies
+
+
+def parse_constant_overrides(overrides):
+    """ Parses constant overrides informed as 'NAME=VALUE_1,VALUE_2,...' strings.
+
+    Parameters
+    ==========
+    overrides : List
+        List of strings with the name of a constant and the values it must assume during the sweep
+
+    Returns
+    =======
+    constant_values : Dictionary
+        Dictionary that maps each constant name to the list of values it must assume
+    """
+
+    constant_values = {}
+
+    for override in overrides:
+        name, _, values = override.partition('=')
+
+        if not hasattr(constants, name):
+            raise Exception(f'Invalid constant "{name}"! Exiting.')
+
+        constant_values[name] = [parse_value(value) for value in values.split(',')]
+
+    return(constant_values)
+
+
+def parse_value(value):
+    """ Converts a value informed through the command line to a Python object (falling back to a string).
+    """
+
+    try:
+        return(ast.literal_eval(value))
+    except (ValueError, SyntaxError):
+        return(value)
+
+
+def create_tasks(simulation_type, datasets, maintenance_strategies, constant_values, seeds, backend='object',
+    engine='simpy'):
+    """ Creates the list of simulations of a parameter sweep (i.e., the Cartesian product of
+    datasets, maintenance strategies, constant values and seeds).
+
+    Returns
+    =======
+    tasks : List
+        List of dictionaries describing each simulation of the sweep
+    """
+
+    tasks = []
+
+    constant_names = list(constant_values)
+    for values in itertools.product(datasets, maintenance_strategies, *constant_values.values(), seeds):
+        dataset, maintenance_strategy, *overrides, seed = values
+
+        tasks.append({'simulation_type': simulation_type, 'dataset': dataset,
+            'maintenance_strategy': maintenance_strategy, 'backend': backend, 'engine': engine, 'seed': seed,
+            'constants': dict(zip(constant_names, overrides))})
+
+    return(tasks)
+
+
+def run_task(task):
+    """ Runs a single simulation of a parameter sweep. Each simulation runs within its own simulation context,
+    so servers, VMs and the simulation environment don't leak from one simulation to another, and constant
+    overrides are reverted once the simulation finishes.
+
+    Parameters
+    ==========
+    task : Dictionary
+        Description of the simulation (dataset, maintenance strategy, constant overrides and seed)
+
+    Returns
+    =======
+    overall_metrics : Dictionary
+        Overall metrics of the simulation
+    """
+
+    original_values = {name: getattr(constants, name) for name in task['constants']}
+
+    try:
+        for name, value in task['constants'].items():
+            setattr(constants, name, value)
+
+        # Defining a seed value to enable reproducibility
+        random.seed(task['seed'])
+
+        with SimulationContext():
+            Simulator.create_environment(simulation_type=task['simulation_type'], engine=task['engine'])
+            Simulator.load_dataset(input_file=task['dataset'], backend=task['backend'])
+            Simulator.start(maintenance_strategy=task['maintenance_strategy'])
+
+            overall_metrics = Simulator.overall_metrics(Simulator.metrics_by_step())
+
+    finally:
+        for name, value in original_values.items():
+            setattr(constants, name, value)
+
+    # Adding the sweep parameters to the overall metrics
+    results = {'Dataset': overall_metrics.pop('Dataset'), 'Heuristic': overall_metrics.pop('Heuristic'),
+        'Seed': task['seed']}
+    results.update(task['constants'])
+    results.update(overall_metrics)
+
+    return(results)
+
+
+def run_sweep(simulation_type, datasets, maintenance_strategies, constant_values=None, seeds=None, processes=None,
+    backend='object', engine='simpy'):
+    """ Runs a parameter sweep, executing each simulation in a process pool.
+
+    Parameters
+    ==========
+    simulation_type : string
+        Type of simulation
+
+    datasets : List
+        Names of the datasets used by the sweep
+
+    maintenance_strategies : List
+        Names of the maintenance strategies used by the sweep
+
+    constant_values : Dictionary, optional
+        Dictionary that maps constant names to the list of values they must assume
+
+    seeds : List, optional
+        Seed values used by the sweep (each seed is used by a different simulation)
+
+    processes : int, optional
+        Number of worker processes (defaults to the number of CPUs)
+
+    backend : string, optional
+        Storage used by servers and VMs
+
+    engine : string, optional
+        Discrete-event engine that runs the simulations
+
+    Returns
+    =======
+    results : List
+        List of dictionaries with the overall metrics of each simulation (following the order of tasks)
+    """
+
+    # Making sure all maintenance strategies exist before spawning worker processes
+    check_strategies(maintenance_strategies)
+
+    tasks = create_tasks(simulation_type=simulation_type, datasets=datasets,
+        maintenance_strategies=maintenance_strategies, constant_values=constant_values or {},
+        seeds=seeds or [SEED_VALUE], backend=backend, engine=engine)
+
+    with multiprocessing.Pool(processes=processes) as pool:
+        results = pool.map(run_task, tasks, chunksize=1)
+
+    return(results)
+
+
+def show_sweep_results(results, output_file):
+    """ Shows the overall metrics of each simulation of a sweep and stores them into a single output file (whose
+    extension defines the output format, see 'ResultsSink').
+
+    Parameters
+    ==========
+    results : List
+        List of dictionaries with the overall metrics of each simulation
+
+    output_file : string
+        Name of the output file
+    """
+
+    print('\n=====================\n=== SWEEP RESULTS ===\n=====================')
+    # Printing results as a table whose columns are as wide as their widest value
+    columns = list(results[0].keys()) if results else []
+    cells = [columns] + [[str(row[column]) for column in columns] for row in results]
+    widths = [max(len(line[index]) for line in cells) for index in range(len(columns))]
+
+    for line in cells:
+        print(' '.join(cell.rjust(width) for cell, width in zip(line, widths)))
+
+    if output_file:
+        results_sink = ResultsSink.create(output_file, columns=list(results[0].keys()) if results else None)
+
+        for row in results:
+            results_sink.write_overall(row)
+
+        results_sink.close()
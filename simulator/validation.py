@@ -0,0 +1,265 @@
+# Python Libraries
+import os
+import glob
+import time
+import random
+import itertools
+
+# General-purpose simulator modules
+from simulator.simulator import Simulator
+from simulator.misc.simulation_context import SimulationContext
+from simulator.misc.state_fork import StateFork
+from simulator.misc.constants import SEED_VALUE
+from simulator.components.infrastructure.server import Server
+from simulator.components.application.virtual_machine import VirtualMachine
+from simulator.components.resource_management.maintenance.registry import available_strategies, check_strategies
+
+
+def bundled_datasets():
+    """ Gathers the names of the JSON datasets within the 'data' directory.
+    """
+
+    return(sorted(os.path.splitext(os.path.basename(path))[0] for path in glob.glob('data/*.json')))
+
+
+def run_simulation(simulation_type, dataset, maintenance_strategy, engine='simpy'):
+    """ Runs a simulation within its own simulation context.
+
+    Returns
+    =======
+    metrics_by_step : List
+        List of dictionaries with the metrics of each maintenance step
+    """
+
+    # Defining a seed value to enable reproducibility
+    random.seed(SEED_VALUE)
+
+    with SimulationContext():
+        Simulator.create_environment(simulation_type=simulation_type, engine=engine)
+        Simulator.load_dataset(input_file=dataset)
+        Simulator.start(maintenance_strategy=maintenance_strategy)
+
+        return(Simulator.metrics_by_step())
+
+
+def validate_fast_forward(datasets=None, maintenance_strategies=None, engine='simpy'):
+    """ Checks whether fast-forward simulations give the same metrics as simulations driven by an event engine.
+
+    Parameters
+    ==========
+    datasets : List, optional
+        Names of the datasets used in the validation (defaults to all JSON datasets within the 'data' directory)
+
+    maintenance_strategies : List, optional
+        Names of the maintenance strategies used in the validation (defaults to all available strategies)
+
+    engine : string, optional
+        Discrete-event engine used as reference
+
+    Returns
+    =======
+    mismatches : List
+        List of (dataset, maintenance strategy) pairs whose metrics differ
+    """
+
+    maintenance_strategies = maintenance_strategies or available_strategies()
+    check_strategies(maintenance_strategies)
+
+    mismatches = []
+
+    for dataset, maintenance_strategy in itertools.product(datasets or bundled_datasets(), maintenance_strategies):
+
+        start = time.perf_counter()
+        reference_metrics = run_simulation(simulation_type='normal', dataset=dataset,
+            maintenance_strategy=maintenance_strategy, engine=engine)
+        reference_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        fast_forward_metrics = run_simulation(simulation_type='fast_forward', dataset=dataset,
+            maintenance_strategy=maintenance_strategy)
+        fast_forward_time = time.perf_counter() - start
+
+        if fast_forward_metrics != reference_metrics:
+            mismatches.append((dataset, maintenance_strategy))
+
+        print(f'{dataset} / {maintenance_strategy}: {"OK" if fast_forward_metrics == reference_metrics else "MISMATCH"}'
+            f' ({engine}: {reference_time:.3f}s, fast_forward: {fast_forward_time:.3f}s)')
+
+    return(mismatches)
+
+
+def cluster_snapshot(state):
+    """ Gathers the demand, update status and hosted VMs of each server and the host of each VM as seen by a
+    state fork (an empty fork reads the live cluster state).
+
+    Parameters
+    ==========
+    state : StateFork
+        Fork whose view of the cluster is gathered
+
+    Returns
+    =======
+    snapshot : Tuple
+        Dictionary with the state of each server (indexed by server ID) and dictionary with the host of each VM
+    """
+
+    servers = {server.id: (tuple(state.demand(server)), bool(state.updated(server)),
+        [vm.id for vm in state.virtual_machines(server)]) for server in Server.all()}
+    hosts = {vm.id: state.host(vm).id for vm in VirtualMachine.all()}
+
+    return((servers, hosts))
+
+
+def explore(fork, snapshot, rng, migration_count):
+    """ Makes random tentative migrations and server updates within a fork, applying them to a copy of the
+    snapshot of the fork's parent state as well (following the way 'VirtualMachine.relocate' changes servers).
+
+    Parameters
+    ==========
+    fork : StateFork
+        Fork in which the tentative changes are made
+
+    snapshot : Tuple
+        Snapshot of the fork's parent state (see 'cluster_snapshot')
+
+    rng : random.Random
+        Random number generator used to choose VMs, destination servers and updated servers
+
+    migration_count : int
+        Number of tentative migrations
+
+    Returns
+    =======
+    expected_snapshot : Tuple
+        Snapshot that the fork must match
+    """
+
+    servers = {server_id: (demand, updated, list(vms)) for server_id, (demand, updated, vms) in snapshot[0].items()}
+    hosts = dict(snapshot[1])
+
+    candidate_servers = list(Server.all())
+    virtual_machines = list(VirtualMachine.all())
+
+    for _ in range(migration_count):
+        vm = rng.choice(virtual_machines)
+        origin = fork.host(vm)
+
+        destinations = [server for server in candidate_servers
+            if server != origin and fork.has_capacity_to_host(server=server, vm=vm)]
+        if len(destinations) == 0:
+            continue
+
+        destination = rng.choice(destinations)
+        fork.migrate(vm=vm, destination_server=destination)
+
+        vm_demand = (vm.cpu_demand, vm.memory_demand, vm.disk_demand)
+
+        demand, updated, vms = servers[origin.id]
+        vms.remove(vm.id)
+        servers[origin.id] = (tuple(a - b for a, b in zip(demand, vm_demand)), updated, vms)
+
+        demand, updated, vms = servers[destination.id]
+        vms.append(vm.id)
+        servers[destination.id] = (tuple(a + b for a, b in zip(demand, vm_demand)), updated, vms)
+
+        hosts[vm.id] = destination.id
+
+    for server in rng.sample(candidate_servers, k=min(3, len(candidate_servers))):
+        fork.update(server)
+
+        demand, _, vms = servers[server.id]
+        servers[server.id] = (demand, True, vms)
+
+    return((servers, hosts))
+
+
+def check_state_fork(rng, migration_count=50):
+    """ Checks state forks against the live cluster state of the current simulation context. Forks are discarded
+    and committed (both on top of the live state and on top of other forks), and each view of the cluster is
+    compared against the tentative changes applied to snapshots of the cluster.
+
+    Parameters
+    ==========
+    rng : random.Random
+        Random number generator used to choose the tentative changes
+
+    migration_count : int, optional
+        Number of tentative migrations made within each fork
+
+    Returns
+    =======
+    failed_checks : List
+        Names of the checks whose views of the cluster differ from the expected ones
+    """
+
+    failed_checks = []
+
+    def check(name, state, expected_snapshot):
+        if cluster_snapshot(state) != expected_snapshot:
+            failed_checks.append(name)
+
+    live_snapshot = cluster_snapshot(StateFork())
+
+    # Discarding a fork of the live state
+    with StateFork() as fork:
+        expected_snapshot = explore(fork=fork, snapshot=live_snapshot, rng=rng, migration_count=migration_count)
+        check('fork view', fork, expected_snapshot)
+        check('live state untouched by fork', StateFork(), live_snapshot)
+
+    check('discarded fork', StateFork(), live_snapshot)
+
+    # Discarding and committing nested forks, then committing their parent into the live state
+    fork = StateFork()
+    expected_snapshot = explore(fork=fork, snapshot=live_snapshot, rng=rng, migration_count=migration_count)
+
+    nested_fork = fork.fork()
+    explore(fork=nested_fork, snapshot=expected_snapshot, rng=rng, migration_count=migration_count)
+    nested_fork.discard()
+    check('discarded nested fork', fork, expected_snapshot)
+
+    nested_fork = fork.fork()
+    expected_snapshot = explore(fork=nested_fork, snapshot=expected_snapshot, rng=rng,
+        migration_count=migration_count)
+    nested_fork.commit()
+    check('committed nested fork', fork, expected_snapshot)
+    check('live state untouched by nested forks', StateFork(), live_snapshot)
+
+    fork.commit()
+    check('committed fork', StateFork(), expected_snapshot)
+
+    return(failed_checks)
+
+
+def validate_state_fork(datasets=None, backends=None):
+    """ Checks whether state forks give the same cluster state as changing servers and VMs directly (see
+    'check_state_fork'), using each storage backend of servers and VMs.
+
+    Parameters
+    ==========
+    datasets : List, optional
+        Names of the datasets used in the validation (defaults to all JSON datasets within the 'data' directory)
+
+    backends : List, optional
+        Storage backends used in the validation (defaults to both backends)
+
+    Returns
+    =======
+    mismatches : List
+        List of (dataset, backend, check) tuples whose cluster state differs
+    """
+
+    mismatches = []
+
+    for dataset, backend in itertools.product(datasets or bundled_datasets(), backends or ['object', 'array']):
+        with SimulationContext():
+            Simulator.create_environment(simulation_type='fast_forward')
+            Simulator.load_dataset(input_file=dataset, backend=backend)
+
+            failed_checks = check_state_fork(rng=random.Random(SEED_VALUE))
+
+        mismatches.extend((dataset, backend, check) for check in failed_checks)
+
+        print(f'{dataset} / state fork ({backend}): {"OK" if len(failed_checks) == 0 else "MISMATCH"}'
+            f'{"".join(f" [{check}]" for check in failed_checks)}')
+
+    return(mismatches)